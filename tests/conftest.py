@@ -0,0 +1,33 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_result_cache(tmp_path_factory, monkeypatch):
+    """Point the transcription result cache at a fresh directory for every test."""
+    from whisper_video_to_text import cache
+
+    monkeypatch.setenv(cache.RESULT_CACHE_DIR_ENV, str(tmp_path_factory.mktemp("result-cache")))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_history_index():
+    """Reopen the web history index per test, relative to that test's working directory."""
+    from whisper_video_to_text.web import history
+
+    history.reset_history_index()
+    yield
+    history.reset_history_index()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_probe_cache():
+    """Forget ffprobe results between tests; many tests reuse the same temporary names."""
+    from whisper_video_to_text import probe
+
+    probe.clear_probe_cache()
+    yield
+    probe.clear_probe_cache()
@@ -0,0 +1,134 @@
+"""Tests for the NumPy audio helpers."""
+
+from __future__ import annotations
+
+import wave
+
+import numpy as np
+import pytest
+
+from whisper_video_to_text import audio, convert
+
+
+def _write_wav(path, samples: np.ndarray, rate: int = 16000, channels: int = 1) -> None:
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.astype("<i2").tobytes())
+
+
+def test_load_whisper_wav_returns_normalized_float32(tmp_path):
+    path = tmp_path / "audio.wav"
+    _write_wav(path, np.array([0, 16384, -32768], dtype=np.int16))
+
+    samples = audio.load_whisper_wav(path)
+
+    assert samples.dtype == np.float32
+    np.testing.assert_allclose(samples, [0.0, 0.5, -1.0])
+
+
+def test_load_whisper_wav_rejects_other_sample_rates(tmp_path):
+    path = tmp_path / "audio.wav"
+    _write_wav(path, np.zeros(10, dtype=np.int16), rate=44100)
+
+    with pytest.raises(ValueError, match="16 kHz mono"):
+        audio.load_whisper_wav(path)
+
+
+def test_whisper_wav_maps_the_data_chunk_and_converts_slices(tmp_path):
+    path = tmp_path / "audio.wav"
+    pcm = np.random.default_rng(1).integers(-32768, 32767, 50_000, dtype=np.int16)
+    _write_wav(path, pcm)
+    # Move the data chunk behind an extra LIST chunk, as some writers do.
+    raw = path.read_bytes()
+    extra = b"LIST" + (6).to_bytes(4, "little") + b"INFOxx"
+    path.write_bytes(raw[:36] + extra + raw[36:])
+
+    wav = convert.WhisperWav(path)
+
+    assert isinstance(wav.pcm, np.memmap)
+    assert len(wav) == len(pcm)
+    window = wav[1000:1010]
+    assert window.dtype == np.float32
+    np.testing.assert_array_equal(window, pcm[1000:1010] / np.float32(32768.0))
+    np.testing.assert_array_equal(audio.load_whisper_wav(path), pcm / np.float32(32768.0))
+    np.testing.assert_array_equal(
+        audio.frame_energy_dbfs(wav), audio.frame_energy_dbfs(wav.to_array())
+    )
+
+
+def test_whisper_wav_trusts_file_size_when_header_was_not_finalized(tmp_path):
+    path = tmp_path / "audio.wav"
+    _write_wav(path, np.arange(100, dtype=np.int16))
+    raw = bytearray(path.read_bytes())
+    raw[40:44] = (0xFFFFFFFF).to_bytes(4, "little")
+    path.write_bytes(bytes(raw))
+
+    assert len(convert.WhisperWav(path)) == 100
+
+
+def test_frame_energy_dbfs_separates_silence_from_signal():
+    rate = 16000
+    signal = np.concatenate([np.zeros(rate, dtype=np.float32), np.full(rate, 0.5, np.float32)])
+
+    levels = audio.frame_energy_dbfs(signal)
+
+    assert levels[0] < audio.SILENCE_DBFS
+    assert levels[-1] > audio.SILENCE_DBFS
+
+
+def _tone(seconds: float, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * 16000)) / 16000
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _hiss(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * 16000)) * 0.001).astype(np.float32)
+
+
+def test_detect_speech_regions_finds_speech_between_silence():
+    signal = np.concatenate([_hiss(2), _tone(3), _hiss(4), _tone(1), _hiss(2)])
+
+    regions = audio.detect_speech_regions(signal)
+
+    assert len(regions) == 2
+    (first_start, first_end), (second_start, second_end) = regions
+    assert abs(first_start / 16000 - 2.0) <= 0.25
+    assert abs(first_end / 16000 - 5.0) <= 0.25
+    assert abs(second_start / 16000 - 9.0) <= 0.25
+    assert abs(second_end / 16000 - 10.0) <= 0.25
+
+
+def test_detect_speech_regions_keeps_continuous_speech_whole():
+    signal = np.concatenate([_tone(2, 0.3), _tone(2, 0.02), _tone(2, 0.3)])
+
+    assert audio.detect_speech_regions(signal) == [(0, len(signal))]
+
+
+def test_detect_speech_regions_merges_short_pauses():
+    signal = np.concatenate([_hiss(1), _tone(1), _hiss(0.3), _tone(1), _hiss(1)])
+
+    assert len(audio.detect_speech_regions(signal)) == 1
+
+
+def test_speech_timeline_compacts_and_maps_back_to_original_time():
+    signal = np.arange(10 * 16000, dtype=np.float32)
+    timeline = audio.SpeechTimeline([(16000, 3 * 16000), (6 * 16000, 7 * 16000)], len(signal))
+
+    compact = timeline.compact(signal)
+
+    assert len(compact) == 3 * 16000
+    assert compact[0] == 16000
+    assert compact[2 * 16000] == 6 * 16000
+    assert timeline.to_original(0.5) == 1.5
+    assert timeline.to_original(2.5) == 6.5
+    assert timeline.skipped_ratio == 0.7
+
+    remapped = timeline.remap_result(
+        {"text": " a b", "segments": [{"start": 1.5, "end": 2.5, "text": " a b"}]}
+    )
+    assert remapped["segments"][0]["start"] == 2.5
+    assert remapped["segments"][0]["end"] == 6.5
+    assert timeline.summary()["skipped_ratio"] == 0.7
@@ -0,0 +1,146 @@
+"""Tests for batch transcription with a resumable manifest."""
+
+from __future__ import annotations
+
+import json
+import sys
+from types import ModuleType
+
+import pytest
+
+whisper_stub = ModuleType("whisper")
+whisper_stub.load_model = None
+sys.modules.setdefault("whisper", whisper_stub)
+from whisper_video_to_text import cli  # noqa: E402
+from whisper_video_to_text.batch import BatchSummary, discover_media, run_batch  # noqa: E402
+from whisper_video_to_text.pipeline import TranscriptionRequest  # noqa: E402
+
+FAKE_TRANSCRIPTION = {
+    "text": "Hello world",
+    "segments": [{"start": 0.0, "end": 1.5, "text": " Hello world"}],
+    "language": "en",
+}
+
+
+@pytest.fixture()
+def archive(tmp_path):
+    root = tmp_path / "archive"
+    (root / "day1").mkdir(parents=True)
+    for name in ("a.mp4", "day1/b.wav", "day1/c.mp3", "notes.txt"):
+        (root / name).write_bytes(b"fake " + name.encode())
+    return root
+
+
+@pytest.fixture()
+def transcribed(monkeypatch, tmp_path):
+    """Patch the heavy pipeline steps; returns the list of transcribed audio inputs."""
+    import whisper_video_to_text.pipeline as pm
+
+    calls: list[str] = []
+
+    def fake_convert(media_path, output_file, **kw):
+        if "broken" in media_path:
+            raise RuntimeError("ffmpeg failed")
+        calls.append(media_path)
+        return tmp_path / "audio.wav"
+
+    monkeypatch.setattr(pm, "convert_media_to_whisper_audio", fake_convert)
+    monkeypatch.setattr(pm, "transcribe_audio", lambda *a, **kw: FAKE_TRANSCRIPTION)
+    return calls
+
+
+def test_discover_media_keeps_supported_files_recursively(archive):
+    root, files = discover_media(str(archive))
+
+    assert root == archive.resolve()
+    assert [f.relative_to(root).as_posix() for f in files] == ["a.mp4", "day1/b.wav", "day1/c.mp3"]
+
+    _, matched = discover_media(str(archive / "day1" / "*"))
+    assert [f.name for f in matched] == ["b.wav", "c.mp3"]
+
+
+def test_batch_writes_manifest_and_skips_done_files_on_rerun(archive, transcribed, tmp_path):
+    out = tmp_path / "out"
+    template = TranscriptionRequest(source="", formats=("txt",), bypass_cache=True)
+
+    first = run_batch(str(archive), template, jobs=2, output_dir=out)
+
+    assert (first.done, first.failed, first.skipped) == (3, 0, 0)
+    assert (out / "day1" / "b-transcript.txt").read_text(encoding="utf-8") == "Hello world"
+    entries = [json.loads(line) for line in first.manifest.read_text().splitlines()]
+    assert {e["status"] for e in entries} == {"done"}
+    assert all(e["outputs"]["txt"].endswith("-transcript.txt") for e in entries)
+
+    transcribed.clear()
+    (archive / "day1" / "c.mp3").write_bytes(b"re-recorded")
+    second = run_batch(str(archive), template, jobs=2, output_dir=out)
+
+    assert (second.done, second.skipped) == (1, 2)
+    assert transcribed == [str((archive / "day1" / "c.mp3").resolve())]
+
+
+def test_rerun_skips_kept_audio_and_files_under_the_output_dir(archive, transcribed, tmp_path):
+    (tmp_path / "audio.wav").write_bytes(b"RIFF")
+    template = TranscriptionRequest(source="", keep_audio=True, bypass_cache=True)
+    out = archive / "out"
+
+    first = run_batch(str(archive), template)
+    assert (archive / "a-transcript.wav").exists()
+    second = run_batch(str(archive), template)
+
+    out.mkdir()
+    (out / "copy.mp3").write_bytes(b"fake")
+    third = run_batch(str(archive), template, output_dir=out)
+    assert (out / "a-transcript.wav").exists()
+    transcribed.clear()
+    fourth = run_batch(str(archive), template, output_dir=out)
+
+    assert first.done == 3
+    assert (second.done, second.skipped) == (0, 3)
+    assert (third.done, third.skipped) == (3, 0)
+    assert (fourth.done, fourth.skipped) == (0, 3)
+    assert transcribed == []
+
+
+def test_failed_files_are_recorded_and_retried(archive, transcribed, tmp_path):
+    (archive / "broken.mov").write_bytes(b"bad")
+    template = TranscriptionRequest(source="", bypass_cache=True)
+
+    first = run_batch(str(archive), template, output_dir=tmp_path / "out")
+    failures = [
+        json.loads(line)
+        for line in first.manifest.read_text().splitlines()
+        if json.loads(line)["status"] == "failed"
+    ]
+    second = run_batch(str(archive), template, output_dir=tmp_path / "out")
+
+    assert first.failed == 1
+    assert failures[0]["error"] == "ffmpeg failed"
+    assert (second.failed, second.skipped) == (1, 3)
+
+
+def test_cli_batch_passes_settings_to_run_batch(monkeypatch, tmp_path):
+    captured: dict = {}
+
+    def fake_run_batch(target, template, jobs, output_dir, manifest_path):
+        captured.update(target=target, template=template, jobs=jobs, output_dir=output_dir)
+        return BatchSummary(done=1, failed=0, skipped=0, manifest=tmp_path / "m.jsonl")
+
+    monkeypatch.setattr(cli, "run_batch", fake_run_batch)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["wvt", "--batch", str(tmp_path), "--jobs", "3", "-o", str(tmp_path / "o"), "-m", "tiny"],
+    )
+    cli.main()
+
+    assert captured["target"] == str(tmp_path)
+    assert captured["jobs"] == 3
+    assert captured["output_dir"] == tmp_path / "o"
+    assert captured["template"].model == "tiny"
+
+
+def test_cli_requires_input_or_batch(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["wvt"])
+    with pytest.raises(SystemExit):
+        cli.main()
@@ -0,0 +1,85 @@
+"""Tests for the on-disk transcription result cache."""
+
+from __future__ import annotations
+
+import os
+
+from whisper_video_to_text import cache
+
+
+def test_hash_file_matches_content(tmp_path):
+    a = tmp_path / "a.mp4"
+    b = tmp_path / "b.mp4"
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+
+    assert cache.hash_file(a) == cache.hash_file(b)
+    b.write_bytes(b"other bytes")
+    assert cache.hash_file(a) != cache.hash_file(b)
+
+
+def test_cache_key_depends_on_options():
+    base = cache.cache_key("abc", {"model": "base", "language": None})
+    assert base == cache.cache_key("abc", {"language": None, "model": "base"})
+    assert base != cache.cache_key("abc", {"model": "small", "language": None})
+    assert base != cache.cache_key("abd", {"model": "base", "language": None})
+
+
+def test_put_then_get_round_trips_and_counts(tmp_path):
+    store = cache.ResultCache(tmp_path)
+
+    assert store.get("k") is None
+    store.put("k", {"result": {"text": "hi", "segments": []}})
+
+    assert store.get("k") == {"result": {"text": "hi", "segments": []}}
+    assert store.stats().as_dict() == {"hits": 1, "misses": 1, "stores": 1, "evictions": 0}
+
+
+def test_put_serializes_numpy_scalars(tmp_path):
+    import numpy as np
+
+    store = cache.ResultCache(tmp_path)
+    store.put("k", {"result": {"no_speech_prob": np.float32(0.25)}})
+
+    assert store.get("k") == {"result": {"no_speech_prob": 0.25}}
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    store = cache.ResultCache(tmp_path, max_bytes=250)
+    payload = {"text": "x" * 80}
+    store.put("old", payload)
+    store.put("used", payload)
+    os.utime(tmp_path / "old.json", (1, 1))
+    os.utime(tmp_path / "used.json", (2, 2))
+    store.get("used")  # touch: now most recently used
+
+    store.put("new", payload)
+
+    assert not (tmp_path / "old.json").exists()
+    assert (tmp_path / "used.json").exists()
+    assert (tmp_path / "new.json").exists()
+    assert store.stats().evictions == 1
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    store = cache.ResultCache(tmp_path)
+    (tmp_path / "bad.json").write_text("{not json")
+
+    assert store.get("bad") is None
+    assert not (tmp_path / "bad.json").exists()
+
+
+def test_get_result_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setenv(cache.RESULT_CACHE_DIR_ENV, "off")
+    assert cache.get_result_cache() is None
+
+
+def test_get_result_cache_uses_configured_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv(cache.RESULT_CACHE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(cache.RESULT_CACHE_MAX_MB_ENV, "2")
+
+    store = cache.get_result_cache()
+
+    assert store is not None
+    assert store.directory == tmp_path
+    assert store.max_bytes == 2 * 1024 * 1024
@@ -0,0 +1,265 @@
+"""Tests for chunked parallel transcription."""
+
+from __future__ import annotations
+
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import ModuleType
+
+import numpy as np
+import pytest
+
+whisper_stub = ModuleType("whisper")
+whisper_stub.load_model = None
+sys.modules.setdefault("whisper", whisper_stub)
+from whisper_video_to_text import chunking  # noqa: E402
+from whisper_video_to_text.errors import TranscriptionCancelled  # noqa: E402
+
+RATE = 16000
+
+
+def _speech(seconds: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * RATE)) * 0.3).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def test_plan_chunks_single_chunk_for_short_audio():
+    chunks = chunking.plan_chunks(_speech(12), chunk_seconds=10)
+    assert chunks == [chunking.AudioChunk(0, 0, 12 * RATE, 0)]
+
+
+def test_plan_chunks_splits_inside_pause_without_overlap():
+    audio = np.concatenate([_speech(11), _silence(1), _speech(12)])
+
+    chunks = chunking.plan_chunks(audio, chunk_seconds=10)
+
+    assert len(chunks) == 2
+    split = chunks[1].start
+    assert 11 * RATE <= split <= 12 * RATE
+    assert chunks[0].end == split
+    assert chunks[1].decode_start == split
+    assert chunks[1].end == len(audio)
+
+
+def test_plan_chunks_overlaps_when_forced_to_cut_speech():
+    audio = _speech(30)
+
+    chunks = chunking.plan_chunks(audio, chunk_seconds=10, overlap_seconds=2)
+
+    assert len(chunks) == 3
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start == previous.end
+        assert chunk.start - chunk.decode_start == 2 * RATE
+    assert chunks[-1].end == len(audio)
+
+
+def test_stitch_results_shifts_offsets_and_drops_overlap_duplicates():
+    chunks = [
+        chunking.AudioChunk(0, 0, 10 * RATE, 0),
+        chunking.AudioChunk(1, 10 * RATE, 20 * RATE, 8 * RATE),
+    ]
+    results = [
+        {
+            "language": "en",
+            "segments": [
+                {"id": 0, "start": 0.0, "end": 5.0, "text": " one", "seek": 0},
+                {"id": 1, "start": 5.0, "end": 9.8, "text": " two", "seek": 500},
+            ],
+        },
+        {
+            "language": "en",
+            "segments": [
+                # Lead-in overlap [8s, 10s) repeats the tail of chunk 0.
+                {"id": 0, "start": 0.0, "end": 1.8, "text": " Two.", "seek": 0},
+                {"id": 1, "start": 2.0, "end": 6.0, "text": " three", "seek": 0},
+            ],
+        },
+    ]
+
+    merged = chunking.stitch_results(chunks, results)
+
+    assert [s["text"] for s in merged["segments"]] == [" one", " two", " three"]
+    assert [s["id"] for s in merged["segments"]] == [0, 1, 2]
+    third = merged["segments"][2]
+    assert third["start"] == pytest.approx(10.0)
+    assert third["end"] == pytest.approx(14.0)
+    assert third["seek"] == 800
+    assert merged["text"] == " one two three"
+    assert merged["language"] == "en"
+
+
+def test_transcribe_chunked_detects_language_once_and_stitches(monkeypatch):
+    audio = np.concatenate([_speech(11), _silence(1), _speech(12, seed=1)])
+    calls: list[tuple[int, str | None]] = []
+
+    def fake_transcribe(samples, model_name, language, **kwargs):
+        calls.append((len(samples), language))
+        seconds = len(samples) / RATE
+        return {
+            "text": f" part{len(calls)}",
+            "segments": [{"start": 0.0, "end": seconds, "text": f" part{len(calls)}"}],
+            "language": language or "fr",
+        }
+
+    monkeypatch.setattr(chunking, "transcribe_audio", fake_transcribe)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        result = chunking.transcribe_chunked(audio, chunk_seconds=10, executor=pool)
+
+    assert calls[0][1] is None
+    assert calls[1][1] == "fr"
+    assert sum(length for length, _ in calls) == len(audio)
+    assert result["language"] == "fr"
+    assert result["segments"][1]["end"] == pytest.approx(len(audio) / RATE)
+    assert result["text"] == " part1 part2"
+
+
+def test_transcribe_chunked_short_audio_runs_in_process(monkeypatch):
+    monkeypatch.setattr(
+        chunking, "transcribe_audio", lambda *a, **kw: {"text": "x", "segments": []}
+    )
+
+    def no_pool(*a, **kw):
+        raise AssertionError("no pool for a single chunk")
+
+    monkeypatch.setattr(chunking, "create_chunk_pool", no_pool)
+
+    assert chunking.transcribe_chunked(_speech(5))["text"] == "x"
+
+
+def test_transcribe_chunked_honours_cancellation(monkeypatch):
+    monkeypatch.setattr(
+        chunking,
+        "transcribe_audio",
+        lambda *a, **kw: {"text": "", "segments": [], "language": "en"},
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        with pytest.raises(TranscriptionCancelled):
+            chunking.transcribe_chunked(
+                _speech(30), chunk_seconds=10, executor=pool, should_cancel=lambda: True
+            )
+
+
+def test_cancellation_is_noticed_while_a_chunk_is_still_running(monkeypatch):
+    import threading
+
+    release = threading.Event()
+
+    def stuck_transcribe(*a, **kw):
+        release.wait(30)
+        return {"text": "", "segments": [], "language": "en"}
+
+    monkeypatch.setattr(chunking, "transcribe_audio", stuck_transcribe)
+    cancel_at = time.monotonic() + 0.2
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        try:
+            started = time.monotonic()
+            with pytest.raises(TranscriptionCancelled):
+                chunking.transcribe_chunked(
+                    _speech(30),
+                    chunk_seconds=10,
+                    language="en",
+                    executor=pool,
+                    should_cancel=lambda: time.monotonic() >= cancel_at,
+                )
+            assert time.monotonic() - started < 5
+        finally:
+            release.set()
+
+
+def test_chunks_are_submitted_only_a_few_ahead_of_the_workers(monkeypatch):
+    import threading
+
+    lock = threading.Lock()
+    outstanding = 0
+    peak = 0
+
+    class CountingPool(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            nonlocal outstanding, peak
+            with lock:
+                outstanding += 1
+                peak = max(peak, outstanding)
+            return super().submit(fn, *args, **kwargs)
+
+    def slow_transcribe(*a, **kw):
+        nonlocal outstanding
+        time.sleep(0.02)
+        with lock:
+            outstanding -= 1
+        return {"text": "", "segments": [], "language": "en"}
+
+    monkeypatch.setattr(chunking, "transcribe_audio", slow_transcribe)
+    audio = _speech(120)
+
+    with CountingPool(max_workers=2) as pool:
+        chunking.transcribe_chunked(
+            audio, chunk_seconds=10, language="en", workers=2, executor=pool
+        )
+
+    assert len(chunking.plan_chunks(audio, 10)) > 6
+    # Two workers plus one spare; the rest wait unread in the WhisperWav.
+    assert peak <= 3
+
+
+@pytest.fixture()
+def counted_pools(monkeypatch):
+    """Thread pools standing in for process pools; returns the list of pools created."""
+    created: list[ThreadPoolExecutor] = []
+
+    def create(workers, model_name, device=None, dtype=None):
+        created.append(ThreadPoolExecutor(max_workers=workers))
+        return created[-1]
+
+    monkeypatch.setattr(chunking, "create_chunk_pool", create)
+    monkeypatch.setattr(
+        chunking,
+        "transcribe_audio",
+        lambda *a, **kw: {"text": "", "segments": [], "language": "en"},
+    )
+    yield created
+    chunking.shutdown_chunk_pools()
+
+
+def test_transcribe_chunked_reuses_its_pool_across_calls(counted_pools):
+    chunking.transcribe_chunked(_speech(30), chunk_seconds=10, workers=2)
+    chunking.transcribe_chunked(_speech(30), chunk_seconds=10, workers=2)
+    assert len(counted_pools) == 1
+
+    chunking.transcribe_chunked(_speech(30), chunk_seconds=10, workers=3)
+    assert len(counted_pools) == 2
+
+
+def test_cancelled_transcription_terminates_its_pool(counted_pools, monkeypatch):
+    terminated = []
+    monkeypatch.setattr(chunking, "_terminate_chunk_pool", terminated.append)
+
+    with pytest.raises(TranscriptionCancelled):
+        chunking.transcribe_chunked(
+            _speech(30), chunk_seconds=10, workers=2, should_cancel=lambda: True
+        )
+    chunking.transcribe_chunked(_speech(30), chunk_seconds=10, workers=2)
+
+    assert terminated == [counted_pools[0]]
+    assert len(counted_pools) == 2
+
+
+def test_terminate_chunk_pool_kills_busy_workers():
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    future = pool.submit(time.sleep, 60)
+    deadline = time.monotonic() + 30
+    while not future.running() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    processes = list(pool._processes.values())
+
+    chunking._terminate_chunk_pool(pool)
+
+    assert processes and not any(process.is_alive() for process in processes)
@@ -87,3 +87,16 @@ def test_cli_help_mentions_supported_media_formats(monkeypatch, capsys):
 
     for extension in ["mp3", "m4a", "m4p", "wav", "aif", "aiff", "mp4", "mov"]:
         assert extension in help_text
+
+
+def test_cli_rejects_stream_without_download(monkeypatch, capsys, tmp_path):
+    """--stream only changes how a download is fetched, so it needs --download."""
+    input_file = tmp_path / "video.mp4"
+    input_file.write_bytes(b"fake")
+    monkeypatch.setattr(sys, "argv", ["whisper_video_to_text", str(input_file), "--stream"])
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main()
+
+    assert exc_info.value.code == 2
+    assert "--stream requires --download" in capsys.readouterr().err
@@ -1,10 +1,13 @@
 import io
 import subprocess
+import threading
+import wave
 from unittest import mock
 
+import numpy as np
 import pytest
 
-from whisper_video_to_text import convert
+from whisper_video_to_text import convert, probe
 
 
 class _FakePopen:
@@ -123,3 +126,255 @@ def test_convert_mp4_to_mp3_failure(tmp_path):
     with mock.patch("subprocess.Popen", side_effect=_FakePopen(returncode=1)):
         with pytest.raises(subprocess.CalledProcessError):
             convert.convert_mp4_to_mp3(str(input_file), str(output_file))
+
+
+class _PipePopen:
+    """Popen stand-in whose stdout yields raw s16le PCM."""
+
+    def __init__(self, pcm: bytes, returncode: int = 0, stderr: bytes = b""):
+        self._pcm = pcm
+        self._returncode = returncode
+        self._stderr = stderr
+
+    def __call__(self, cmd, *args, **kwargs):
+        self.cmd = cmd
+        self.stdout = io.BytesIO(self._pcm)
+        self.stderr = io.BytesIO(self._stderr)
+        self.returncode = None
+        self.terminated = False
+        return self
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self.returncode = self._returncode
+        return self.returncode
+
+    def terminate(self):
+        self.terminated = True
+
+    def kill(self):
+        self.returncode = -9
+
+
+def test_convert_media_to_whisper_audio_reports_ffmpeg_progress(tmp_path, monkeypatch):
+    input_file = tmp_path / "input.mp4"
+    input_file.write_text("dummy")
+    progress_output = (
+        b"out_time_us=5000000\ntotal_size=160000\nspeed=25.0x\nprogress=continue\n"
+        b"out_time_us=10000000\ntotal_size=320044\nspeed=N/A\nprogress=end\n"
+    )
+    monkeypatch.setattr(convert, "PROGRESS_INTERVAL", 0.0)
+    updates: list[convert.FfmpegProgress] = []
+
+    fake = _PipePopen(progress_output)
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        convert.convert_media_to_whisper_audio(
+            str(input_file),
+            str(tmp_path / "out.wav"),
+            duration=10.0,
+            on_progress=updates.append,
+        )
+
+    assert fake.cmd[3:7] == ["-progress", "pipe:1", "-nostats", "-i"]
+    assert [(u.out_seconds, u.fraction, u.speed, u.total_bytes) for u in updates] == [
+        (5.0, 0.5, 25.0, 160000),
+        (10.0, 1.0, None, 320044),
+    ]
+
+
+def test_convert_media_to_whisper_audio_failure_includes_stderr(tmp_path):
+    input_file = tmp_path / "input.mp4"
+    input_file.write_text("dummy")
+
+    fake = _PipePopen(b"", returncode=1, stderr=b"moov atom not found\n")
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            convert.convert_media_to_whisper_audio(str(input_file), str(tmp_path / "out.wav"))
+
+    assert "moov atom not found" in exc_info.value.stderr
+
+
+def test_decode_media_to_whisper_array_returns_float32_samples(tmp_path):
+    import numpy as np
+
+    input_file = tmp_path / "input.mp4"
+    input_file.write_text("dummy")
+    pcm = np.array([0, 16384, -32768, 32767], dtype="<i2").tobytes()
+
+    fake = _PipePopen(pcm)
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        audio = convert.decode_media_to_whisper_array(str(input_file))
+
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0, 32767 / 32768])
+    cmd = fake.cmd
+    assert cmd[cmd.index("-f") + 1] == "s16le"
+    assert cmd[-1] == "pipe:1"
+    assert cmd[cmd.index("-ar") + 1] == "16000"
+
+
+def test_decode_media_to_whisper_array_grows_past_probed_duration(tmp_path, monkeypatch):
+    import numpy as np
+
+    input_file = tmp_path / "input.wav"
+    input_file.write_text("dummy")
+    samples = np.arange(3 * 16000, dtype="<i2")
+    monkeypatch.setattr(convert, "_get_media_duration", lambda path: 1.0)
+    monkeypatch.setattr(convert, "PCM_READ_CHUNK_BYTES", 4097)  # odd size splits samples
+
+    with mock.patch("subprocess.Popen", side_effect=_PipePopen(samples.tobytes())):
+        audio = convert.decode_media_to_whisper_array(str(input_file))
+
+    np.testing.assert_allclose(audio, samples.astype(np.float32) / 32768.0)
+
+
+def test_decode_media_to_whisper_array_failure_raises(tmp_path):
+    input_file = tmp_path / "input.mp4"
+    input_file.write_text("dummy")
+
+    fake = _PipePopen(b"", returncode=1, stderr=b"Invalid data found\n")
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            convert.decode_media_to_whisper_array(str(input_file))
+
+    assert "Invalid data found" in exc_info.value.stderr
+
+
+def test_decode_media_to_whisper_array_cancel_terminates(tmp_path):
+    from whisper_video_to_text.errors import TranscriptionCancelled
+
+    input_file = tmp_path / "input.mp4"
+    input_file.write_text("dummy")
+
+    fake = _PipePopen(b"\x00\x00" * 100)
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        with pytest.raises(TranscriptionCancelled):
+            convert.decode_media_to_whisper_array(str(input_file), should_cancel=lambda: True)
+
+    assert fake.terminated
+
+
+def _write_wav(path, rate=16000, channels=1, samples=(0, 16384, -32768)):
+    import wave
+
+    import numpy as np
+
+    pcm = np.repeat(np.array(samples, dtype="<i2"), channels).tobytes()
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm)
+
+
+def test_whisper_ready_wav_is_linked_instead_of_converted(tmp_path):
+    import numpy as np
+
+    ready = tmp_path / "call.wav"
+    _write_wav(ready)
+    output = tmp_path / "work" / "call-whisper.wav"
+    output.parent.mkdir()
+
+    with mock.patch("subprocess.Popen", side_effect=AssertionError("ffmpeg must not run")):
+        assert convert.convert_media_to_whisper_audio(str(ready)) == ready
+        assert convert.convert_media_to_whisper_audio(str(ready), str(output)) == output
+        audio = convert.decode_media_to_whisper_array(str(ready))
+
+    assert output.read_bytes() == ready.read_bytes()
+    assert output.stat().st_ino == ready.stat().st_ino
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+
+
+def test_wav_needing_resample_or_downmix_is_converted_audio_stream_only(tmp_path):
+    stereo = tmp_path / "stereo.wav"
+    _write_wav(stereo, rate=44100, channels=2)
+    assert not convert.is_whisper_ready_wav(stereo)
+
+    fake = _FakePopen()
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        convert.convert_media_to_whisper_audio(str(stereo), str(tmp_path / "out.wav"))
+
+    assert fake.cmd[fake.cmd.index("-map") + 1] == "0:a:0"
+
+
+class _SlicePopen:
+    """Popen stand-in that decodes `-ss`/`-t` ranges of a fixed s16le signal."""
+
+    def __init__(self, signal, misalign=0):
+        self.signal = signal
+        self.misalign = misalign
+        self.cmds = []
+        self.lock = threading.Lock()
+
+    def __call__(self, cmd, *args, **kwargs):
+        with self.lock:
+            self.cmds.append(cmd)
+        start = round(float(cmd[cmd.index("-ss") + 1]) * 16000) if "-ss" in cmd else 0
+        if start:
+            start += self.misalign
+        end = len(self.signal)
+        if "-t" in cmd:
+            end = start + round(float(cmd[cmd.index("-t") + 1]) * 16000)
+        process = _PipePopen(self.signal[start:end].tobytes())
+        return process(cmd)
+
+
+def _slicing_setup(tmp_path, monkeypatch, seconds=8.0, format_name="mov,mp4,m4a"):
+    media = tmp_path / "long.mp4"
+    media.write_bytes(b"fake")
+    signal = np.random.default_rng(0).integers(-8000, 8000, int(seconds * 16000), dtype=np.int16)
+    info = probe.parse_ffprobe_json(
+        {
+            "format": {"format_name": format_name, "duration": str(seconds)},
+            "streams": [{"index": 0, "codec_type": "audio", "codec_name": "aac"}],
+        }
+    )
+    monkeypatch.setattr(probe, "_run_ffprobe", lambda path: info)
+    monkeypatch.setattr(convert, "PARALLEL_DECODE_MIN_SLICE_SECONDS", 1.0)
+    return media, signal
+
+
+def test_parallel_decode_reassembles_slices_sample_exactly(tmp_path, monkeypatch):
+    media, signal = _slicing_setup(tmp_path, monkeypatch)
+    fake = _SlicePopen(signal)
+
+    with mock.patch("subprocess.Popen", new=fake):
+        audio = convert.decode_media_to_whisper_array(str(media), decode_workers=4)
+        wav = convert.convert_media_to_whisper_audio(
+            str(media), str(tmp_path / "out.wav"), decode_workers=4
+        )
+
+    assert len(fake.cmds) == 8
+    assert sorted(cmd[cmd.index("-ss") + 1] for cmd in fake.cmds[:4]) == [
+        "0.0000000",
+        "1.8000000",
+        "3.8000000",
+        "5.8000000",
+    ]
+    np.testing.assert_array_equal(audio, signal.astype(np.float32) / 32768.0)
+    assert convert.is_whisper_ready_wav(wav)
+    with wave.open(str(wav), "rb") as reader:
+        assert reader.readframes(reader.getnframes()) == signal.tobytes()
+
+
+def test_parallel_decode_falls_back_when_a_seek_is_misaligned(tmp_path, monkeypatch):
+    media, signal = _slicing_setup(tmp_path, monkeypatch)
+    fake = _SlicePopen(signal, misalign=40)
+
+    with mock.patch("subprocess.Popen", new=fake):
+        audio = convert.decode_media_to_whisper_array(str(media), decode_workers=4)
+
+    assert "-ss" not in fake.cmds[-1]
+    np.testing.assert_array_equal(audio, signal.astype(np.float32) / 32768.0)
+
+
+def test_parallel_decode_is_not_used_for_unseekable_containers(tmp_path, monkeypatch):
+    media, signal = _slicing_setup(tmp_path, monkeypatch, format_name="mpegts")
+    fake = _SlicePopen(signal)
+
+    with mock.patch("subprocess.Popen", new=fake):
+        convert.decode_media_to_whisper_array(str(media), decode_workers=4)
+
+    assert len(fake.cmds) == 1 and "-ss" not in fake.cmds[0]
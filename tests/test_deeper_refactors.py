@@ -4,7 +4,7 @@ These tests verify that all 5 deeper refactor tasks have been implemented correc
 1. Sync/async cleanup in run_transcription_task
 2. formats/timestamps implementation in web API
 3. CLI output directory change
-4. ffmpeg-python optional dependency handling
+4. Probing without the ffmpeg-python dependency
 5. Type hints in web module
 """
 
@@ -158,28 +158,22 @@ class TestCliOutputDirectory:
 
 
 class TestFfmpegOptionalDependency:
-    """Test ffmpeg-python optional dependency handling."""
+    """Test that probing no longer depends on ffmpeg-python."""
 
-    def test_has_ffmpeg_python_flag_exists(self):
-        """Verify HAS_FFMPEG_PYTHON flag exists at module level."""
+    def test_no_ffmpeg_python_flag(self):
+        """Verify the ffmpeg-python import and HAS_FFMPEG_PYTHON flag are gone."""
         from whisper_video_to_text import convert
 
-        assert hasattr(convert, "HAS_FFMPEG_PYTHON")
-        assert isinstance(convert.HAS_FFMPEG_PYTHON, bool)
+        assert not hasattr(convert, "HAS_FFMPEG_PYTHON")
+        assert "import ffmpeg" not in inspect.getsource(convert)
 
-    def test_ffmpeg_import_at_module_level(self):
-        """Verify ffmpeg is imported at module level, not inside function."""
+    def test_mp3_conversion_probes_duration_unconditionally(self):
+        """Verify convert_mp4_to_mp3 takes its duration from the ffprobe-based probe."""
         from whisper_video_to_text import convert
 
-        source = inspect.getsource(convert)
-        # Find the function source
         func_source = inspect.getsource(convert.convert_mp4_to_mp3)
-
-        # ffmpeg import should be at module level, not in function
-        assert "import ffmpeg" in source
-        # The function should use the flag, not import ffmpeg
-        assert "import ffmpeg" not in func_source
-        assert "HAS_FFMPEG_PYTHON" in func_source
+        assert "_get_media_duration(input_path)" in func_source
+        assert "HAS_FFMPEG_PYTHON" not in func_source
 
 
 class TestWebModuleTypeHints:
@@ -60,3 +60,114 @@ def test_download_video_failure(tmp_path):
     with mock.patch("subprocess.run", side_effect=subprocess.CalledProcessError(1, "yt-dlp")):
         with pytest.raises(subprocess.CalledProcessError):
             download.download_video(url, str(output_dir))
+
+
+def test_download_audio_only_requests_bestaudio_without_merge(tmp_path):
+    mock_result = mock.Mock()
+    mock_result.stdout = "[download] Destination: talk.webm\n"
+    with mock.patch("subprocess.run", return_value=mock_result) as run_mock:
+        filename = download.download_video("http://example.com/v", str(tmp_path), audio_only=True)
+
+    assert filename == "talk.webm"
+    cmd = run_mock.call_args.args[0]
+    assert cmd[cmd.index("-f") + 1] == download.AUDIO_ONLY_FORMAT
+    assert "--merge-output-format" not in cmd
+
+
+def test_download_audio_only_falls_back_to_smallest_file_with_audio(tmp_path):
+    mock_result = mock.Mock()
+    mock_result.stdout = "Destination: talk.mp4\n"
+    with mock.patch(
+        "subprocess.run",
+        side_effect=[subprocess.CalledProcessError(1, "yt-dlp"), mock_result],
+    ) as run_mock:
+        download.download_video("http://example.com/v", str(tmp_path), audio_only=True)
+
+    fallback_cmd = run_mock.call_args.args[0]
+    assert fallback_cmd[fallback_cmd.index("-f") + 1] == download.SMALLEST_WITH_AUDIO_FORMAT
+
+
+def test_filename_fallback_finds_newest_audio_file(tmp_path):
+    (tmp_path / "notes.txt").write_text("not media")
+    (tmp_path / "talk.m4a").write_bytes(b"audio")
+
+    assert download._filename_from_yt_dlp_output("", str(tmp_path)) == str(tmp_path / "talk.m4a")
+
+
+class _StreamProcesses:
+    """Popen stand-in for the yt-dlp | ffmpeg pipe; ffmpeg's stdout yields s16le PCM."""
+
+    def __init__(self, pcm: bytes, yt_dlp_returncode: int = 0, yt_dlp_stderr: bytes = b""):
+        self.pcm = pcm
+        self.yt_dlp_returncode = yt_dlp_returncode
+        self.yt_dlp_stderr = yt_dlp_stderr
+        self.processes = {}
+
+    def __call__(self, cmd, stdin=None, stdout=None, stderr=None, **kwargs):
+        import io
+
+        process = mock.Mock()
+        process.cmd = cmd
+        process.stdin = stdin
+        process.returncode = None
+        if cmd[0] == "yt-dlp":
+            process.stdout = io.BytesIO(b"container bytes")
+            stderr.write(self.yt_dlp_stderr)
+            final = self.yt_dlp_returncode
+        else:
+            process.stdout = io.BytesIO(self.pcm)
+            process.stderr = io.BytesIO(b"")
+            final = 0
+
+        def wait(timeout=None):
+            if process.returncode is None:
+                process.returncode = final
+            return process.returncode
+
+        def terminate():
+            process.returncode = -15
+
+        process.poll.side_effect = lambda: process.returncode
+        process.wait.side_effect = wait
+        process.terminate.side_effect = terminate
+        self.processes[cmd[0]] = process
+        return process
+
+
+def test_stream_url_to_whisper_array_pipes_yt_dlp_into_ffmpeg():
+    import numpy as np
+
+    pcm = np.array([0, 16384, -32768], dtype="<i2").tobytes()
+    fake = _StreamProcesses(pcm)
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        audio = download.stream_url_to_whisper_array("http://example.com/video")
+
+    assert audio.tolist() == [0.0, 0.5, -1.0]
+    yt_dlp, ffmpeg = fake.processes["yt-dlp"], fake.processes["ffmpeg"]
+    assert yt_dlp.cmd[yt_dlp.cmd.index("-o") + 1] == "-"
+    assert ffmpeg.cmd[ffmpeg.cmd.index("-i") + 1] == "pipe:0"
+    assert ffmpeg.stdin is yt_dlp.stdout
+
+
+def test_stream_url_cancel_terminates_yt_dlp_and_ffmpeg():
+    from whisper_video_to_text.errors import TranscriptionCancelled
+
+    fake = _StreamProcesses(b"\x00\x00" * 16)
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        with pytest.raises(TranscriptionCancelled):
+            download.stream_url_to_whisper_array(
+                "http://example.com/video", should_cancel=lambda: True
+            )
+
+    assert fake.processes["yt-dlp"].terminate.called
+    assert fake.processes["ffmpeg"].terminate.called
+
+
+def test_stream_url_reports_yt_dlp_failure():
+    fake = _StreamProcesses(b"", yt_dlp_returncode=1, yt_dlp_stderr=b"ERROR: Video unavailable")
+    with mock.patch("subprocess.Popen", side_effect=fake):
+        with pytest.raises(subprocess.CalledProcessError) as excinfo:
+            download.stream_url_to_whisper_array("http://example.com/video")
+
+    assert excinfo.value.cmd[0] == "yt-dlp"
+    assert "Video unavailable" in excinfo.value.stderr
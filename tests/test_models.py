@@ -0,0 +1,132 @@
+"""Tests for the process-wide Whisper model cache."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from whisper_video_to_text import models
+
+
+class _FakeTensor:
+    def __init__(self, nbytes: int) -> None:
+        self._nbytes = nbytes
+
+    def numel(self) -> int:
+        return self._nbytes
+
+    def element_size(self) -> int:
+        return 1
+
+
+class _FakeModel:
+    def __init__(self, name: str, nbytes: int = 100) -> None:
+        self.name = name
+        self._nbytes = nbytes
+
+    def parameters(self):
+        return [_FakeTensor(self._nbytes)]
+
+    def buffers(self):
+        return []
+
+    def half(self):
+        return self
+
+
+def _fake_loader(nbytes: int = 100):
+    return mock.Mock(side_effect=lambda name, device=None: _FakeModel(name, nbytes))
+
+
+def test_cache_hit_skips_reload():
+    cache = models.ModelCache()
+    loader = _fake_loader()
+    with mock.patch.object(models.whisper, "load_model", loader):
+        first = cache.get("base")
+        second = cache.get("base")
+
+    assert first is second
+    assert loader.call_count == 1
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.loads == 1
+    assert stats.resident_models == 1
+    assert stats.resident_bytes == 100
+
+
+def test_cache_keys_include_device_and_dtype():
+    cache = models.ModelCache()
+    loader = _fake_loader()
+    with mock.patch.object(models.whisper, "load_model", loader):
+        cache.get("base")
+        cache.get("base", device="cpu")
+        cache.get("base", dtype="float16")
+
+    assert loader.call_count == 3
+    assert cache.stats().resident_models == 3
+
+
+def test_cache_rejects_unknown_dtype():
+    with pytest.raises(ValueError, match="Unsupported model dtype"):
+        models.ModelCache().get("base", dtype="int8")
+
+
+def test_cache_evicts_least_recently_used_over_model_limit():
+    cache = models.ModelCache(max_models=2)
+    with mock.patch.object(models.whisper, "load_model", _fake_loader()):
+        cache.get("tiny")
+        cache.get("base")
+        cache.get("tiny")  # tiny becomes most recently used
+        cache.get("small")
+
+    assert cache.contains("tiny")
+    assert cache.contains("small")
+    assert not cache.contains("base")
+    assert cache.stats().evictions == 1
+
+
+def test_cache_evicts_over_byte_budget_but_keeps_newest():
+    cache = models.ModelCache(max_bytes=150)
+    with mock.patch.object(models.whisper, "load_model", _fake_loader(nbytes=100)):
+        cache.get("tiny")
+        cache.get("base")
+
+    assert not cache.contains("tiny")
+    assert cache.contains("base")
+
+
+def test_concurrent_requests_load_model_once():
+    cache = models.ModelCache()
+
+    def slow_load(name, device=None):
+        time.sleep(0.05)
+        return _FakeModel(name)
+
+    loader = mock.Mock(side_effect=slow_load)
+    results: list[object] = []
+    with mock.patch.object(models.whisper, "load_model", loader):
+        threads = [threading.Thread(target=lambda: results.append(cache.get("base")))]
+        threads += [threading.Thread(target=lambda: results.append(cache.get("base")))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert loader.call_count == 1
+    assert results[0] is results[1]
+
+
+def test_default_cache_reads_budget_from_environment(monkeypatch):
+    monkeypatch.setattr(models, "_default_cache", None)
+    monkeypatch.setenv(models.MODEL_CACHE_MAX_MB_ENV, "1")
+    monkeypatch.setenv(models.MODEL_CACHE_MAX_MODELS_ENV, "3")
+
+    cache = models.get_model_cache()
+
+    assert cache.max_bytes == 1024 * 1024
+    assert cache.max_models == 3
+    assert models.get_model_cache() is cache
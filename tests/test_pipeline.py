@@ -113,3 +113,355 @@ def test_pipeline_no_output_base_skips_file_writing(patched_pipeline, tmp_path):
         TranscriptionRequest(source=str(make_input(tmp_path)), output_base=None)
     )
     assert result.output_files == {}
+
+
+def test_pipeline_in_memory_audio_skips_wav(monkeypatch, tmp_path):
+    import numpy as np
+
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    samples = np.zeros(16000, dtype=np.float32)
+    received: list[object] = []
+
+    def fail_convert(*a, **kw):
+        raise AssertionError("WAV conversion should be skipped")
+
+    def fake_transcribe(audio, **kw):
+        received.append(audio)
+        return FAKE_TRANSCRIPTION
+
+    monkeypatch.setattr(pm, "convert_media_to_whisper_audio", fail_convert)
+    monkeypatch.setattr(pm, "decode_media_to_whisper_array", lambda *a, **kw: samples)
+    monkeypatch.setattr(pm, "transcribe_audio", fake_transcribe)
+
+    result = run_transcription(
+        TranscriptionRequest(source=str(make_input(tmp_path)), in_memory_audio=True)
+    )
+
+    assert received == [samples]
+    assert result.text == "Hello world"
+
+
+def test_pipeline_in_memory_audio_still_writes_wav_when_kept(patched_pipeline, monkeypatch):
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    tmp_path, _ = patched_pipeline
+
+    def fail_decode(*a, **kw):
+        raise AssertionError("keep_audio needs the WAV path")
+
+    monkeypatch.setattr(pm, "decode_media_to_whisper_array", fail_decode)
+
+    output_base = tmp_path / "kept"
+    run_transcription(
+        TranscriptionRequest(
+            source=str(make_input(tmp_path)),
+            in_memory_audio=True,
+            keep_audio=True,
+            output_base=output_base,
+        )
+    )
+
+    assert (tmp_path / "kept.wav").exists()
+
+
+def test_pipeline_uses_chunked_transcription_with_workers(monkeypatch, tmp_path):
+    import numpy as np
+
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    samples = np.zeros(16000, dtype=np.float32)
+    captured: dict = {}
+
+    def fake_chunked(audio, **kw):
+        captured["audio"] = audio
+        captured.update(kw)
+        return FAKE_TRANSCRIPTION
+
+    monkeypatch.setattr(pm, "decode_media_to_whisper_array", lambda *a, **kw: samples)
+    monkeypatch.setattr(pm, "transcribe_chunked", fake_chunked)
+
+    result = run_transcription(
+        TranscriptionRequest(
+            source=str(make_input(tmp_path)),
+            in_memory_audio=True,
+            workers=3,
+            chunk_seconds=120,
+        )
+    )
+
+    assert captured["audio"] is samples
+    assert captured["workers"] == 3
+    assert captured["chunk_seconds"] == 120
+    assert result.segments == FAKE_TRANSCRIPTION["segments"]
+
+
+def test_pipeline_vad_transcribes_speech_only_and_reports_savings(monkeypatch, tmp_path):
+    import numpy as np
+
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.audio import SpeechTimeline
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    samples = np.zeros(10 * 16000, dtype=np.float32)
+    timeline = SpeechTimeline([(4 * 16000, 6 * 16000)], len(samples))
+    received: list[int] = []
+
+    def fake_transcribe(audio, **kw):
+        received.append(len(audio))
+        return {"text": " hi", "segments": [{"start": 0.5, "end": 1.0, "text": " hi"}]}
+
+    monkeypatch.setattr(pm, "decode_media_to_whisper_array", lambda *a, **kw: samples)
+    monkeypatch.setattr(pm, "build_speech_timeline", lambda audio: timeline)
+    monkeypatch.setattr(pm, "transcribe_audio", fake_transcribe)
+
+    result = run_transcription(
+        TranscriptionRequest(source=str(make_input(tmp_path)), in_memory_audio=True, vad=True)
+    )
+
+    assert received == [2 * 16000]
+    assert result.segments[0]["start"] == 4.5
+    assert result.metadata["vad"]["skipped_ratio"] == 0.8
+
+
+def test_pipeline_vad_without_speech_skips_whisper(monkeypatch, tmp_path):
+    import numpy as np
+
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    def fail_transcribe(*a, **kw):
+        raise AssertionError("silent audio should not reach Whisper")
+
+    monkeypatch.setattr(
+        pm, "decode_media_to_whisper_array", lambda *a, **kw: np.zeros(16000, np.float32)
+    )
+    monkeypatch.setattr(pm, "transcribe_audio", fail_transcribe)
+
+    result = run_transcription(
+        TranscriptionRequest(source=str(make_input(tmp_path)), in_memory_audio=True, vad=True)
+    )
+
+    assert result.text == ""
+    assert result.metadata["vad"]["skipped_ratio"] == 1.0
+
+
+def test_pipeline_reuses_cached_result_for_same_media(monkeypatch, tmp_path):
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    audio_file = tmp_path / "audio-whisper.wav"
+    audio_file.write_bytes(b"fake audio")
+    calls = {"convert": 0, "transcribe": 0}
+
+    def fake_convert(*a, **kw):
+        calls["convert"] += 1
+        return audio_file
+
+    def fake_transcribe(*a, **kw):
+        calls["transcribe"] += 1
+        return FAKE_TRANSCRIPTION
+
+    monkeypatch.setattr(pm, "convert_media_to_whisper_audio", fake_convert)
+    monkeypatch.setattr(pm, "transcribe_audio", fake_transcribe)
+    source = str(make_input(tmp_path))
+
+    first = run_transcription(TranscriptionRequest(source=source))
+    second = run_transcription(TranscriptionRequest(source=source, formats=("srt",)))
+
+    assert calls == {"convert": 1, "transcribe": 1}
+    assert first.metadata["cache"] == "miss"
+    assert second.metadata["cache"] == "hit"
+    assert "-->" in second.rendered["srt"]
+    # Hashing for the cache key is timed on its own, ahead of the probe.
+    assert [span.name for span in second.spans][:2] == ["hash", "probe"]
+
+    other_model = run_transcription(TranscriptionRequest(source=source, model="small"))
+    bypassed = run_transcription(TranscriptionRequest(source=source, bypass_cache=True))
+
+    assert calls == {"convert": 3, "transcribe": 3}
+    assert other_model.metadata["cache"] == "miss"
+    assert "cache" not in bypassed.metadata
+
+
+def test_pipeline_downloads_audio_only(patched_pipeline, monkeypatch):
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    tmp_path, _ = patched_pipeline
+    downloaded = make_input(tmp_path)
+    captured: dict = {}
+
+    def fake_download(url, output_dir=".", audio_only=False):
+        captured["audio_only"] = audio_only
+        return str(downloaded)
+
+    monkeypatch.setattr(pm, "download_video", fake_download)
+
+    run_transcription(TranscriptionRequest(source="https://example.com/v", download=True))
+
+    assert captured["audio_only"] is True
+
+
+def test_pipeline_stream_download_skips_container_file(monkeypatch, tmp_path):
+    import numpy as np
+
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    samples = np.full(16000, 0.1, dtype=np.float32)
+    calls = {"stream": 0, "transcribe": 0}
+
+    def fail_download(*a, **kw):
+        raise AssertionError("download_video must not run when streaming")
+
+    def fake_stream(url, should_cancel=None):
+        calls["stream"] += 1
+        return samples
+
+    def fake_transcribe(*a, **kw):
+        calls["transcribe"] += 1
+        return FAKE_TRANSCRIPTION
+
+    monkeypatch.setattr(pm, "download_video", fail_download)
+    monkeypatch.setattr(pm, "stream_url_to_whisper_array", fake_stream)
+    monkeypatch.setattr(pm, "transcribe_audio", fake_transcribe)
+    request = TranscriptionRequest(
+        source="https://example.com/v", download=True, stream_download=True, in_memory_audio=True
+    )
+
+    first = run_transcription(request)
+    second = run_transcription(request)
+
+    assert first.text == "Hello world"
+    # Streamed media is cached by its decoded audio.
+    assert calls == {"stream": 2, "transcribe": 1}
+    assert second.metadata["cache"] == "hit"
+
+
+def test_pipeline_falls_back_to_a_file_download_when_the_stream_cannot_be_decoded(
+    patched_pipeline, monkeypatch
+):
+    import subprocess
+
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    tmp_path, _ = patched_pipeline
+    downloaded = make_input(tmp_path)
+
+    def unreadable_stream(url, output_file, should_cancel=None):
+        # e.g. an M4A with its moov atom at the end, which ffmpeg cannot read from a pipe
+        raise subprocess.CalledProcessError(1, ["ffmpeg", "-i", "pipe:0"], stderr="moov not found")
+
+    monkeypatch.setattr(pm, "stream_url_to_whisper_audio", unreadable_stream)
+    monkeypatch.setattr(pm, "download_video", lambda *a, **kw: str(downloaded))
+    request = TranscriptionRequest(
+        source="https://example.com/v", download=True, stream_download=True
+    )
+
+    assert run_transcription(request).text == "Hello world"
+
+
+def test_pipeline_does_not_retry_when_yt_dlp_fails_while_streaming(monkeypatch):
+    import subprocess
+
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+
+    def failed_download(url, should_cancel=None):
+        raise subprocess.CalledProcessError(1, ["yt-dlp", "-o", "-", url], stderr="404")
+
+    def fail_download(*a, **kw):
+        raise AssertionError("a failed yt-dlp download must not be retried")
+
+    monkeypatch.setattr(pm, "stream_url_to_whisper_array", failed_download)
+    monkeypatch.setattr(pm, "download_video", fail_download)
+    request = TranscriptionRequest(
+        source="https://example.com/v", download=True, stream_download=True, in_memory_audio=True
+    )
+
+    with pytest.raises(subprocess.CalledProcessError):
+        run_transcription(request)
+
+
+def test_pipeline_records_stage_spans_and_calls_hooks(monkeypatch, tmp_path):
+    import numpy as np
+
+    import whisper_video_to_text.models as models
+    import whisper_video_to_text.pipeline as pm
+    from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+    from whisper_video_to_text.spans import add_span_hook, remove_span_hook
+
+    samples = np.zeros(32000, dtype=np.float32)
+
+    def fake_transcribe(*a, **kw):
+        # As if the model was loaded on first use inside transcribe_audio.
+        models._thread_loads.seconds = 0.25
+        return FAKE_TRANSCRIPTION
+
+    def broken_hook(span, request):
+        raise RuntimeError("hook failures must not fail the job")
+
+    seen: list[str] = []
+
+    def record_hook(span, request):
+        seen.append(span.name)
+
+    monkeypatch.setattr(pm, "decode_media_to_whisper_array", lambda *a, **kw: samples)
+    monkeypatch.setattr(pm, "transcribe_audio", fake_transcribe)
+    add_span_hook(broken_hook)
+    add_span_hook(record_hook)
+    try:
+        result = run_transcription(
+            TranscriptionRequest(
+                source=str(make_input(tmp_path)),
+                in_memory_audio=True,
+                bypass_cache=True,
+                output_base=tmp_path / "out",
+            )
+        )
+    finally:
+        remove_span_hook(broken_hook)
+        remove_span_hook(record_hook)
+
+    names = [span.name for span in result.spans]
+    assert names == ["probe", "convert", "model_load", "transcribe", "render", "write"]
+    assert seen == names
+    spans = {span.name: span for span in result.spans}
+    assert spans["convert"].bytes_in == 4
+    assert spans["convert"].bytes_out == samples.nbytes
+    assert spans["convert"].audio_seconds == 2.0
+    assert spans["model_load"].wall_seconds == 0.25
+    assert spans["write"].bytes_out == len("Hello world")
+    assert spans["transcribe"].as_dict()["audio_seconds"] == 2.0
+
+
+def test_audio_seconds_reads_the_data_chunk_of_a_wav_with_extra_chunks(tmp_path):
+    import struct
+
+    from whisper_video_to_text.pipeline import _audio_seconds
+
+    fmt = struct.pack("<HHIIHH", 1, 1, 16000, 32000, 2, 16)
+    info = b"INFOISFT" + struct.pack("<I", 14) + b"Lavf60.3.100\x00\x00"
+    data = b"\x00\x00" * 16000
+    body = (
+        b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + b"LIST"
+        + struct.pack("<I", len(info))
+        + info
+        + b"data"
+        + struct.pack("<I", len(data))
+        + data
+    )
+    wav = tmp_path / "passthrough.wav"
+    wav.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+    assert _audio_seconds(str(wav)) == 1.0
+    assert _audio_seconds(str(tmp_path / "missing.wav")) is None
@@ -0,0 +1,105 @@
+"""Tests for the cached ffprobe wrapper."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+
+import pytest
+
+from whisper_video_to_text import convert, probe
+
+FFPROBE_OUTPUT = {
+    "streams": [
+        {"index": 0, "codec_type": "video", "codec_name": "h264", "duration": "12.5"},
+        {
+            "index": 1,
+            "codec_type": "audio",
+            "codec_name": "aac",
+            "sample_rate": "48000",
+            "channels": 2,
+            "sample_fmt": "fltp",
+            "duration": "12.48",
+            "bit_rate": "128000",
+        },
+    ],
+    "format": {"format_name": "mov,mp4,m4a", "duration": "12.5", "bit_rate": "900000", "size": "4"},
+}
+
+
+def test_parse_ffprobe_json_reads_format_and_streams():
+    info = probe.parse_ffprobe_json(FFPROBE_OUTPUT)
+
+    assert info.duration == 12.5
+    assert info.format_name == "mov,mp4,m4a"
+    assert info.has_video
+    assert info.audio is not None
+    assert (info.audio.codec_name, info.audio.sample_rate, info.audio.channels) == ("aac", 48000, 2)
+    assert info.as_dict()["streams"][1]["bit_rate"] == 128000
+
+
+def test_parse_ffprobe_json_falls_back_to_stream_duration():
+    info = probe.parse_ffprobe_json(
+        {
+            "format": {"format_name": "mp3", "duration": "N/A"},
+            "streams": [
+                {"index": 0, "codec_type": "audio", "duration": "3.0"},
+                {"index": 1, "codec_type": "video", "codec_name": "mjpeg"},
+            ],
+        }
+    )
+
+    assert info.duration == 3.0
+    assert not info.has_video
+
+
+def test_probe_media_runs_ffprobe_once_per_file_version(tmp_path, monkeypatch):
+    media = tmp_path / "talk.mp4"
+    media.write_bytes(b"fake")
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(FFPROBE_OUTPUT).encode())
+
+    monkeypatch.setattr(probe.subprocess, "run", fake_run)
+
+    first = probe.probe_media(media)
+    assert probe.probe_media(str(media)) is first
+    assert convert.probe_media_duration(str(media)) == 12.5
+    assert len(calls) == 1
+    assert calls[0][0] == "ffprobe" and "-show_streams" in calls[0]
+
+    media.write_bytes(b"rewritten")
+    os.utime(media, ns=(0, 0))
+    probe.probe_media(media)
+    assert len(calls) == 2
+
+
+def test_probe_media_returns_none_when_ffprobe_fails(tmp_path, monkeypatch):
+    media = tmp_path / "broken.mp4"
+    media.write_bytes(b"fake")
+
+    def fail(cmd, **kwargs):
+        raise subprocess.CalledProcessError(1, cmd)
+
+    monkeypatch.setattr(probe.subprocess, "run", fail)
+
+    assert probe.probe_media(media) is None
+    assert probe.probe_media(tmp_path / "missing.mp4") is None
+
+
+def test_conversion_rejects_media_without_an_audio_stream(tmp_path, monkeypatch):
+    media = tmp_path / "silent.mp4"
+    media.write_bytes(b"fake")
+    video_only = {"format": {"duration": "5"}, "streams": [FFPROBE_OUTPUT["streams"][0]]}
+    monkeypatch.setattr(probe, "_run_ffprobe", lambda path: probe.parse_ffprobe_json(video_only))
+
+    def no_ffmpeg(*args, **kwargs):
+        raise AssertionError("ffmpeg should not run")
+
+    monkeypatch.setattr(convert.subprocess, "Popen", no_ffmpeg)
+
+    with pytest.raises(ValueError, match="no audio track"):
+        convert.convert_media_to_whisper_audio(str(media), str(tmp_path / "out.wav"))
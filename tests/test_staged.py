@@ -0,0 +1,151 @@
+"""Tests for overlapping transcription stages across jobs."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from whisper_video_to_text.pipeline import TranscriptionRequest, TranscriptionResult
+from whisper_video_to_text.staged import StagedPipeline, parse_stage_workers
+
+FAKE_TRANSCRIPTION = {
+    "text": "Hello world",
+    "segments": [{"start": 0.0, "end": 1.5, "text": " Hello world"}],
+    "language": "en",
+}
+
+
+def test_next_job_downloads_while_previous_job_transcribes():
+    transcribing = threading.Event()
+    second_downloaded = threading.Event()
+
+    def download(job):
+        if job.request.source == "b":
+            second_downloaded.set()
+
+    def transcribe(job):
+        if job.request.source == "a":
+            transcribing.set()
+            # Job "a" holds the only Whisper worker until "b" has been downloaded.
+            assert second_downloaded.wait(5)
+
+    def render(job):
+        return TranscriptionResult(text=job.request.source, language=None, segments=[], rendered={})
+
+    pipeline = StagedPipeline(
+        workers={"download": 1, "transcribe": 1},
+        stages=(("download", download), ("transcribe", transcribe), ("render", render)),
+    )
+    try:
+        first = pipeline.submit(TranscriptionRequest(source="a"))
+        assert transcribing.wait(5)
+        second = pipeline.submit(TranscriptionRequest(source="b"))
+
+        assert first.result(timeout=5).text == "a"
+        assert second.result(timeout=5).text == "b"
+    finally:
+        pipeline.shutdown()
+
+    stats = {s.name: s for s in pipeline.stats()}
+    assert stats["download"].processed == 2
+    assert stats["transcribe"].busy_seconds > 0
+    assert 0 < stats["transcribe"].utilization <= 1
+    assert all(s.queued == 0 and s.busy == 0 for s in stats.values())
+
+
+def test_stage_failure_reaches_the_caller_and_skips_later_stages():
+    rendered: list[str] = []
+
+    def convert(job):
+        raise ValueError("bad media")
+
+    pipeline = StagedPipeline(
+        stages=(("convert", convert), ("render", lambda job: rendered.append("x"))),
+    )
+    try:
+        with pytest.raises(ValueError, match="bad media"):
+            pipeline.run(TranscriptionRequest(source="broken.mp4"))
+    finally:
+        pipeline.shutdown()
+
+    assert rendered == []
+    assert {s.name: s.failed for s in pipeline.stats()} == {"convert": 1, "render": 0}
+
+
+def test_real_stages_produce_the_same_result_as_run_transcription(monkeypatch, tmp_path):
+    import whisper_video_to_text.pipeline as pm
+
+    audio_file = tmp_path / "audio-whisper.wav"
+    audio_file.write_bytes(b"fake audio")
+    monkeypatch.setattr(pm, "convert_media_to_whisper_audio", lambda *a, **kw: audio_file)
+    monkeypatch.setattr(pm, "transcribe_audio", lambda *a, **kw: FAKE_TRANSCRIPTION)
+    media = tmp_path / "input.mp4"
+    media.write_bytes(b"fake")
+    events: list[str] = []
+
+    pipeline = StagedPipeline()
+    try:
+        result = pipeline.run(
+            TranscriptionRequest(source=str(media), formats=("txt", "srt"), bypass_cache=True),
+            progress=lambda pct, status, msg: events.append(status),
+        )
+    finally:
+        pipeline.shutdown()
+
+    assert result.text == "Hello world"
+    assert set(result.rendered) == {"txt", "srt"}
+    assert events == ["converting", "transcribing", "saving"]
+
+
+def test_parse_stage_workers_ignores_unknown_and_invalid_entries():
+    assert parse_stage_workers("download=3, transcribe=0,bogus=2,convert=x") == {
+        "download": 3,
+        "transcribe": 1,
+    }
+
+
+def test_stats_endpoint_reports_scheduler_and_no_stages_in_thread_mode():
+    from fastapi.testclient import TestClient
+
+    from whisper_video_to_text.web.main import app
+
+    body = TestClient(app).get("/api/stats").json()
+
+    assert body["scheduler"]["slots"] >= 1
+    assert body["stages"] is None
+
+
+def test_base_exception_in_a_stage_reaches_the_caller_and_keeps_the_worker():
+    def convert(job):
+        if job.request.source == "interrupt.mp4":
+            raise KeyboardInterrupt
+        return job.request.source
+
+    pipeline = StagedPipeline(stages=(("convert", convert),), workers={"convert": 1})
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            pipeline.submit(TranscriptionRequest(source="interrupt.mp4")).result(timeout=5)
+        # The only convert worker survived and still takes jobs.
+        assert pipeline.submit(TranscriptionRequest(source="next.mp4")).result(timeout=5) == (
+            "next.mp4"
+        )
+    finally:
+        pipeline.shutdown()
+
+    assert {s.name: s.failed for s in pipeline.stats()} == {"convert": 1}
+
+
+def test_staged_web_mode_gives_the_scheduler_a_slot_per_stage_worker(monkeypatch):
+    from whisper_video_to_text.web import scheduler
+
+    monkeypatch.setenv("WVT_EXECUTOR", "staged")
+    monkeypatch.setenv("WVT_STAGE_WORKERS", "download=3")
+    monkeypatch.delenv(scheduler.MAX_CONCURRENT_JOBS_ENV, raising=False)
+    monkeypatch.setattr(scheduler, "_default_scheduler", None)
+    # download=3, convert=2, transcribe=1, render=1
+    assert scheduler.get_scheduler().slots == 7
+
+    monkeypatch.setenv(scheduler.MAX_CONCURRENT_JOBS_ENV, "2")
+    monkeypatch.setattr(scheduler, "_default_scheduler", None)
+    assert scheduler.get_scheduler().slots == 2
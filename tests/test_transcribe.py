@@ -1,8 +1,17 @@
+import wave
 from unittest import mock
 
+import numpy as np
 import pytest
 
-from whisper_video_to_text import transcribe
+from whisper_video_to_text import models, transcribe
+
+
+@pytest.fixture(autouse=True)
+def _empty_model_cache():
+    models.get_model_cache().clear()
+    yield
+    models.get_model_cache().clear()
 
 
 def test_transcribe_audio_success(tmp_path):
@@ -11,12 +20,46 @@ def test_transcribe_audio_success(tmp_path):
 
     mock_model = mock.Mock()
     mock_model.transcribe.return_value = {"text": "hello", "segments": [], "language": "en"}
-    with mock.patch("whisper_video_to_text.transcribe.whisper.load_model", return_value=mock_model):
+    with mock.patch("whisper_video_to_text.models.whisper.load_model", return_value=mock_model):
         result = transcribe.transcribe_audio(str(audio_file), model_name="base")
         assert result["text"] == "hello"
         assert result["language"] == "en"
 
 
+def test_transcribe_audio_reuses_cached_model(tmp_path):
+    audio_file = tmp_path / "audio.wav"
+    audio_file.write_text("dummy")
+
+    mock_model = mock.Mock()
+    mock_model.transcribe.return_value = {"text": "hello", "segments": [], "language": "en"}
+    with mock.patch(
+        "whisper_video_to_text.models.whisper.load_model", return_value=mock_model
+    ) as load_mock:
+        transcribe.transcribe_audio(str(audio_file), model_name="base")
+        transcribe.transcribe_audio(str(audio_file), model_name="base")
+
+    assert load_mock.call_count == 1
+    assert mock_model.transcribe.call_count == 2
+
+
+def test_transcribe_audio_reads_whisper_ready_wav_without_ffmpeg(tmp_path):
+    audio_file = tmp_path / "audio.wav"
+    with wave.open(str(audio_file), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(np.array([0, 16384, -32768], dtype="<i2").tobytes())
+
+    mock_model = mock.Mock()
+    mock_model.transcribe.return_value = {"text": "hello", "segments": [], "language": "en"}
+    with mock.patch("whisper_video_to_text.models.whisper.load_model", return_value=mock_model):
+        transcribe.transcribe_audio(str(audio_file), model_name="base")
+
+    audio = mock_model.transcribe.call_args.args[0]
+    assert isinstance(audio, np.ndarray) and audio.dtype == np.float32
+    np.testing.assert_array_equal(audio, [0.0, 0.5, -1.0])
+
+
 def test_transcribe_audio_missing_file(tmp_path):
     audio_file = tmp_path / "missing.mp3"
     with pytest.raises(FileNotFoundError):
@@ -34,3 +77,49 @@ def test_save_transcription(tmp_path):
     content = output_file.read_text()
     assert "hello world" in content
     assert "TRANSCRIPTION WITH TIMESTAMPS" in content
+
+
+def test_transcribe_audio_accepts_in_memory_samples():
+    import numpy as np
+
+    samples = np.zeros(16000, dtype=np.float32)
+    mock_model = mock.Mock()
+    mock_model.transcribe.return_value = {"text": "", "segments": [], "language": "en"}
+    with mock.patch("whisper_video_to_text.models.whisper.load_model", return_value=mock_model):
+        transcribe.transcribe_audio(samples, model_name="base")
+
+    assert mock_model.transcribe.call_args.args[0] is samples
+
+
+def test_concurrent_transcriptions_take_turns_on_a_shared_model():
+    import threading
+    import time
+
+    active = 0
+    overlap = []
+    counter_lock = threading.Lock()
+
+    def fake_transcribe(audio, **kwargs):
+        nonlocal active
+        with counter_lock:
+            active += 1
+            overlap.append(active)
+        time.sleep(0.02)
+        with counter_lock:
+            active -= 1
+        return {"text": "", "segments": [], "language": "en"}
+
+    mock_model = mock.Mock()
+    mock_model.transcribe.side_effect = fake_transcribe
+    samples = np.zeros(16000, dtype=np.float32)
+    with mock.patch("whisper_video_to_text.models.whisper.load_model", return_value=mock_model):
+        threads = [
+            threading.Thread(target=transcribe.transcribe_audio, args=(samples,)) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert mock_model.transcribe.call_count == 4
+    assert max(overlap) == 1
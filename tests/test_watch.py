@@ -0,0 +1,119 @@
+"""Tests for the watch-folder daemon."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from types import ModuleType
+
+import pytest
+
+whisper_stub = ModuleType("whisper")
+whisper_stub.load_model = None
+sys.modules.setdefault("whisper", whisper_stub)
+from whisper_video_to_text.pipeline import TranscriptionRequest  # noqa: E402
+from whisper_video_to_text.watch import (  # noqa: E402
+    InotifyWatcher,
+    PollingWatcher,
+    is_watchable,
+    watch_directory,
+)
+
+FAKE_TRANSCRIPTION = {
+    "text": "Hello world",
+    "segments": [{"start": 0.0, "end": 1.5, "text": " Hello world"}],
+    "language": "en",
+}
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_is_watchable_skips_outputs_hidden_and_unsupported_files(tmp_path):
+    assert is_watchable(tmp_path / "talk.MP4")
+    assert not is_watchable(tmp_path / "talk-transcript.wav")
+    assert not is_watchable(tmp_path / ".talk.mp4")
+    assert not is_watchable(tmp_path / "talk.mp4.part")
+
+
+def test_polling_watcher_reports_new_and_changed_files(tmp_path):
+    existing = tmp_path / "old.wav"
+    existing.write_bytes(b"a")
+    watcher = PollingWatcher(tmp_path)
+
+    (tmp_path / "new.mp3").write_bytes(b"b")
+    existing.write_bytes(b"longer")
+
+    assert sorted(p.name for p in watcher.changes(timeout=0)) == ["new.mp3", "old.wav"]
+    assert watcher.changes(timeout=0) == []
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_reports_written_media(tmp_path):
+    watcher = InotifyWatcher(tmp_path)
+    try:
+        (tmp_path / "notes.txt").write_text("ignored")
+        (tmp_path / "clip.m4a").write_bytes(b"audio")
+
+        assert [p.name for p in watcher.changes(timeout=2)] == ["clip.m4a"]
+    finally:
+        watcher.close()
+
+
+def test_dropped_file_is_transcribed_once_it_settles(monkeypatch, tmp_path):
+    import whisper_video_to_text.pipeline as pm
+
+    inbox = tmp_path / "inbox"
+    out = tmp_path / "out"
+    inbox.mkdir()
+    converted: list[str] = []
+
+    def fake_convert(media_path, output_file, **kw):
+        converted.append(media_path)
+        return tmp_path / "audio.wav"
+
+    monkeypatch.setattr(pm, "convert_media_to_whisper_audio", fake_convert)
+    monkeypatch.setattr(pm, "transcribe_audio", lambda *a, **kw: FAKE_TRANSCRIPTION)
+    (inbox / "before.wav").write_bytes(b"already there")
+
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch_directory,
+        args=(inbox, TranscriptionRequest(source="", bypass_cache=True)),
+        kwargs={
+            "output_dir": out,
+            "settle_seconds": 0.3,
+            "poll_interval": 0.05,
+            "stop": stop,
+            "watcher": PollingWatcher(inbox),
+            "warm_model": False,
+        },
+    )
+    thread.start()
+    try:
+        growing = inbox / "growing.mp4"
+        for _ in range(5):
+            with open(growing, "ab") as f:
+                f.write(b"chunk")
+            time.sleep(0.1)
+        # Still being written to, so not picked up yet.
+        assert not (out / "growing-transcript.txt").exists()
+
+        assert _wait_for(lambda: (out / "growing-transcript.txt").exists())
+        assert _wait_for(lambda: (out / "before-transcript.txt").exists())
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert sorted(converted) == sorted(
+        str((inbox / n).resolve()) for n in ("before.wav", "growing.mp4")
+    )
+    assert "done" in (out / "wvt-manifest.jsonl").read_text()
@@ -0,0 +1,87 @@
+"""Tests for per-job SSE event logs: fan-out, replay and reconnects."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+from types import ModuleType
+
+from fastapi.testclient import TestClient
+
+whisper_stub = ModuleType("whisper")
+whisper_stub.load_model = None
+sys.modules.setdefault("whisper", whisper_stub)
+from whisper_video_to_text.web import progress  # noqa: E402
+from whisper_video_to_text.web.events import JobEventLog  # noqa: E402
+
+
+async def _collect(log: JobEventLog, after: int = 0) -> list[int]:
+    return [
+        event.update["progress"]
+        async for event in log.subscribe(after=after, until={"complete"}, heartbeat=None)
+    ]
+
+
+def test_every_subscriber_gets_every_event_published_from_a_thread():
+    async def scenario() -> tuple[list[int], list[int]]:
+        log = JobEventLog()
+        readers = asyncio.gather(_collect(log), _collect(log))
+        await asyncio.sleep(0)
+
+        def work() -> None:
+            for pct in (10, 50):
+                log.publish({"progress": pct, "status": "running"})
+            log.publish({"progress": 100, "status": "complete"})
+
+        threading.Thread(target=work).start()
+        first, second = await asyncio.wait_for(readers, timeout=5)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == [10, 50, 100]
+
+
+def test_replay_resumes_after_last_event_id_and_keeps_the_final_event():
+    log = JobEventLog(maxlen=3)
+    for pct in range(10):
+        log.publish({"progress": pct, "status": "running"})
+    last = log.publish({"progress": 100, "status": "complete"})
+
+    assert asyncio.run(_collect(log, after=last - 2)) == [9, 100]
+    # Older events were dropped from the bounded log; the latest state survives.
+    assert asyncio.run(_collect(log))[-1] == 100
+
+
+def _sse_events(body: str) -> list[tuple[str | None, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "data" in fields:
+            events.append((fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+def test_events_endpoint_replays_missed_events_and_ends_finished_jobs():
+    from whisper_video_to_text.web.main import app
+
+    job_id = progress.create_job()
+    progress.update_progress_sync(job_id, 30, "converting", "Extracting audio...")
+    progress.update_progress_sync(job_id, 60, "transcribing", "Transcribing audio...")
+    progress.set_result_sync(job_id, {"text": "hi"})
+    client = TestClient(app)
+    try:
+        fresh = _sse_events(client.get(f"/events/{job_id}").text)
+        resumed = _sse_events(client.get(f"/events/{job_id}", headers={"Last-Event-ID": "1"}).text)
+    finally:
+        progress.jobs.pop(job_id, None)
+
+    # A finished job is answered with its final state straight away.
+    assert [update["status"] for _, update in fresh] == ["complete"]
+    assert fresh[0][1]["result"] == {"text": "hi"}
+    assert [(event_id, update["status"]) for event_id, update in resumed] == [
+        ("2", "transcribing"),
+        ("3", "complete"),
+    ]
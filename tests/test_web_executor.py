@@ -0,0 +1,108 @@
+"""Tests for running web jobs in persistent worker processes."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import time
+from types import ModuleType
+
+import pytest
+
+whisper_stub = ModuleType("whisper")
+whisper_stub.load_model = None
+sys.modules.setdefault("whisper", whisper_stub)
+from whisper_video_to_text.errors import TranscriptionCancelled  # noqa: E402
+from whisper_video_to_text.pipeline import (  # noqa: E402
+    TranscriptionRequest,
+    TranscriptionResult,
+)
+from whisper_video_to_text.web.executor import ProcessJobExecutor, WorkerError  # noqa: E402
+
+
+def _runner(request, progress=None, should_cancel=None):
+    """Stand-in for run_transcription, run inside the worker; behavior keyed by source."""
+    if request.source == "fail":
+        raise ValueError("bad media")
+    if request.source == "wait-for-cancel":
+        while not should_cancel():
+            time.sleep(0.01)
+        raise TranscriptionCancelled()
+    if request.source == "stuck":
+        time.sleep(60)
+    progress(60, "transcribing", "Transcribing audio...")
+    return TranscriptionResult(
+        text="hello", language="en", segments=[], rendered={}, metadata={"pid": os.getpid()}
+    )
+
+
+@pytest.fixture(scope="module")
+def executor():
+    # fork so the worker inherits the whisper stub above; the server uses spawn.
+    pool = ProcessJobExecutor(
+        workers=1,
+        cancel_grace=0.3,
+        runner=_runner,
+        mp_context=multiprocessing.get_context("fork"),
+    )
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def _cancel_after(seconds: float):
+    deadline = time.monotonic() + seconds
+    return lambda: time.monotonic() >= deadline
+
+
+def test_progress_is_forwarded_and_worker_is_reused(executor):
+    events: list[tuple] = []
+
+    first = executor.run(
+        "job-1", TranscriptionRequest(source="ok"), progress=lambda *args: events.append(args)
+    )
+    second = executor.run("job-2", TranscriptionRequest(source="ok"))
+
+    assert first.text == "hello"
+    assert events == [(60, "transcribing", "Transcribing audio...")]
+    assert first.metadata["pid"] == second.metadata["pid"] != os.getpid()
+
+
+def test_job_errors_are_reported_without_losing_the_worker(executor):
+    respawns = executor.respawns
+    with pytest.raises(WorkerError, match="bad media"):
+        executor.run("job-fail", TranscriptionRequest(source="fail"))
+    assert executor.respawns == respawns
+
+
+def test_cooperative_cancel_keeps_the_worker(executor):
+    respawns = executor.respawns
+    with pytest.raises(TranscriptionCancelled):
+        executor.run(
+            "job-cancel",
+            TranscriptionRequest(source="wait-for-cancel"),
+            should_cancel=_cancel_after(0.2),
+        )
+    assert executor.respawns == respawns
+
+
+def test_stuck_job_is_killed_and_worker_replaced(executor):
+    before = executor.run("job-before", TranscriptionRequest(source="ok")).metadata["pid"]
+    started = time.monotonic()
+
+    with pytest.raises(TranscriptionCancelled):
+        executor.run(
+            "job-stuck", TranscriptionRequest(source="stuck"), should_cancel=_cancel_after(0.2)
+        )
+
+    assert time.monotonic() - started < 10
+    after = executor.run("job-after", TranscriptionRequest(source="ok")).metadata["pid"]
+    assert after != before
+
+
+def test_run_fails_after_shutdown():
+    pool = ProcessJobExecutor(workers=1, mp_context=multiprocessing.get_context("fork"))
+    pool.shutdown()
+    with pytest.raises(WorkerError):
+        pool.run("job-x", TranscriptionRequest(source="ok"))
@@ -0,0 +1,138 @@
+"""Tests for the indexed transcript history behind /api/history."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from types import ModuleType
+
+import pytest
+from fastapi.testclient import TestClient
+
+whisper_stub = ModuleType("whisper")
+whisper_stub.load_model = None
+sys.modules.setdefault("whisper", whisper_stub)
+from whisper_video_to_text.web.history import (  # noqa: E402
+    HistoryEntry,
+    HistoryIndex,
+    InvalidCursor,
+)
+
+
+@pytest.fixture()
+def index(tmp_path):
+    transcripts = tmp_path / "transcripts"
+    transcripts.mkdir()
+    index = HistoryIndex(transcripts / ".history.sqlite3", transcripts)
+    yield index
+    index.close()
+
+
+def test_pages_are_newest_first_and_chained_by_cursor(index):
+    for n in range(5):
+        index.record(HistoryEntry(job_id=f"job{n}", created_at=1000.0 + n, formats=["txt"]))
+
+    first, cursor = index.page(limit=2)
+    second, cursor2 = index.page(limit=2, before=cursor)
+    last, cursor3 = index.page(limit=2, before=cursor2)
+
+    assert [e.job_id for e in first + second + last] == ["job4", "job3", "job2", "job1", "job0"]
+    assert cursor3 is None
+    with pytest.raises(InvalidCursor):
+        index.page(before="not-a-cursor")
+
+
+def test_filters_by_language_model_and_source_name(index):
+    index.record(HistoryEntry("a", 1.0, ["txt"], "en", "base", "Team Meeting.mp4"))
+    index.record(HistoryEntry("b", 2.0, ["srt"], "de", "base", "interview.mp3"))
+    index.record(HistoryEntry("c", 3.0, ["txt"], "en", "small", "meeting_100%.wav"))
+
+    assert [e.job_id for e in index.page(language="en")[0]] == ["c", "a"]
+    assert [e.job_id for e in index.page(model="base")[0]] == ["b", "a"]
+    assert [e.job_id for e in index.page(source="meeting")[0]] == ["c", "a"]
+    assert [e.job_id for e in index.page(source="100%")[0]] == ["c"]
+
+
+def test_sync_picks_up_files_changed_outside_the_index(index):
+    transcripts = index.transcripts_dir
+    (transcripts / "old.txt").touch()
+    (transcripts / "old.srt").touch()
+    past = time.time() - 7200
+    os.utime(transcripts / "old.txt", (past, past))
+
+    assert index.sync()
+    assert not index.sync()
+    entries, _ = index.page()
+    assert [(e.job_id, e.formats) for e in entries] == [("old", ["srt", "txt"])]
+    assert entries[0].created_at == pytest.approx(past)
+
+    (transcripts / "old.txt").unlink()
+    (transcripts / "old.srt").unlink()
+    # The directory mtime may not change within the same clock tick.
+    index.sync(force=True)
+    assert index.page()[0] == []
+
+
+def test_refresh_builds_a_new_index_inline_then_rescans_in_the_background(index, monkeypatch):
+    import threading
+
+    from whisper_video_to_text.web import history
+
+    transcripts = index.transcripts_dir
+    (transcripts / "first.txt").touch()
+    index.refresh()
+    assert [e.job_id for e in index.page()[0]] == ["first"]
+
+    release = threading.Event()
+    scan = history._scan_transcripts
+
+    def slow_scan(directory):
+        release.wait(5)
+        return scan(directory)
+
+    monkeypatch.setattr(history, "_scan_transcripts", slow_scan)
+    (transcripts / "copied-in.txt").touch()
+    # Make sure the directory mtime differs even within one clock tick.
+    os.utime(transcripts, ns=(1, 1))
+
+    # The request path returns at once and serves the index as it stands.
+    index.refresh()
+    assert "copied-in" not in [e.job_id for e in index.page()[0]]
+
+    release.set()
+    index.wait_for_rescan(timeout=5)
+    assert {e.job_id for e in index.page()[0]} == {"first", "copied-in"}
+
+
+def test_history_endpoint_returns_list_and_next_cursor_header(monkeypatch, tmp_path):
+    from whisper_video_to_text.web.history import get_history_index
+    from whisper_video_to_text.web.main import app
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "transcripts").mkdir()
+    for n in range(3):
+        (tmp_path / "transcripts" / f"job{n}.txt").touch()
+        os.utime(tmp_path / "transcripts" / f"job{n}.txt", (1000 + n, 1000 + n))
+    get_history_index()
+
+    client = TestClient(app)
+    resp = client.get("/api/history", params={"limit": 2})
+    assert resp.status_code == 200
+    assert [item["job_id"] for item in resp.json()] == ["job2", "job1"]
+    assert resp.json()[0]["formats"] == ["txt"]
+
+    rest = client.get("/api/history", params={"before": resp.headers["X-Next-Cursor"]})
+    assert [item["job_id"] for item in rest.json()] == ["job0"]
+    assert "X-Next-Cursor" not in rest.headers
+    assert client.get("/api/history", params={"before": "bogus"}).status_code == 400
+
+
+def test_history_endpoint_annotations_evaluate_on_python_39():
+    # FastAPI resolves endpoint annotations at runtime; `str | None` is a TypeError before 3.10.
+    from whisper_video_to_text.web.views import get_history
+
+    filters = ("before", "language", "model", "source")
+    assert {name: get_history.__annotations__[name] for name in filters} == dict.fromkeys(
+        filters, "Optional[str]"
+    )
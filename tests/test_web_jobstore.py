@@ -0,0 +1,167 @@
+"""Tests for the pluggable web job store."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from whisper_video_to_text.web import jobstore
+from whisper_video_to_text.web import progress as progress_mod
+
+
+@pytest.fixture()
+def sqlite_store(tmp_path):
+    store = progress_mod.configure_store(jobstore.SqliteJobStore(tmp_path / "jobs.sqlite3"))
+    progress_mod.jobs.clear()
+    yield store
+    progress_mod.configure_store(jobstore.MemoryJobStore(progress_mod.jobs))
+    progress_mod.jobs.clear()
+
+
+def test_sqlite_store_uses_wal_and_indexes(sqlite_store):
+    conn = sqlite3.connect(sqlite_store.path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(jobs)")}
+    assert {"jobs_status_created", "jobs_created"} <= indexes
+
+
+def test_updates_are_written_through_to_sqlite(sqlite_store):
+    job_id = progress_mod.create_job()
+    progress_mod.update_progress_sync(job_id, 40, "transcribing", "Working...")
+    progress_mod.set_result_sync(job_id, {"text": "hello"})
+
+    record = sqlite_store.load(job_id)
+    assert record is not None
+    assert record.status == "complete"
+    assert record.progress == 40
+    assert record.result == {"text": "hello"}
+    assert record.owner == jobstore.OWNER
+
+
+def test_jobs_from_another_worker_are_read_from_the_store(sqlite_store):
+    job_id = progress_mod.create_job()
+    progress_mod.update_progress_sync(job_id, 60, "transcribing", "Working...")
+    # Simulate a different worker process: nothing in its local dict.
+    progress_mod.jobs.clear()
+
+    job = progress_mod.get_job(job_id)
+    assert job is not None
+    assert job.local is False
+    assert (job.progress, job.status) == (60, "transcribing")
+
+    assert progress_mod.request_cancel_sync(job_id) is True
+    assert sqlite_store.cancel_requested(job_id) is True
+    assert progress_mod.is_cancel_requested(job_id) is True
+
+
+def test_list_jobs_filters_by_status_newest_first(sqlite_store):
+    first = progress_mod.create_job()
+    second = progress_mod.create_job()
+    progress_mod.update_progress_sync(first, 100, "error", "boom")
+
+    assert [r.job_id for r in progress_mod.list_jobs()] == [second, first]
+    assert [r.job_id for r in progress_mod.list_jobs(status="error")] == [first]
+
+
+def test_recover_orphans_fails_jobs_of_dead_processes(sqlite_store, monkeypatch):
+    job_id = progress_mod.create_job()
+    finished = progress_mod.create_job()
+    progress_mod.set_result_sync(finished, {"text": ""})
+    conn = sqlite3.connect(sqlite_store.path)
+    dead_owner = f"{jobstore.socket.gethostname()}:999999"
+    conn.execute("UPDATE jobs SET owner = ?", (dead_owner,))
+    conn.commit()
+    monkeypatch.setattr(jobstore, "_pid_alive", lambda pid: False)
+
+    assert sqlite_store.recover_orphans() == 1
+    record = sqlite_store.load(job_id)
+    assert record is not None
+    assert record.status == "error"
+    assert record.message == jobstore.ORPHANED_MESSAGE
+    assert sqlite_store.load(finished).status == "complete"
+
+
+def test_recover_orphans_leaves_live_workers_alone(sqlite_store):
+    job_id = progress_mod.create_job()
+    assert sqlite_store.recover_orphans() == 0
+    assert sqlite_store.load(job_id).status == "pending"
+
+
+def test_recover_orphans_after_restart_with_the_same_pid(tmp_path):
+    # A restarted container runs uvicorn as PID 1 again, under the same hostname.
+    path = tmp_path / "jobs.sqlite3"
+    job = progress_mod.JobState()
+    job.status = "transcribing"
+    previous = jobstore.SqliteJobStore(path)
+    previous.save("job-1", job)
+    previous.close()
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "UPDATE jobs SET owner = ?",
+        (f"{jobstore.socket.gethostname()}:{jobstore.os.getpid()}:previous-boot",),
+    )
+    conn.commit()
+    conn.close()
+
+    store = jobstore.SqliteJobStore(path)
+    try:
+        assert store.recover_orphans() == 1
+        assert store.load("job-1").status == "error"
+    finally:
+        store.close()
+
+
+def test_prune_drops_finished_jobs_past_retention(sqlite_store, monkeypatch):
+    monkeypatch.setenv(progress_mod.JOB_RETENTION_HOURS_ENV, "1")
+    old = progress_mod.create_job()
+    running = progress_mod.create_job()
+    progress_mod.set_result_sync(old, {"text": ""})
+
+    dropped = progress_mod.prune_jobs(now=progress_mod.jobs[old].updated_at + 7200)
+
+    assert dropped == 1
+    assert old not in progress_mod.jobs
+    assert sqlite_store.load(old) is None
+    assert progress_mod.get_job(running) is not None
+
+
+def test_store_from_env_selects_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setenv(jobstore.JOB_STORE_ENV, "sqlite")
+    monkeypatch.setenv(jobstore.JOB_DB_ENV, str(tmp_path / "env.sqlite3"))
+    store = jobstore.store_from_env({})
+    try:
+        assert isinstance(store, jobstore.SqliteJobStore)
+        assert store.path == tmp_path / "env.sqlite3"
+    finally:
+        store.close()
+
+    monkeypatch.delenv(jobstore.JOB_STORE_ENV)
+    assert isinstance(jobstore.store_from_env({}), jobstore.MemoryJobStore)
+
+
+def test_incomplete_job_store_cannot_be_instantiated():
+    class Partial(jobstore.JobStore):
+        def save(self, job_id, job):
+            pass
+
+    with pytest.raises(TypeError, match="abstract"):
+        Partial()
+
+
+def test_jobs_endpoint_annotations_evaluate_on_python_39():
+    # FastAPI resolves endpoint annotations at runtime; `str | None` is a TypeError before 3.10.
+    import ast
+    from pathlib import Path
+
+    import whisper_video_to_text
+
+    views = Path(whisper_video_to_text.__file__).parent / "web" / "views.py"
+    tree = ast.parse(views.read_text())
+    get_jobs = next(
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.AsyncFunctionDef) and node.name == "get_jobs"
+    )
+    status = get_jobs.args.args[0]
+    assert ast.unparse(status.annotation) == "Optional[str]"
@@ -0,0 +1,85 @@
+"""Tests for the Prometheus /metrics endpoint and the lifecycle hooks that feed it."""
+
+from __future__ import annotations
+
+import sys
+from types import ModuleType
+
+import pytest
+from fastapi.testclient import TestClient
+
+whisper_stub = ModuleType("whisper")
+whisper_stub.load_model = None
+sys.modules.setdefault("whisper", whisper_stub)
+from whisper_video_to_text.web import metrics, progress  # noqa: E402
+from whisper_video_to_text.web.metrics import Counter, Histogram  # noqa: E402
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", labels=("stage",), buckets=(1.0, 5.0))
+    for value in (0.5, 2.0, 9.0):
+        histogram.observe(value, stage='say "hi"')
+
+    lines = histogram.render()
+
+    assert lines[:2] == ["# HELP demo_seconds Demo.", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="5"} 2' in lines
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{stage="say \\"hi\\""} 11.5' in lines
+    assert 'demo_seconds_count{stage="say \\"hi\\""} 3' in lines
+
+
+def test_counter_rejects_wrong_labels():
+    counter = Counter("demo_total", "Demo.", labels=("kind",))
+    with pytest.raises(ValueError):
+        counter.inc(kind="a", extra="b")
+
+
+def test_job_lifecycle_updates_status_gauges_and_stage_histograms():
+    queued_before = metrics.jobs_by_status.value(status="queued")
+    complete_before = metrics.jobs_finished.value(status="complete")
+    convert_before = metrics.stage_duration.count(stage="convert")
+    audio_before = metrics.audio_seconds.value()
+
+    job_id = progress.create_job()
+    progress.update_progress_sync(job_id, 0, "queued", "Waiting")
+    assert metrics.jobs_by_status.value(status="queued") == queued_before + 1
+
+    progress.set_result_sync(
+        job_id,
+        {
+            "text": "hi",
+            "spans": [
+                {"name": "convert", "wall_seconds": 0.4, "audio_seconds": 60.0},
+                {"name": "transcribe", "wall_seconds": 3.0, "audio_seconds": 60.0},
+            ],
+        },
+    )
+
+    assert metrics.jobs_by_status.value(status="queued") == queued_before
+    assert metrics.jobs_finished.value(status="complete") == complete_before + 1
+    assert metrics.stage_duration.count(stage="convert") == convert_before + 1
+    assert metrics.audio_seconds.value() == audio_before + 60.0
+    progress.jobs.pop(job_id, None)
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    from whisper_video_to_text.web.main import app
+
+    metrics.upload_bytes.inc(1024, kind="chunked")
+    with TestClient(app) as client:
+        resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    for name in (
+        "wvt_jobs_created_total",
+        "wvt_queue_depth",
+        "wvt_model_cache_hits_total",
+        "wvt_model_cache_misses_total",
+        "wvt_sse_connections",
+    ):
+        assert f"# TYPE {name} " in body
+    assert 'wvt_upload_bytes_total{kind="chunked"}' in body
@@ -0,0 +1,93 @@
+"""Tests for startup model preloading and the readiness probe."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from whisper_video_to_text.web import preload
+
+
+def test_configured_models_parses_env(monkeypatch):
+    monkeypatch.setenv(preload.PRELOAD_MODELS_ENV, " base, small ,,base ")
+    assert preload.configured_models() == ("base", "small")
+
+
+def test_configured_models_empty_by_default(monkeypatch):
+    monkeypatch.delenv(preload.PRELOAD_MODELS_ENV, raising=False)
+    assert preload.configured_models() == ()
+
+
+def test_start_preload_without_models_is_immediately_ready():
+    assert preload.start_preload(()) is None
+    assert preload.state.ready
+    assert preload.state.snapshot()["status"] == "ready"
+
+
+def test_start_preload_loads_models_in_background():
+    with mock.patch.object(preload, "load_model") as load_mock:
+        thread = preload.start_preload(("tiny", "base"))
+        assert thread is not None
+        thread.join(timeout=5)
+
+    assert [c.args[0] for c in load_mock.call_args_list] == ["tiny", "base"]
+    assert preload.state.snapshot()["loaded"] == ["tiny", "base"]
+    assert preload.state.ready
+
+
+def test_preload_failure_is_reported():
+    with mock.patch.object(preload, "load_model", side_effect=RuntimeError("no such model")):
+        thread = preload.start_preload(("huge",))
+        assert thread is not None
+        thread.join(timeout=5)
+
+    snapshot = preload.state.snapshot()
+    assert snapshot["status"] == "failed"
+    assert "no such model" in snapshot["failed"]["huge"]
+    assert not preload.state.ready
+
+
+def test_worker_reports_are_ready_only_once_every_worker_has_loaded(monkeypatch):
+    monkeypatch.setattr(preload, "state", preload.PreloadState(("base",), workers=2))
+
+    preload.record_loaded(["base"], {}, worker=101)
+    preload.record_loaded(["base"], {}, worker=101)
+    assert not preload.state.ready
+    assert preload.state.snapshot()["status"] == "loading"
+
+    preload.record_loaded(["base"], {}, worker=102)
+    assert preload.state.ready
+    assert preload.state.finished_at is not None
+
+
+def test_ready_endpoint_returns_503_until_models_are_resident(monkeypatch):
+    from whisper_video_to_text.web.main import app
+
+    release = threading.Event()
+
+    def blocking_load(name):
+        release.wait(timeout=5)
+
+    monkeypatch.setenv(preload.PRELOAD_MODELS_ENV, "base")
+    with mock.patch.object(preload, "load_model", side_effect=blocking_load):
+        with TestClient(app) as client:
+            assert client.get("/healthz").status_code == 200
+
+            resp = client.get("/healthz/ready")
+            assert resp.status_code == 503
+            assert resp.json()["pending"] == ["base"]
+
+            release.set()
+            for _ in range(100):
+                if preload.state.ready:
+                    break
+                time.sleep(0.01)
+
+            resp = client.get("/healthz/ready")
+            assert resp.status_code == 200
+            assert resp.json()["loaded"] == ["base"]
+
+    preload.start_preload(())
@@ -0,0 +1,139 @@
+"""Tests for the resumable chunked upload API."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import whisper_video_to_text.web.views as views_mod
+from whisper_video_to_text.web.main import app
+from whisper_video_to_text.web.resumable import (
+    UploadError,
+    create_session,
+    parse_content_range,
+    prune_sessions,
+    received_ranges,
+)
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return TestClient(app)
+
+
+def _put(client, upload_id: str, media: bytes, start: int, end: int):
+    return client.put(
+        f"/api/uploads/{upload_id}",
+        content=media[start:end],
+        headers={"Content-Range": f"bytes {start}-{end - 1}/{len(media)}"},
+    )
+
+
+def test_parse_content_range():
+    assert parse_content_range("bytes 0-99/1000") == (0, 100, 1000)
+    with pytest.raises(UploadError):
+        parse_content_range("bytes 10-5/1000")
+    with pytest.raises(UploadError):
+        parse_content_range(None)
+
+
+def test_out_of_order_chunks_resume_and_finalize_into_a_job(client, tmp_path):
+    media = bytes(range(256)) * 1000
+    created = client.post("/api/uploads", json={"filename": "talk.mp4", "size": len(media)})
+    assert created.status_code == 201
+    upload_id = created.json()["upload_id"]
+    part = tmp_path / "uploads" / f"{upload_id}.mp4.part"
+    assert part.stat().st_size == len(media)
+
+    assert _put(client, upload_id, media, 200_000, len(media)).status_code == 200
+    assert _put(client, upload_id, media, 0, 100_000).status_code == 200
+
+    status = client.get(f"/api/uploads/{upload_id}").json()
+    assert status["ranges"] == [[0, 100_000], [200_000, len(media)]]
+    assert status["offset"] == 100_000
+    early = client.post(f"/api/uploads/{upload_id}/finalize", data={"model": "tiny"})
+    assert early.status_code == 409
+
+    assert _put(client, upload_id, media, 100_000, 200_000).status_code == 200
+    calls: list[dict] = []
+    with patch.object(
+        views_mod, "run_transcription_task", side_effect=lambda job_id, **kw: calls.append(kw)
+    ):
+        response = client.post(
+            f"/api/uploads/{upload_id}/finalize", data={"model": "tiny", "formats": ["srt"]}
+        )
+        assert views_mod.get_scheduler().join(timeout=5)
+
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    assert calls[0]["upload_path"] == str(Path("uploads") / f"{job_id}.mp4")
+    assert calls[0]["source_name"] == "talk.mp4"
+    assert calls[0]["model"] == "tiny"
+    assert calls[0]["formats"] == ["srt"]
+    assert (tmp_path / calls[0]["upload_path"]).read_bytes() == media
+    assert not part.exists()
+    assert client.get(f"/api/uploads/{upload_id}").status_code == 404
+
+
+def test_chunk_body_must_match_its_range(client):
+    upload_id = client.post("/api/uploads", json={"filename": "a.mp3", "size": 100}).json()[
+        "upload_id"
+    ]
+    short = client.put(
+        f"/api/uploads/{upload_id}", content=b"x" * 10, headers={"Content-Range": "bytes 0-49/100"}
+    )
+    outside = client.put(
+        f"/api/uploads/{upload_id}", content=b"x" * 10, headers={"Content-Range": "bytes 0-9/200"}
+    )
+
+    assert short.status_code == 400
+    assert outside.status_code == 400
+    assert client.get(f"/api/uploads/{upload_id}").json()["received"] == 0
+
+
+def test_unsupported_extension_is_refused(client):
+    response = client.post("/api/uploads", json={"filename": "notes.txt", "size": 10})
+    assert response.status_code == 400
+    assert "Unsupported file type" in response.json()["error"]
+
+
+def test_oversized_upload_is_refused_before_preallocating(client, tmp_path, monkeypatch):
+    import shutil
+
+    monkeypatch.setenv("WVT_MAX_UPLOAD_MB", "1")
+    too_big = client.post("/api/uploads", json={"filename": "a.mp4", "size": 2 * 1024 * 1024})
+    assert too_big.status_code == 413
+    assert "1 MB limit" in too_big.json()["error"]
+
+    monkeypatch.setenv("WVT_MAX_UPLOAD_MB", "0")
+    free = shutil.disk_usage(tmp_path).free
+    no_room = client.post("/api/uploads", json={"filename": "a.mp4", "size": free + 2**30})
+    assert no_room.status_code == 413
+    assert "free disk space" in no_room.json()["error"]
+
+    assert list((tmp_path / "uploads").glob("*.part")) == []
+
+
+def test_delete_aborts_an_upload(client, tmp_path):
+    upload_id = client.post("/api/uploads", json={"filename": "a.wav", "size": 10}).json()[
+        "upload_id"
+    ]
+
+    assert client.delete(f"/api/uploads/{upload_id}").status_code == 200
+    assert client.get(f"/api/uploads/{upload_id}").status_code == 404
+    assert list((tmp_path / "uploads").glob("*.part")) == []
+
+
+def test_expired_sessions_are_pruned(tmp_path):
+    uploads = tmp_path / "uploads"
+    session = create_session("b.wav", 10, upload_dir=uploads)
+
+    assert prune_sessions(upload_dir=uploads) == 0
+    assert prune_sessions(now=time.time() + 48 * 3600, upload_dir=uploads) == 1
+    assert not session.data_path(uploads).exists()
+    assert received_ranges(session, upload_dir=uploads) == []
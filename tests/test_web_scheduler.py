@@ -0,0 +1,106 @@
+"""Tests for the bounded transcription job scheduler."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from whisper_video_to_text.web.scheduler import JobScheduler, QueueFull
+
+
+@pytest.fixture()
+def gate():
+    """An event that blocking jobs wait on; always released at teardown."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_jobs_beyond_the_slots_wait_in_fifo_order(gate):
+    positions: list[tuple[str, int, int]] = []
+    order: list[str] = []
+    scheduler = JobScheduler(slots=1, max_queue=5, on_queued=lambda *p: positions.append(p))
+
+    def job(job_id: str) -> None:
+        if job_id == "a":
+            gate.wait(5)
+        order.append(job_id)
+
+    assert scheduler.submit("a", job) == 0
+    assert scheduler.submit("b", job) == 1
+    assert scheduler.submit("c", job) == 2
+    assert scheduler.position("a") == 0
+    assert scheduler.position("c") == 2
+
+    gate.set()
+    assert scheduler.join(timeout=5)
+
+    assert order == ["a", "b", "c"]
+    # "c" moves up to first in line once "b" starts.
+    assert ("c", 1, 1) in positions
+    stats = scheduler.stats()
+    assert (stats.submitted, stats.completed, stats.running, stats.queued) == (3, 3, 0, 0)
+
+
+def test_full_queue_rejects_with_retry_after(gate):
+    scheduler = JobScheduler(slots=1, max_queue=1)
+    scheduler.submit("running", lambda job_id: gate.wait(5))
+    scheduler.submit("waiting", lambda job_id: None)
+
+    assert scheduler.is_full()
+    with pytest.raises(QueueFull) as excinfo:
+        scheduler.submit("rejected", lambda job_id: None)
+
+    assert excinfo.value.retry_after >= 1
+    assert scheduler.stats().rejected == 1
+    gate.set()
+    assert scheduler.join(timeout=5)
+
+
+def test_cancel_removes_waiting_job_only(gate):
+    ran: list[str] = []
+    scheduler = JobScheduler(slots=1, max_queue=5)
+    scheduler.submit("running", lambda job_id: gate.wait(5))
+    scheduler.submit("queued", lambda job_id: ran.append(job_id))
+
+    assert scheduler.cancel("running") is False
+    assert scheduler.cancel("queued") is True
+    gate.set()
+    assert scheduler.join(timeout=5)
+
+    assert ran == []
+    assert scheduler.stats().cancelled_while_queued == 1
+
+
+def test_failing_job_releases_its_slot():
+    ran: list[str] = []
+    scheduler = JobScheduler(slots=1, max_queue=5)
+
+    def boom(job_id: str) -> None:
+        raise RuntimeError("boom")
+
+    scheduler.submit("bad", boom)
+    scheduler.submit("good", lambda job_id: ran.append(job_id))
+
+    assert scheduler.join(timeout=5)
+    assert ran == ["good"]
+
+
+def test_transcribe_api_returns_429_when_queue_is_full(gate):
+    from fastapi.testclient import TestClient
+
+    import whisper_video_to_text.web.views as views_mod
+    from whisper_video_to_text.web.main import app
+
+    scheduler = JobScheduler(slots=1, max_queue=0)
+    scheduler.submit("busy", lambda job_id: gate.wait(5))
+
+    with patch.object(views_mod, "get_scheduler", return_value=scheduler):
+        response = TestClient(app).post("/api/transcribe", data={"url": "https://example.com"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    gate.set()
+    assert scheduler.join(timeout=5)
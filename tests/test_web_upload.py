@@ -185,29 +185,79 @@ def test_url_result_has_no_source_name(tmp_path, monkeypatch):
     assert captured_result[0].get("source_name") is None
 
 
-def test_transcribe_api_passes_uploaded_file_to_background_task():
-    """Multipart uploads from the web form are forwarded to the worker task."""
+def test_transcribe_api_streams_upload_to_job_scoped_file(tmp_path, monkeypatch):
+    """Multipart uploads are written straight to uploads/{job_id}{suffix} for the worker."""
     from fastapi.testclient import TestClient
 
     import whisper_video_to_text.web.views as views_mod
     from whisper_video_to_text.web.main import app
 
+    monkeypatch.chdir(tmp_path)
     calls: list[dict] = []
 
     def fake_task(job_id, **kwargs):
         calls.append({"job_id": job_id, **kwargs})
 
+    media = b"fake media" * 50_000
     with patch.object(views_mod, "run_transcription_task", side_effect=fake_task):
         response = TestClient(app).post(
             "/api/transcribe",
-            files={"file": ("clip.mp3", b"fake media", "audio/mpeg")},
-            data={"model": "tiny", "timestamps": "true"},
+            files={"file": ("clip.mp3", media, "audio/mpeg")},
+            data={"model": "tiny", "timestamps": "true", "formats": ["srt", "vtt"]},
         )
+        assert views_mod.get_scheduler().join(timeout=5)
 
     assert response.status_code == 200
+    job_id = response.json()["job_id"]
     assert calls
-    assert calls[0]["file"] is not None
-    assert calls[0]["file"].filename == "clip.mp3"
+    assert calls[0]["upload_path"] == str(Path("uploads") / f"{job_id}.mp3")
+    assert (tmp_path / calls[0]["upload_path"]).read_bytes() == media
+    assert calls[0]["source_name"] == "clip.mp3"
     assert calls[0]["url"] is None
     assert calls[0]["model"] == "tiny"
+    assert calls[0]["formats"] == ["srt", "vtt"]
     assert calls[0]["timestamps"] is True
+
+
+def test_transcribe_api_rejects_unsupported_upload_before_saving(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import whisper_video_to_text.web.views as views_mod
+    from whisper_video_to_text.web.main import app
+
+    monkeypatch.chdir(tmp_path)
+    with patch.object(views_mod, "run_transcription_task") as task:
+        response = TestClient(app).post(
+            "/api/transcribe", files={"file": ("notes.txt", b"not media", "text/plain")}
+        )
+
+    assert response.status_code == 400
+    assert ".txt" in response.json()["error"]
+    assert not task.called
+    uploads = tmp_path / "uploads"
+    assert not uploads.exists() or not any(uploads.iterdir())
+
+
+def test_run_transcription_task_uses_streamed_upload_path(tmp_path, monkeypatch):
+    import whisper_video_to_text.web.views as views_mod
+    from whisper_video_to_text.pipeline import TranscriptionResult
+
+    monkeypatch.chdir(tmp_path)
+    captured: list[str] = []
+    results: list[dict] = []
+
+    def fake_run(request, progress=None, should_cancel=None):
+        captured.append(request.source)
+        return TranscriptionResult(text="", language=None, segments=[], rendered={})
+
+    with (
+        patch.object(views_mod, "run_transcription", side_effect=fake_run),
+        patch.object(views_mod, "update_progress_sync"),
+        patch.object(views_mod, "set_result_sync", side_effect=lambda jid, r: results.append(r)),
+    ):
+        views_mod.run_transcription_task(
+            "job-streamed", upload_path="uploads/job-streamed.mp4", source_name="talk.mp4"
+        )
+
+    assert captured == ["uploads/job-streamed.mp4"]
+    assert results[0]["source_name"] == "talk.mp4"
@@ -0,0 +1,186 @@
+"""NumPy helpers for 16 kHz mono Whisper audio."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from whisper_video_to_text.convert import WAV_WINDOW_SAMPLES, WHISPER_SAMPLE_RATE, WhisperWav
+
+# Audio that the helpers below accept: samples in memory or a memory-mapped WAV.
+Samples = Union[np.ndarray, WhisperWav]
+
+# Analysis frame used for energy measurements.
+FRAME_SECONDS = 0.03
+# Frames quieter than this (RMS, dBFS) count as silence.
+SILENCE_DBFS = -40.0
+
+
+def load_whisper_wav(path: str | Path) -> np.ndarray:
+    """Read a 16 kHz mono pcm_s16le WAV (as written by the converter) into float32 samples.
+
+    The file is memory-mapped and converted in windows, so the only full-size
+    allocation is the returned array. Use `WhisperWav` directly to avoid even that.
+    """
+    return WhisperWav(path).to_array()
+
+
+def frame_energy_dbfs(audio: Samples, frame_samples: int | None = None) -> np.ndarray:
+    """Return the RMS level of each full analysis frame in dBFS.
+
+    Frames are measured one WAV_WINDOW_SAMPLES block at a time, which keeps a
+    memory-mapped `WhisperWav` from being converted all at once.
+    """
+    if frame_samples is None:
+        frame_samples = int(FRAME_SECONDS * WHISPER_SAMPLE_RATE)
+    n_frames = len(audio) // frame_samples
+    levels = np.empty(n_frames, dtype=np.float32)
+    step = max(1, WAV_WINDOW_SAMPLES // frame_samples)
+    for first in range(0, n_frames, step):
+        last = min(n_frames, first + step)
+        block = audio[first * frame_samples : last * frame_samples]
+        frames = block.reshape(last - first, frame_samples)
+        power = np.mean(np.square(frames, dtype=np.float32), axis=1)
+        levels[first:last] = 10.0 * np.log10(power + 1e-12)
+    return levels
+
+
+def smooth(values: np.ndarray, width: int) -> np.ndarray:
+    """Moving average over `width` frames, same length as the input."""
+    if width <= 1 or len(values) == 0:
+        return values
+    kernel = np.ones(width, dtype=np.float32) / width
+    return np.convolve(values, kernel, mode="same")
+
+
+# Speech detection: frames louder than the noise floor by this margin are speech...
+SPEECH_MARGIN_DB = 12.0
+# ...unless that would cut into speech more than this far below the loud level.
+SPEECH_HEADROOM_DB = 25.0
+# Nothing quieter than this counts as speech, whatever the recording's levels.
+SPEECH_FLOOR_DBFS = -60.0
+# Padding kept around each speech region so word onsets and tails survive.
+SPEECH_PAD_SECONDS = 0.2
+# Pauses shorter than this stay inside the surrounding speech region.
+MIN_SILENCE_SECONDS = 0.6
+# Bursts shorter than this (clicks, bumps) are not treated as speech.
+MIN_SPEECH_SECONDS = 0.25
+
+
+def detect_speech_regions(
+    audio: Samples, threshold_dbfs: float | None = None
+) -> list[tuple[int, int]]:
+    """Return (start, end) sample ranges that contain speech-level energy.
+
+    The threshold adapts to the recording: SPEECH_MARGIN_DB above the noise
+    floor (10th percentile frame level), capped at SPEECH_HEADROOM_DB below the
+    loud level (95th percentile) so continuous or quiet speech is never dropped,
+    and never below SPEECH_FLOOR_DBFS.
+    """
+    frame = int(FRAME_SECONDS * WHISPER_SAMPLE_RATE)
+    levels = frame_energy_dbfs(audio, frame)
+    if len(levels) == 0:
+        return []
+    if threshold_dbfs is None:
+        noise_floor, loud = (float(v) for v in np.percentile(levels, [10, 95]))
+        threshold_dbfs = max(
+            SPEECH_FLOOR_DBFS,
+            min(noise_floor + SPEECH_MARGIN_DB, loud - SPEECH_HEADROOM_DB),
+        )
+
+    active = levels >= threshold_dbfs
+    # Rising/falling edges of the active mask give frame-level regions.
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    frame_regions = edges.reshape(-1, 2)
+
+    min_gap = int(MIN_SILENCE_SECONDS / FRAME_SECONDS)
+    min_len = int(MIN_SPEECH_SECONDS / FRAME_SECONDS)
+    merged: list[list[int]] = []
+    for start, end in frame_regions:
+        if merged and start - merged[-1][1] < min_gap:
+            merged[-1][1] = int(end)
+        else:
+            merged.append([int(start), int(end)])
+
+    pad = int(SPEECH_PAD_SECONDS * WHISPER_SAMPLE_RATE)
+    regions: list[tuple[int, int]] = []
+    for start, end in merged:
+        if end - start < min_len:
+            continue
+        begin = max(0, start * frame - pad)
+        finish = min(len(audio), end * frame + pad)
+        if regions and begin <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], finish)
+        else:
+            regions.append((begin, finish))
+    return regions
+
+
+class SpeechTimeline:
+    """Maps between the original audio and the speech-only audio built from its regions."""
+
+    def __init__(self, regions: list[tuple[int, int]], total_samples: int) -> None:
+        self.regions = regions
+        self.total_samples = total_samples
+        lengths = [end - start for start, end in regions]
+        # Offset of each region within the compacted audio.
+        self._compact_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        self.speech_samples = int(sum(lengths))
+
+    @property
+    def skipped_ratio(self) -> float:
+        if self.total_samples == 0:
+            return 0.0
+        return 1.0 - self.speech_samples / self.total_samples
+
+    def compact(self, audio: Samples) -> np.ndarray:
+        """Return only the speech regions of audio, concatenated."""
+        if not self.regions:
+            return audio[:0]
+        return np.concatenate([audio[start:end] for start, end in self.regions])
+
+    def to_original(self, seconds: float) -> float:
+        """Convert a time in the compacted audio to the matching original time."""
+        if not self.regions:
+            return seconds
+        sample = seconds * WHISPER_SAMPLE_RATE
+        index = int(np.searchsorted(self._compact_starts, sample, side="right")) - 1
+        index = min(max(index, 0), len(self.regions) - 1)
+        start, end = self.regions[index]
+        original = start + (sample - self._compact_starts[index])
+        return float(min(original, end)) / WHISPER_SAMPLE_RATE
+
+    def remap_result(self, result: dict) -> dict:
+        """Return a copy of a Whisper result with timestamps on the original timeline."""
+        segments = []
+        for segment in result.get("segments", []):
+            remapped = dict(segment)
+            remapped["start"] = self.to_original(segment["start"])
+            remapped["end"] = self.to_original(segment["end"])
+            if "words" in segment:
+                remapped["words"] = [
+                    {
+                        **word,
+                        "start": self.to_original(word["start"]),
+                        "end": self.to_original(word["end"]),
+                    }
+                    for word in segment["words"]
+                ]
+            segments.append(remapped)
+        return {**result, "segments": segments}
+
+    def summary(self) -> dict:
+        """Return VAD savings for result metadata."""
+        return {
+            "total_seconds": round(self.total_samples / WHISPER_SAMPLE_RATE, 3),
+            "speech_seconds": round(self.speech_samples / WHISPER_SAMPLE_RATE, 3),
+            "skipped_ratio": round(self.skipped_ratio, 4),
+            "regions": len(self.regions),
+        }
+
+
+def build_speech_timeline(audio: Samples) -> SpeechTimeline:
+    """Run the energy VAD over audio and return its speech timeline."""
+    return SpeechTimeline(detect_speech_regions(audio), len(audio))
@@ -0,0 +1,209 @@
+"""Batch transcription of a directory or glob of media files.
+
+One process serves the whole batch, so each Whisper model is loaded once. Jobs
+go through a `StagedPipeline`: `--jobs N` files are decoded by ffmpeg in
+parallel while a single Whisper worker transcribes. Whisper installs decoding
+hooks on the shared model, so `transcribe_audio` runs one transcription on it at
+a time.
+
+Every finished file is appended to a JSON Lines manifest, together with its
+outputs or its error. On a rerun, files whose latest entry is `done` are
+skipped, provided the source is unchanged and the outputs still exist. Failed
+files are tried again.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from whisper_video_to_text.convert import SUPPORTED_MEDIA_EXTENSIONS
+from whisper_video_to_text.pipeline import TranscriptionRequest, TranscriptionResult
+from whisper_video_to_text.staged import StagedPipeline
+
+MANIFEST_NAME = "wvt-manifest.jsonl"
+
+
+@dataclass
+class BatchSummary:
+    done: int
+    failed: int
+    skipped: int
+    manifest: Path
+
+
+def is_source_media(path: Path) -> bool:
+    """Media files only; skips hidden/partial files and our own `-transcript` outputs."""
+    return (
+        path.suffix.lower() in SUPPORTED_MEDIA_EXTENSIONS
+        and not path.name.startswith(".")
+        and not path.stem.endswith("-transcript")
+    )
+
+
+def discover_media(target: str, output_dir: Path | None = None) -> tuple[Path, list[Path]]:
+    """Return (root, files) for a directory (searched recursively) or a glob pattern.
+
+    Only files passing `is_source_media` are kept, and nothing under
+    `output_dir`, so a rerun never picks up a kept `-transcript.wav`. The root
+    is the directory that output paths are made relative to.
+    """
+    path = Path(target)
+    if path.is_dir():
+        root = path
+        candidates: Iterable[Path] = path.rglob("*")
+    else:
+        candidates = (Path(p) for p in glob.glob(target, recursive=True))
+        root = Path.cwd()
+    excluded = output_dir.resolve() if output_dir is not None else None
+    files = sorted(
+        {
+            p.resolve()
+            for p in candidates
+            if p.is_file()
+            and is_source_media(p)
+            and (excluded is None or not p.resolve().is_relative_to(excluded))
+        }
+    )
+    if not path.is_dir() and files:
+        root = Path(os.path.commonpath([str(f.parent) for f in files]))
+    return root.resolve(), files
+
+
+def output_base_for(source: Path, root: Path, output_dir: Path | None) -> Path:
+    """Deterministic output base, so a rerun finds the outputs of earlier runs."""
+    if output_dir is None:
+        return source.parent / f"{source.stem}-transcript"
+    relative = source.relative_to(root) if source.is_relative_to(root) else Path(source.name)
+    return output_dir / relative.parent / f"{relative.stem}-transcript"
+
+
+class BatchManifest:
+    """Append-only JSON Lines record of finished files; the last entry per source wins."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by an interrupted run.
+                        continue
+                    if isinstance(entry, dict) and "source" in entry:
+                        self.entries[entry["source"]] = entry
+
+    def is_done(self, source: Path) -> bool:
+        entry = self.entries.get(str(source))
+        if not entry or entry.get("status") != "done":
+            return False
+        try:
+            stat = source.stat()
+        except OSError:
+            return False
+        if entry.get("size") != stat.st_size or entry.get("mtime") != stat.st_mtime:
+            return False
+        return all(Path(p).exists() for p in entry.get("outputs", {}).values())
+
+    def record(self, source: Path, status: str, **fields: Any) -> None:
+        try:
+            stat = source.stat()
+            size, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            size, mtime = None, None
+        entry = {
+            "source": str(source),
+            "status": status,
+            "size": size,
+            "mtime": mtime,
+            "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **fields,
+        }
+        with self._lock:
+            self.entries[entry["source"]] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def record_outcome(
+        self, source: Path, future: Future[TranscriptionResult], started: float
+    ) -> str:
+        """Record a finished pipeline future; returns "done" or "failed"."""
+        error = future.exception()
+        if error is not None:
+            self.record(source, "failed", error=str(error) or type(error).__name__)
+            logging.error(f"✗ {source}: {error}")
+            return "failed"
+        outputs = {fmt: str(path) for fmt, path in future.result().output_files.items()}
+        seconds = round(time.monotonic() - started, 3)
+        self.record(source, "done", outputs=outputs, seconds=seconds)
+        return "done"
+
+
+def local_pipeline(jobs: int) -> StagedPipeline:
+    """Pipeline for local files: `jobs` concurrent decodes feeding one Whisper worker."""
+    jobs = max(1, jobs)
+    return StagedPipeline(
+        workers={"download": 1, "convert": jobs, "transcribe": 1, "render": 1},
+        queue_size=jobs,
+    )
+
+
+def run_batch(
+    target: str,
+    template: TranscriptionRequest,
+    jobs: int = 2,
+    output_dir: Path | None = None,
+    manifest_path: Path | None = None,
+) -> BatchSummary:
+    """Transcribe every supported file under `target` with the settings of `template`."""
+    root, files = discover_media(target, output_dir)
+    if manifest_path is None:
+        manifest_path = (output_dir or root) / MANIFEST_NAME
+    manifest = BatchManifest(manifest_path)
+
+    pending = [f for f in files if not manifest.is_done(f)]
+    skipped = len(files) - len(pending)
+    logging.info(
+        f"Batch: {len(files)} media file(s) under {root}, {skipped} already done, "
+        f"{len(pending)} to transcribe with {jobs} job(s) in flight"
+    )
+    counts = {"done": 0, "failed": 0}
+    counts_lock = threading.Lock()
+
+    def finished(source: Path, started: float, future: Future[TranscriptionResult]) -> None:
+        status = manifest.record_outcome(source, future, started)
+        with counts_lock:
+            counts[status] += 1
+            total = counts["done"] + counts["failed"]
+        logging.info(f"[{total}/{len(pending)}] {status}: {source}")
+
+    pipeline = local_pipeline(jobs)
+    futures = []
+    # No try/finally: shutdown() drains the queues, which an interrupted run should not wait for.
+    for source in pending:
+        base = output_base_for(source, root, output_dir)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        request = replace(template, source=str(source), download=False, output_base=base)
+        started = time.monotonic()
+        future = pipeline.submit(request)
+        future.add_done_callback(partial(finished, source, started))
+        futures.append(future)
+    wait(futures)
+    # Done-callbacks run on the stage threads; joining them makes the counts final.
+    pipeline.shutdown()
+    return BatchSummary(counts["done"], counts["failed"], skipped, manifest_path)
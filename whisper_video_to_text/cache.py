@@ -0,0 +1,178 @@
+"""On-disk cache of Whisper results keyed by media content and decode options.
+
+Re-submitting the same file (or a URL that downloads to the same bytes) with
+the same model and options returns the stored result instead of re-running
+conversion and Whisper; only the requested formats are re-rendered.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Directory for cached results; set to "off" to disable the cache.
+RESULT_CACHE_DIR_ENV = "WVT_RESULT_CACHE_DIR"
+RESULT_CACHE_MAX_MB_ENV = "WVT_RESULT_CACHE_MAX_MB"
+DEFAULT_RESULT_CACHE_DIR = Path.home() / ".cache" / "whisper-video-to-text" / "results"
+DEFAULT_MAX_MB = 256
+HASH_CHUNK_BYTES = 1 << 20
+# Bump when the cached payload layout changes so stale entries are ignored.
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class ResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+def hash_file(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_samples(samples: Any) -> str:
+    """Return the SHA-256 hex digest of a decoded audio buffer."""
+    return hashlib.sha256(memoryview(samples).cast("B")).hexdigest()
+
+
+def cache_key(content_hash: str, options: dict[str, Any]) -> str:
+    """Combine a content digest with the options that affect Whisper's output."""
+    material = json.dumps(
+        {"version": CACHE_FORMAT_VERSION, "content": content_hash, "options": options},
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    # Whisper results can carry NumPy scalars (e.g. probabilities).
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ResultCache:
+    """Size-bounded directory of JSON results, evicted least-recently-used first."""
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = ResultCacheStats()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached payload for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            # Touch so eviction sees this entry as recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            payload = None
+        except (OSError, ValueError):
+            logging.warning(f"Discarding unreadable cache entry {path.name}", exc_info=True)
+            path.unlink(missing_ok=True)
+            payload = None
+
+        with self._lock:
+            if payload is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        return payload
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        """Store payload under key, then evict old entries beyond the size budget."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, default=_json_default)
+            os.replace(tmp_name, self._path(key))
+        except (OSError, TypeError):
+            logging.warning("Could not write transcription cache entry", exc_info=True)
+            return
+
+        with self._lock:
+            self._stats.stores += 1
+            self._evict_locked(keep=key)
+
+    def _evict_locked(self, keep: str) -> None:
+        if self.max_bytes <= 0:
+            return
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path.stem == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Delete every cached entry and reset statistics."""
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self._stats = ResultCacheStats()
+
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            return ResultCacheStats(**self._stats.as_dict())
+
+
+_default_cache: ResultCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache | None:
+    """Return the process-wide result cache, or None when disabled via the environment."""
+    global _default_cache
+    directory = os.getenv(RESULT_CACHE_DIR_ENV) or str(DEFAULT_RESULT_CACHE_DIR)
+    if directory.lower() == "off":
+        return None
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.directory != Path(directory):
+            try:
+                max_mb = int(os.getenv(RESULT_CACHE_MAX_MB_ENV, DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = DEFAULT_MAX_MB
+            _default_cache = ResultCache(directory, max_bytes=max_mb * 1024 * 1024)
+        return _default_cache
@@ -0,0 +1,328 @@
+"""Parallel transcription of long recordings.
+
+Long audio is split at quiet points into chunks, each chunk is transcribed in a
+worker process that keeps its own cached model, and the per-chunk segments are
+stitched back onto the original timeline.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Optional
+
+import numpy as np
+
+from whisper_video_to_text.audio import (
+    FRAME_SECONDS,
+    SILENCE_DBFS,
+    Samples,
+    frame_energy_dbfs,
+    smooth,
+)
+from whisper_video_to_text.convert import WHISPER_SAMPLE_RATE
+from whisper_video_to_text.errors import TranscriptionCancelled
+from whisper_video_to_text.models import DEFAULT_DTYPE, load_model
+from whisper_video_to_text.transcribe import transcribe_audio
+
+DEFAULT_CHUNK_SECONDS = 600.0
+# How far either side of the nominal boundary to look for a pause.
+SPLIT_SEARCH_SECONDS = 30.0
+# Pauses are scored over this window so a long gap beats a single quiet frame.
+SPLIT_SMOOTHING_SECONDS = 0.3
+# Extra audio decoded before a boundary that had to cut through speech.
+OVERLAP_SECONDS = 2.0
+# How often a running chunked transcription checks should_cancel.
+CANCEL_POLL_SECONDS = 0.2
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    index: int
+    start: int  # first sample owned by this chunk
+    end: int  # one past the last sample owned by this chunk
+    decode_start: int  # first sample fed to Whisper (earlier than start when overlapping)
+
+    @property
+    def offset_seconds(self) -> float:
+        return self.decode_start / WHISPER_SAMPLE_RATE
+
+    @property
+    def start_seconds(self) -> float:
+        return self.start / WHISPER_SAMPLE_RATE
+
+
+def plan_chunks(
+    audio: Samples,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+) -> list[AudioChunk]:
+    """Split audio into roughly chunk_seconds pieces, cutting at the quietest nearby point.
+
+    When no pause is found near a boundary the next chunk starts overlap_seconds
+    early, and the duplicated text is removed when stitching.
+    """
+    total = len(audio)
+    target = int(chunk_seconds * WHISPER_SAMPLE_RATE)
+    if target <= 0 or total <= target * 1.5:
+        return [AudioChunk(0, 0, total, 0)]
+
+    frame = int(FRAME_SECONDS * WHISPER_SAMPLE_RATE)
+    levels = smooth(frame_energy_dbfs(audio, frame), int(SPLIT_SMOOTHING_SECONDS / FRAME_SECONDS))
+    search = int(min(SPLIT_SEARCH_SECONDS, chunk_seconds / 4) * WHISPER_SAMPLE_RATE)
+    overlap = int(overlap_seconds * WHISPER_SAMPLE_RATE)
+
+    splits: list[tuple[int, bool]] = []
+    position = 0
+    # Stop once the remainder fits in one chunk, so the tail is never tiny.
+    while total - position > target * 1.5:
+        ideal = position + target
+        first = max(position + frame, ideal - search) // frame
+        last = min(total - frame, ideal + search) // frame
+        window = levels[first:last]
+        if len(window) == 0:
+            split, silent = ideal, False
+        else:
+            quietest = first + int(np.argmin(window))
+            split = quietest * frame + frame // 2
+            silent = bool(levels[quietest] < SILENCE_DBFS)
+        splits.append((split, silent))
+        position = split
+
+    chunks: list[AudioChunk] = []
+    start, lead = 0, 0
+    for index, (split, silent) in enumerate(splits):
+        chunks.append(AudioChunk(index, start, split, max(0, start - lead)))
+        start, lead = split, (0 if silent else overlap)
+    chunks.append(AudioChunk(len(splits), start, total, max(0, start - lead)))
+    return chunks
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def stitch_results(chunks: list[AudioChunk], results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge per-chunk Whisper results into one result on the original timeline."""
+    segments: list[dict[str, Any]] = []
+    language = None
+    for chunk, result in zip(chunks, results):
+        language = language or result.get("language")
+        offset = chunk.offset_seconds
+        for segment in result.get("segments", []):
+            start = segment["start"] + offset
+            end = segment["end"] + offset
+            # Segments centred in the overlap lead-in belong to the previous chunk.
+            if chunk.index > 0 and (start + end) / 2 < chunk.start_seconds:
+                continue
+            if segments and _normalize_text(segment["text"]) == _normalize_text(
+                segments[-1]["text"]
+            ):
+                continue
+            shifted = dict(segment)
+            shifted["id"] = len(segments)
+            shifted["start"] = start
+            shifted["end"] = end
+            if "seek" in shifted:
+                shifted["seek"] = segment["seek"] + int(offset * 100)
+            if "words" in segment:
+                shifted["words"] = [
+                    {**word, "start": word["start"] + offset, "end": word["end"] + offset}
+                    for word in segment["words"]
+                ]
+            segments.append(shifted)
+
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language,
+    }
+
+
+def _init_worker(model_name: str, device: str | None, dtype: str) -> None:
+    """Load the model once per worker process; later chunks hit the worker's cache."""
+    load_model(model_name, device=device, dtype=dtype)
+
+
+def _transcribe_chunk(
+    samples: np.ndarray,
+    model_name: str,
+    language: str | None,
+    device: str | None,
+    dtype: str,
+) -> dict[str, Any]:
+    return transcribe_audio(
+        samples, model_name=model_name, language=language, device=device, dtype=dtype
+    )
+
+
+def create_chunk_pool(
+    workers: int, model_name: str, device: str | None = None, dtype: str = DEFAULT_DTYPE
+) -> ProcessPoolExecutor:
+    """Start a process pool whose workers each keep `model_name` resident.
+
+    Every worker holds its own copy of the model, so memory grows with `workers`.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_name, device, dtype),
+    )
+
+
+# Idle chunk pools kept for the next long job, oldest first. Each one keeps a
+# model resident in every worker, so only a couple are retained.
+MAX_IDLE_CHUNK_POOLS = 2
+
+_PoolKey = tuple[str, Optional[str], str, int]
+_idle_pools: list[tuple[_PoolKey, ProcessPoolExecutor]] = []
+_idle_pools_lock = threading.Lock()
+
+
+def _acquire_chunk_pool(key: _PoolKey) -> ProcessPoolExecutor:
+    """Take an idle pool for (model, device, dtype, workers), or start one.
+
+    A pool is used by one job at a time, so cancelling that job can kill its
+    workers without touching anyone else's chunks.
+    """
+    with _idle_pools_lock:
+        for index, (idle_key, pool) in enumerate(_idle_pools):
+            # A pool whose worker died can't run anything; drop it.
+            if idle_key == key and not getattr(pool, "_broken", False):
+                del _idle_pools[index]
+                return pool
+    model_name, device, dtype, workers = key
+    return create_chunk_pool(workers, model_name, device, dtype)
+
+
+def _release_chunk_pool(key: _PoolKey, pool: ProcessPoolExecutor) -> None:
+    """Keep a pool for reuse, shutting down the oldest idle ones past the limit."""
+    with _idle_pools_lock:
+        _idle_pools.append((key, pool))
+        evicted = _idle_pools[: max(0, len(_idle_pools) - MAX_IDLE_CHUNK_POOLS)]
+        del _idle_pools[: len(evicted)]
+    for _, old in evicted:
+        old.shutdown(wait=False)
+
+
+def _terminate_chunk_pool(pool: ProcessPoolExecutor) -> None:
+    """Stop a pool now, killing workers mid-chunk instead of leaving them decoding."""
+    # ProcessPoolExecutor has no public way to stop running work on Python < 3.14.
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout=2)
+        if process.is_alive():
+            process.kill()
+
+
+def shutdown_chunk_pools() -> None:
+    """Shut down every idle chunk pool (their models are unloaded with them)."""
+    with _idle_pools_lock:
+        pools = [pool for _, pool in _idle_pools]
+        _idle_pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def transcribe_chunked(
+    audio: Samples,
+    model_name: str = "base",
+    language: str | None = None,
+    workers: int = 2,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    device: str | None = None,
+    dtype: str = DEFAULT_DTYPE,
+    should_cancel: Callable[[], bool] | None = None,
+    executor: Executor | None = None,
+) -> dict[str, Any]:
+    """
+    Transcribe long audio as parallel chunks and return a Whisper-style result.
+
+    Args:
+        audio: 16 kHz mono float32 samples, or a `WhisperWav`; each chunk is
+            then read from the memory-mapped file only when it is submitted,
+            about `workers` chunks ahead of the ones finished.
+        model_name: Whisper model to use.
+        language: Language code; when omitted it is detected on the first chunk
+            and reused for the rest so every chunk decodes in the same language.
+        workers: Worker processes to start when no executor is given.
+        chunk_seconds: Target chunk length.
+        device: Torch device for worker models.
+        dtype: Model weight precision.
+        should_cancel: Optional callable polled while chunks run.
+        executor: Existing pool to use (left running on return). Without one,
+            a pool for this model and worker count is reused from an earlier
+            call when idle, and its workers are killed if this call is
+            cancelled or fails.
+
+    Returns:
+        Dict with "text", "segments", and "language", like `model.transcribe`.
+    """
+    chunks = plan_chunks(audio, chunk_seconds)
+    if len(chunks) == 1:
+        return transcribe_audio(
+            audio[:], model_name=model_name, language=language, device=device, dtype=dtype
+        )
+
+    logging.info(f"Transcribing {len(chunks)} chunks across {workers} workers...")
+    key: _PoolKey = (model_name, device, dtype, workers)
+    owned: ProcessPoolExecutor | None = None
+    if executor is None:
+        owned = executor = _acquire_chunk_pool(key)
+    pool = executor
+    results: list[dict[str, Any]] = [{} for _ in chunks]
+    submitted: list[Future] = []
+    # Each submitted slice is pickled into the pool's call queue at once, so only
+    # a worker's worth of chunks (plus one spare) is read from a WhisperWav ahead.
+    ahead = max(1, workers) + 1
+
+    def run(batch: list[AudioChunk], chunk_language: str | None) -> None:
+        waiting = iter(batch)
+        running: dict[Future, AudioChunk] = {}
+        # Chunks take minutes; poll for cancellation while they run, not between them.
+        timeout = CANCEL_POLL_SECONDS if should_cancel else None
+        while True:
+            for chunk in islice(waiting, ahead - len(running)):
+                samples = audio[chunk.decode_start : chunk.end]
+                future = pool.submit(
+                    _transcribe_chunk, samples, model_name, chunk_language, device, dtype
+                )
+                submitted.append(future)
+                running[future] = chunk
+            if not running:
+                return
+            if should_cancel and should_cancel():
+                raise TranscriptionCancelled()
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future).index] = future.result()
+
+    try:
+        remaining = chunks
+        if language is None:
+            run(chunks[:1], None)
+            language = results[0].get("language")
+            remaining = chunks[1:]
+        run(remaining, language)
+    except BaseException:
+        if owned is not None:
+            _terminate_chunk_pool(owned)
+        else:
+            for future in submitted:
+                future.cancel()
+        raise
+    if owned is not None:
+        _release_chunk_pool(key, owned)
+
+    logging.info("✓ Chunked transcription complete")
+    return stitch_results(chunks, results)
@@ -1,14 +1,118 @@
 import argparse
 import logging
+import signal
 import sys
+import threading
 import time
 from pathlib import Path
+from typing import Optional
 
+from whisper_video_to_text.batch import MANIFEST_NAME, run_batch
+from whisper_video_to_text.chunking import DEFAULT_CHUNK_SECONDS
 from whisper_video_to_text.convert import supported_media_extensions_display
 from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+from whisper_video_to_text.spans import format_spans
+from whisper_video_to_text.watch import DEFAULT_SETTLE_SECONDS, PollingWatcher, watch_directory
+
+
+def _add_transcription_options(parser: argparse.ArgumentParser) -> None:
+    """Options shared by single-file, --batch and watch runs."""
+    parser.add_argument(
+        "-m",
+        "--model",
+        default="base",
+        choices=["tiny", "base", "small", "medium", "large"],
+        help="Whisper model to use (default: base)",
+    )
+    parser.add_argument("-l", "--language", help="Language code (e.g., en, es, fr)")
+    parser.add_argument(
+        "-t", "--timestamps", action="store_true", help="Include timestamps in transcription"
+    )
+    parser.add_argument(
+        "-k", "--keep-audio", action="store_true", help="Keep intermediate WAV file"
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        help="Decode audio straight into memory instead of writing an intermediate WAV",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Split long recordings into chunks transcribed by N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=1,
+        help="Decode long media as N time slices with parallel ffmpeg processes (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=DEFAULT_CHUNK_SECONDS,
+        help=f"Target chunk length with --workers (default: {DEFAULT_CHUNK_SECONDS:.0f})",
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Skip silence with a voice-activity pre-pass before transcribing",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached results and always re-run Whisper",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed output")
+    parser.add_argument("--logfile", help="Append logs to this file (default: none)", default=None)
+    parser.add_argument(
+        "--format",
+        action="append",
+        choices=["txt", "srt", "vtt"],
+        default=None,
+        help="Output format(s): txt, srt, vtt. Can be specified multiple times. (default: txt)",
+    )
+
+
+def _configure_logging(args: argparse.Namespace) -> None:
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    if args.logfile:
+        handlers.append(logging.FileHandler(args.logfile, mode="a", encoding="utf-8"))
+    logging.basicConfig(
+        level=log_level, format="%(asctime)s [%(levelname)s] %(message)s", handlers=handlers
+    )
+
+
+def _request_from_args(
+    args: argparse.Namespace, source: str, output_base: Optional[Path]
+) -> TranscriptionRequest:
+    return TranscriptionRequest(
+        source=source,
+        download=getattr(args, "download", False),
+        model=args.model,
+        language=args.language,
+        formats=tuple(set(args.format or ["txt"])),
+        include_timestamps=args.timestamps,
+        keep_audio=args.keep_audio,
+        output_base=output_base,
+        in_memory_audio=args.in_memory,
+        workers=max(1, args.workers),
+        decode_workers=max(1, args.decode_workers),
+        chunk_seconds=args.chunk_seconds,
+        vad=args.vad,
+        bypass_cache=args.no_cache,
+        stream_download=getattr(args, "stream", False),
+    )
 
 
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "watch":
+        watch_main(sys.argv[2:])
+        return
+
     supported_formats = supported_media_extensions_display(with_dots=False)
     supported_formats_with_dots = supported_media_extensions_display()
     parser = argparse.ArgumentParser(
@@ -29,12 +133,22 @@ Examples:
   # Include timestamps in output
   python -m whisper_video_to_text video.mp4 --timestamps
 
+  # Transcribe a long recording on 4 cores
+  python -m whisper_video_to_text lecture.mp4 --workers 4
+
   # Keep intermediate WAV file
   python -m whisper_video_to_text video.mp4 --keep-audio
 
   # Export to SRT and VTT
   python -m whisper_video_to_text video.mp4 --format srt --format vtt
 
+  # Transcribe a whole directory (or glob), decoding 4 files at a time;
+  # rerunning skips files recorded as done in the manifest
+  python -m whisper_video_to_text --batch ./recordings --jobs 4 -o ./transcripts
+
+  # Keep running and transcribe files as they are dropped into a folder
+  python -m whisper_video_to_text watch ./inbox -o ./transcripts --model small
+
 Supported local media formats:
   {supported_formats}
 
@@ -45,49 +159,56 @@ Available Whisper models:
 
     parser.add_argument(
         "input",
+        nargs="?",
         help=f"Media file path ({supported_formats_with_dots}) or video URL (with --download)",
     )
-    parser.add_argument("-o", "--output", help="Output text file (default: input_name.txt)")
     parser.add_argument(
-        "-m",
-        "--model",
-        default="base",
-        choices=["tiny", "base", "small", "medium", "large"],
-        help="Whisper model to use (default: base)",
+        "-o",
+        "--output",
+        help="Output text file (default: input_name.txt); with --batch, an output directory",
     )
-    parser.add_argument("-l", "--language", help="Language code (e.g., en, es, fr)")
     parser.add_argument(
-        "-t", "--timestamps", action="store_true", help="Include timestamps in transcription"
+        "--batch",
+        metavar="DIR_OR_GLOB",
+        help="Transcribe every supported media file in a directory (recursively) or glob",
     )
     parser.add_argument(
-        "-k", "--keep-audio", action="store_true", help="Keep intermediate WAV file"
+        "-j",
+        "--jobs",
+        type=int,
+        default=2,
+        help="With --batch, files decoded concurrently while Whisper transcribes (default: 2)",
+    )
+    parser.add_argument(
+        "--manifest",
+        help=f"With --batch, manifest of outputs and failures (default: <output>/{MANIFEST_NAME})",
     )
     parser.add_argument(
         "-d", "--download", action="store_true", help="Download video from URL first"
     )
-    parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed output")
-    parser.add_argument("--logfile", help="Append logs to this file (default: none)", default=None)
     parser.add_argument(
-        "--format",
-        action="append",
-        choices=["txt", "srt", "vtt"],
-        default=None,
-        help="Output format(s): txt, srt, vtt. Can be specified multiple times. (default: txt)",
+        "--stream",
+        action="store_true",
+        help="With --download, pipe yt-dlp straight into ffmpeg instead of saving the media file",
     )
+    _add_transcription_options(parser)
 
     args = parser.parse_args()
+    if bool(args.input) == bool(args.batch):
+        parser.error("give either an input or --batch DIR_OR_GLOB")
+    if args.batch and args.download:
+        parser.error("--download cannot be combined with --batch")
+    if args.stream and not args.download:
+        parser.error("--stream requires --download")
 
-    log_level = logging.INFO if args.verbose else logging.WARNING
-    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
-    if args.logfile:
-        handlers.append(logging.FileHandler(args.logfile, mode="a", encoding="utf-8"))
-    logging.basicConfig(
-        level=log_level, format="%(asctime)s [%(levelname)s] %(message)s", handlers=handlers
-    )
+    _configure_logging(args)
 
     try:
         timestamp = int(time.time())
-        if args.output:
+        if args.batch:
+            # Each file gets its own output base in run_batch.
+            output_base = None
+        elif args.output:
             output_base = Path(args.output).with_suffix("")
         elif args.download:
             # Downloaded filename isn't known until after yt-dlp runs; use cwd + timestamp.
@@ -96,17 +217,27 @@ Available Whisper models:
             video_path = Path(args.input)
             output_base = video_path.parent / f"{video_path.stem}-transcript-{timestamp}"
 
-        request = TranscriptionRequest(
-            source=args.input,
-            download=args.download,
-            model=args.model,
-            language=args.language,
-            formats=tuple(set(args.format or ["txt"])),
-            include_timestamps=args.timestamps,
-            keep_audio=args.keep_audio,
-            output_base=output_base,
-        )
-        run_transcription(request)
+        request = _request_from_args(args, args.input or "", output_base)
+        if args.batch:
+            summary = run_batch(
+                args.batch,
+                request,
+                jobs=args.jobs,
+                output_dir=Path(args.output) if args.output else None,
+                manifest_path=Path(args.manifest) if args.manifest else None,
+            )
+            print(
+                f"Batch finished: {summary.done} done, {summary.failed} failed, "
+                f"{summary.skipped} skipped (manifest: {summary.manifest})"
+            )
+            if summary.failed:
+                sys.exit(1)
+            return
+        result = run_transcription(request)
+        if "vad" in result.metadata:
+            logging.info(f"VAD skipped {result.metadata['vad']['skipped_ratio']:.0%} of the audio")
+        if result.spans:
+            logging.info(f"Timings: {format_spans(result.spans)}")
         logging.info("✅ Process complete! Output(s) ready for LLM analysis.")
 
     except KeyboardInterrupt:
@@ -117,5 +248,63 @@ Available Whisper models:
         sys.exit(1)
 
 
+def watch_main(argv: list[str]) -> None:
+    """`whisper_video_to_text watch DIR`: transcribe files as they are dropped into DIR."""
+    parser = argparse.ArgumentParser(
+        prog="whisper_video_to_text watch",
+        description="Watch a directory and transcribe media files as they arrive",
+    )
+    parser.add_argument("directory", help="Directory to watch (not recursive)")
+    parser.add_argument(
+        "-o", "--output-dir", help="Write transcripts here (default: next to each source file)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=2,
+        help="Files decoded concurrently while Whisper transcribes (default: 2)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        help="Seconds a file must stay unchanged before it is picked up "
+        f"(default: {DEFAULT_SETTLE_SECONDS:.0f})",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Scan the directory periodically instead of using inotify",
+    )
+    parser.add_argument(
+        "--manifest",
+        help=f"Manifest of finished files (default: <output>/{MANIFEST_NAME})",
+    )
+    _add_transcription_options(parser)
+    args = parser.parse_args(argv)
+    _configure_logging(args)
+
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        parser.error(f"{directory} is not a directory")
+    stop = threading.Event()
+    # SIGTERM (docker stop, systemd) finishes the jobs in flight, like Ctrl-C.
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        watch_directory(
+            directory,
+            _request_from_args(args, "", None),
+            output_dir=Path(args.output_dir) if args.output_dir else None,
+            jobs=args.jobs,
+            settle_seconds=args.settle,
+            manifest_path=Path(args.manifest) if args.manifest else None,
+            stop=stop,
+            watcher=PollingWatcher(directory.resolve()) if args.poll else None,
+        )
+    except KeyboardInterrupt:
+        logging.info("Stopped watching")
+
+
 if __name__ == "__main__":
     main()
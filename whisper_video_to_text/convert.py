@@ -1,24 +1,22 @@
 import logging
+import os
+import shutil
+import struct
 import subprocess
+import threading
 import time
-from collections.abc import Callable
+import wave
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional, Union
 
+import numpy as np
 from tqdm import tqdm
 
 from whisper_video_to_text.errors import TranscriptionCancelled
-
-# Optional dependency: ffmpeg-python for progress bar support
-try:
-    import ffmpeg
-
-    HAS_FFMPEG_PYTHON = True
-except ImportError:
-    ffmpeg = None
-    HAS_FFMPEG_PYTHON = False
-    logging.debug("ffmpeg-python not installed; video duration detection disabled")
-
+from whisper_video_to_text.probe import probe_media
 
 SUPPORTED_AUDIO_EXTENSIONS: tuple[str, ...] = (
     ".mp3",
@@ -80,6 +78,29 @@ SUPPORTED_MEDIA_MIME_TYPES: tuple[str, ...] = (
     "video/x-msvideo",
 )
 WHISPER_AUDIO_SUFFIX = ".wav"
+WHISPER_SAMPLE_RATE = 16000
+# Bytes of s16le PCM read from ffmpeg per iteration (~32 s of 16 kHz mono audio).
+PCM_READ_CHUNK_BYTES = 1 << 20
+# Seconds between should_cancel checks while ffmpeg runs.
+CANCEL_CHECK_INTERVAL = 0.25
+# Minimum seconds between progress updates passed to a progress handler.
+PROGRESS_INTERVAL = 0.5
+# Parallel decoding (`decode_workers`) never cuts slices shorter than this.
+PARALLEL_DECODE_MIN_SLICE_SECONDS = 300.0
+# Containers whose seek index lets `-ss` land on the exact sample. Everything
+# else (MPEG-TS, MP3, ADTS AAC, AVI, ...) is decoded in a single pass.
+SEEKABLE_FORMATS = frozenset(("mov", "mp4", "m4a", "matroska", "webm", "wav", "flac"))
+# Each slice after the first starts this many samples early. The lead-in absorbs
+# decoder pre-roll after a seek and is compared with the end of the previous slice.
+SLICE_OVERLAP_SAMPLES = WHISPER_SAMPLE_RATE // 5
+# Largest misalignment searched for when comparing a lead-in with the previous slice.
+SLICE_MAX_LAG_SAMPLES = 160
+# A bounded slice may come up this many samples short (a resampler tail) and be zero-padded.
+SLICE_TOLERANCE_SAMPLES = 32
+# Samples converted to float32 at a time from a memory-mapped WAV (one Whisper window).
+WAV_WINDOW_SAMPLES = 30 * WHISPER_SAMPLE_RATE
+# Canonical header size of the 16-bit mono WAVs written for Whisper.
+WAV_HEADER_BYTES = 44
 
 
 def supported_media_extensions_display(with_dots: bool = True) -> str:
@@ -98,20 +119,28 @@ def supported_media_accept_attribute() -> str:
 
 
 def _get_media_duration(input_path: Path) -> Optional[float]:
-    """Return media duration in seconds when ffmpeg-python is available."""
-    if not HAS_FFMPEG_PYTHON:
-        return None
-
-    try:
-        probe = ffmpeg.probe(str(input_path))
-        return float(probe["format"]["duration"])
-    except Exception:
+    """Return the media duration in seconds from the cached ffprobe result."""
+    info = probe_media(input_path)
+    if info is None or info.duration is None:
         logging.debug("Could not probe media duration; progress bar will be disabled")
         return None
+    return info.duration
+
+
+def probe_media_duration(input_file: str) -> Optional[float]:
+    """Return the media duration in seconds, or None if it cannot be probed."""
+    return _get_media_duration(Path(input_file))
+
+
+def _require_audio_stream(input_path: Path) -> None:
+    """Fail early, with a clear message, for media that ffprobe says has no audio."""
+    info = probe_media(input_path)
+    if info is not None and info.streams and info.audio is None:
+        raise ValueError(f"{input_path.name} has no audio track to transcribe")
 
 
 def _terminate_process(process: subprocess.Popen, output_path: Optional[Path]) -> None:
-    """Terminate an ffmpeg child, escalating to kill, and remove partial output."""
+    """Terminate a child process, escalating to kill, and remove partial output."""
     try:
         process.terminate()
         try:
@@ -120,7 +149,7 @@ def _terminate_process(process: subprocess.Popen, output_path: Optional[Path]) -
             process.kill()
             process.wait(timeout=2)
     except Exception:
-        logging.debug("Failed to terminate ffmpeg cleanly", exc_info=True)
+        logging.debug(f"Failed to terminate {process.args!r} cleanly", exc_info=True)
     if output_path is not None:
         try:
             output_path.unlink(missing_ok=True)
@@ -128,53 +157,166 @@ def _terminate_process(process: subprocess.Popen, output_path: Optional[Path]) -
             logging.debug("Failed to remove partial output", exc_info=True)
 
 
+def _terminate_all(
+    process: subprocess.Popen,
+    output_path: Optional[Path],
+    upstream: Sequence[subprocess.Popen] = (),
+) -> None:
+    """Terminate ffmpeg and any processes feeding its stdin."""
+    _terminate_process(process, output_path)
+    for feeder in upstream:
+        _terminate_process(feeder, None)
+
+
+@dataclass
+class FfmpegProgress:
+    """Conversion progress, from ffmpeg's `-progress` output or the samples decoded so far."""
+
+    out_seconds: float
+    speed: Optional[float] = None
+    total_bytes: Optional[int] = None
+    duration: Optional[float] = None
+
+    @property
+    def fraction(self) -> Optional[float]:
+        if not self.duration:
+            return None
+        return min(1.0, self.out_seconds / self.duration)
+
+
+ProgressHandler = Callable[[FfmpegProgress], None]
+
+
+class _ProgressReporter:
+    """Feeds a tqdm bar and forwards throttled updates to a progress handler."""
+
+    def __init__(self, duration: Optional[float], on_progress: Optional[ProgressHandler]) -> None:
+        self.duration = duration
+        self.on_progress = on_progress
+        self.pbar = (
+            tqdm(total=duration, unit="sec", desc="ffmpeg", leave=True) if duration else None
+        )
+        self._shown = 0.0
+        self._last_sent = 0.0
+
+    def update(self, progress: FfmpegProgress, final: bool = False) -> None:
+        progress.duration = self.duration
+        if self.pbar is not None:
+            shown = min(progress.out_seconds, self.duration or progress.out_seconds)
+            self.pbar.update(max(0.0, shown - self._shown))
+            self._shown = max(self._shown, shown)
+        now = time.monotonic()
+        if self.on_progress is not None and (final or now - self._last_sent >= PROGRESS_INTERVAL):
+            self._last_sent = now
+            try:
+                self.on_progress(progress)
+            except Exception:
+                logging.debug("Progress handler failed", exc_info=True)
+
+    def close(self) -> None:
+        if self.pbar is not None:
+            self.pbar.close()
+
+
+def _parse_progress_block(fields: dict[str, str]) -> FfmpegProgress:
+    """Turn one `-progress` key=value block into an FfmpegProgress."""
+    out_us = fields.get("out_time_us") or fields.get("out_time_ms")
+    try:
+        # Despite its name, out_time_ms is also in microseconds.
+        out_seconds = max(0.0, int(out_us) / 1_000_000) if out_us else 0.0
+    except ValueError:
+        out_seconds = 0.0
+    try:
+        speed: Optional[float] = float(fields.get("speed", "").rstrip("x"))
+    except ValueError:
+        speed = None
+    try:
+        total_bytes: Optional[int] = int(fields["total_size"])
+    except (KeyError, ValueError):
+        total_bytes = None
+    return FfmpegProgress(out_seconds, speed=speed, total_bytes=total_bytes)
+
+
+def _read_progress(stream: IO[bytes], reporter: _ProgressReporter) -> None:
+    """Read `-progress pipe:1` output to EOF; each block ends with a `progress=` line."""
+    fields: dict[str, str] = {}
+    for raw in stream:
+        line = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        fields[key] = value
+        if key == "progress":
+            reporter.update(_parse_progress_block(fields), final=value == "end")
+            fields = {}
+
+
+def _with_progress_output(cmd: list[str]) -> list[str]:
+    """Add the global `-progress pipe:1 -nostats` options ahead of the first input."""
+    at = cmd.index("-i") if "-i" in cmd else 1
+    return [*cmd[:at], "-progress", "pipe:1", "-nostats", *cmd[at:]]
+
+
 def _run_ffmpeg(
     cmd: list[str],
     duration: Optional[float],
     should_cancel: Optional[Callable[[], bool]] = None,
     output_path: Optional[Path] = None,
+    stdin: Optional[IO[bytes]] = None,
+    upstream: Sequence[subprocess.Popen] = (),
+    on_progress: Optional[ProgressHandler] = None,
 ) -> None:
-    """Run ffmpeg via Popen; poll for cancellation and terminate cleanly when requested."""
-    process = subprocess.Popen(cmd, stderr=subprocess.PIPE, universal_newlines=True)
-    pbar = tqdm(total=duration, unit="sec", desc="ffmpeg", leave=True) if duration else None
-    last_time = 0.0
+    """Run an ffmpeg command that writes a file, reporting progress and honoring cancellation.
 
-    try:
-        if process.stderr is not None:
-            while True:
-                if should_cancel and should_cancel():
-                    _terminate_process(process, output_path)
-                    raise TranscriptionCancelled()
+    ffmpeg reports machine-readable progress on stdout (`-progress pipe:1`),
+    which a reader thread parses while another drains stderr. This thread
+    sleeps on an event set when ffmpeg exits, waking every CANCEL_CHECK_INTERVAL
+    seconds only if there is a `should_cancel` to check.
+
+    `stdin` feeds ffmpeg from a pipe (e.g. a downloader's stdout); the `upstream`
+    processes writing to it are terminated together with ffmpeg on cancellation.
+    """
+    process = subprocess.Popen(
+        _with_progress_output(cmd), stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    reporter = _ProgressReporter(duration, on_progress)
+    stderr_lines: list[bytes] = []
+    finished = threading.Event()
+    # Test doubles may provide only some of the pipes.
+    stdout = getattr(process, "stdout", None)
+    stderr = getattr(process, "stderr", None)
+    readers = [_drain_stream(stderr, stderr_lines)] if stderr is not None else []
+
+    def follow() -> None:
+        try:
+            if stdout is not None:
+                _read_progress(stdout, reporter)
+        finally:
+            finished.set()
+
+    threading.Thread(target=follow, name="ffmpeg-progress", daemon=True).start()
 
-                line = process.stderr.readline()
-                if not line:
-                    if process.poll() is not None:
-                        break
-                    time.sleep(0.05)
-                    continue
-
-                if pbar is not None and "time=" in line:
-                    try:
-                        time_str = line.split("time=")[-1].split(" ")[0]
-                        h, m, s = [float(x) for x in time_str.split(":")]
-                        seconds = h * 3600 + m * 60 + s
-                        pbar.update(max(0, seconds - last_time))
-                        last_time = seconds
-                    except Exception:
-                        pass
+    try:
+        interval = CANCEL_CHECK_INTERVAL if should_cancel else None
+        while not finished.wait(interval):
+            if should_cancel and should_cancel():
+                _terminate_all(process, output_path, upstream)
+                raise TranscriptionCancelled()
 
         # Final cancel check before declaring success
         if should_cancel and should_cancel():
-            _terminate_process(process, output_path)
+            _terminate_all(process, output_path, upstream)
             raise TranscriptionCancelled()
 
         process.wait()
+        for reader in readers:
+            reader.join(timeout=2)
         if process.returncode != 0:
-            logging.error(f"✗ Error converting file: ffmpeg exited {process.returncode}")
-            raise subprocess.CalledProcessError(process.returncode, cmd)
+            message = _decode_lines(stderr_lines)
+            logging.error(f"✗ Error converting file: ffmpeg exited {process.returncode}: {message}")
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=message)
     finally:
-        if pbar is not None:
-            pbar.close()
+        reporter.close()
 
 
 def _default_whisper_audio_path(input_path: Path) -> Path:
@@ -184,64 +326,765 @@ def _default_whisper_audio_path(input_path: Path) -> Path:
     return output_path
 
 
+def _validate_media_input(input_file: str) -> Path:
+    """Return the input path, raising if it is missing or not a supported media type."""
+    input_path = Path(input_file)
+
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_file}")
+
+    if input_path.suffix.lower() not in SUPPORTED_MEDIA_EXTENSIONS:
+        raise ValueError(
+            "Unsupported media format "
+            f"'{input_path.suffix}'. Supported formats: {supported_media_extensions_display()}"
+        )
+    return input_path
+
+
+def _whisper_audio_args() -> list[str]:
+    """ffmpeg output options that produce Whisper's 16 kHz mono signed 16-bit PCM.
+
+    Only the first audio stream is mapped, so video, subtitle and data streams
+    are neither decoded nor demuxed beyond what the container requires.
+    """
+    return [
+        "-map",
+        "0:a:0",
+        "-vn",
+        "-sn",
+        "-dn",
+        "-ac",
+        "1",
+        "-ar",
+        str(WHISPER_SAMPLE_RATE),
+        "-c:a",
+        "pcm_s16le",
+    ]
+
+
+def is_whisper_ready_wav(path: Path) -> bool:
+    """True for an uncompressed 16 kHz mono 16-bit WAV, which Whisper can use as is."""
+    if path.suffix.lower() != WHISPER_AUDIO_SUFFIX:
+        return False
+    try:
+        with wave.open(str(path), "rb") as wav:
+            return (
+                wav.getcomptype() == "NONE"
+                and wav.getnchannels() == 1
+                and wav.getsampwidth() == 2
+                and wav.getframerate() == WHISPER_SAMPLE_RATE
+            )
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def _wav_data_chunk(path: Path) -> tuple[int, int]:
+    """Return the (offset, length) in bytes of a Whisper-ready WAV's data chunk.
+
+    Walks the RIFF chunks instead of assuming a 44-byte header, and raises
+    ValueError unless the format is 16 kHz mono 16-bit PCM.
+    """
+    with open(path, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"{path} is not a WAV file")
+        fmt = b""
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"data":
+                offset = f.tell()
+                break
+            if chunk_id == b"fmt ":
+                fmt = f.read(size)
+                f.seek(size % 2, os.SEEK_CUR)
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+    if len(fmt) < 16:
+        raise ValueError(f"{path} has no format chunk before its data")
+    tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+    # 0xFFFE is WAVE_FORMAT_EXTENSIBLE, which ffmpeg uses for some layouts.
+    if tag not in (1, 0xFFFE) or channels != 1 or bits != 16 or rate != WHISPER_SAMPLE_RATE:
+        raise ValueError(
+            f"{path} is not 16 kHz mono 16-bit PCM; convert it with "
+            "convert_media_to_whisper_audio first"
+        )
+    # A writer that never finalized the header leaves 0 or 0xFFFFFFFF; trust the file size.
+    available = path.stat().st_size - offset
+    if 0 < size < 0xFFFFFFFF:
+        available = min(size, available)
+    return offset, max(0, available - available % 2)
+
+
+class WhisperWav:
+    """A Whisper-ready WAV, memory-mapped and converted to float32 one window at a time.
+
+    Slicing (`wav[start:end]`) returns float32 samples for just that range, so
+    the VAD, chunk planner and chunk workers never hold the whole recording as
+    float32. `len(wav)` is the number of samples.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        offset, length = _wav_data_chunk(self.path)
+        # np.memmap cannot map zero bytes.
+        self.pcm: np.ndarray = (
+            np.memmap(self.path, dtype="<i2", mode="r", offset=offset, shape=(length // 2,))
+            if length
+            else np.zeros(0, dtype="<i2")
+        )
+
+    def __len__(self) -> int:
+        return len(self.pcm)
+
+    def __getitem__(self, index: slice) -> np.ndarray:
+        if not isinstance(index, slice):
+            raise TypeError("WhisperWav only supports slicing")
+        window = self.pcm[index].astype(np.float32)
+        window *= 1.0 / 32768.0
+        return window
+
+    def windows(self, samples: int = WAV_WINDOW_SAMPLES) -> Iterator[np.ndarray]:
+        """Yield consecutive float32 windows of `samples` (the last may be shorter)."""
+        for start in range(0, len(self), samples):
+            yield self[start : start + samples]
+
+    def to_array(self) -> np.ndarray:
+        """All samples as one float32 array, filled window by window."""
+        audio = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(audio), WAV_WINDOW_SAMPLES):
+            end = start + WAV_WINDOW_SAMPLES
+            audio[start:end] = self.pcm[start:end]
+            audio[start:end] *= 1.0 / 32768.0
+        return audio
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """Hard-link `source` to `destination`, copying when linking is not possible."""
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def _whisper_ffmpeg_command(input_arg: str, output_args: list[str], verbose: bool) -> list[str]:
+    cmd = ["ffmpeg"]
+    if not verbose:
+        cmd.extend(["-loglevel", "error"])
+    cmd.extend(["-i", input_arg, *_whisper_audio_args(), *output_args])
+    return cmd
+
+
+def _drain_stream(stream: IO[bytes], sink: list[bytes]) -> threading.Thread:
+    """Read a child pipe to EOF on a daemon thread so the child never blocks on it."""
+
+    def drain() -> None:
+        for line in stream:
+            sink.append(line)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    return thread
+
+
+def _decode_lines(lines: Sequence[Union[bytes, str]]) -> str:
+    return "".join(
+        line.decode("utf-8", errors="replace") if isinstance(line, bytes) else line
+        for line in lines
+    )
+
+
+def _read_pcm_into_buffer(
+    process: subprocess.Popen,
+    duration: Optional[float],
+    should_cancel: Optional[Callable[[], bool]] = None,
+    upstream: Sequence[subprocess.Popen] = (),
+    reporter: Optional[_ProgressReporter] = None,
+) -> np.ndarray:
+    """Read s16le samples from process stdout into a preallocated float32 buffer."""
+    # Size the buffer from the probed duration (plus a second of slack) so the
+    # common case never reallocates; grow geometrically when the probe is missing.
+    capacity = int((duration + 1) * WHISPER_SAMPLE_RATE) if duration else 60 * WHISPER_SAMPLE_RATE
+    audio = np.empty(capacity, dtype=np.float32)
+    filled = 0
+    carry = b""
+    started = time.monotonic()
+
+    if process.stdout is None:
+        raise ValueError("ffmpeg process was started without a stdout pipe")
+    while True:
+        if should_cancel and should_cancel():
+            _terminate_all(process, None, upstream)
+            raise TranscriptionCancelled()
+
+        chunk = process.stdout.read(PCM_READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        if carry:
+            chunk, carry = carry + chunk, b""
+        if len(chunk) % 2:
+            chunk, carry = chunk[:-1], chunk[-1:]
+
+        samples = np.frombuffer(chunk, dtype="<i2")
+        end = filled + len(samples)
+        if end > len(audio):
+            grown = np.empty(max(end, len(audio) * 2), dtype=np.float32)
+            grown[:filled] = audio[:filled]
+            audio = grown
+        audio[filled:end] = samples
+        audio[filled:end] *= 1.0 / 32768.0
+        filled = end
+        if reporter is not None:
+            decoded = filled / WHISPER_SAMPLE_RATE
+            elapsed = time.monotonic() - started
+            speed = decoded / elapsed if elapsed > 0 else None
+            reporter.update(FfmpegProgress(decoded, speed=speed, total_bytes=filled * 2))
+
+    # Don't pin a mostly-empty buffer for the lifetime of the transcription.
+    if filled < len(audio) * 0.9:
+        return audio[:filled].copy()
+    return audio[:filled]
+
+
+def decode_media_to_whisper_array(
+    input_file: str,
+    verbose: bool = False,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    duration: Optional[float] = None,
+    on_progress: Optional[ProgressHandler] = None,
+    decode_workers: int = 1,
+) -> np.ndarray:
+    """
+    Decode supported media straight into a 16 kHz mono float32 array for Whisper.
+
+    ffmpeg writes raw s16le PCM to a pipe instead of a WAV file, so the media
+    is decoded once and never round-trips through disk. A WAV that is already
+    16 kHz mono PCM is read directly, without ffmpeg.
+
+    Args:
+        input_file: Path to a supported media file.
+        verbose: If True, show ffmpeg output.
+        should_cancel: Optional callable polled between reads; raises
+            TranscriptionCancelled when it returns True.
+        duration: Media duration from an earlier probe; probed here if omitted.
+        on_progress: Optional callable receiving FfmpegProgress updates.
+        decode_workers: Run up to this many ffmpeg processes on separate time
+            slices of long media in a container that seeks sample-accurately.
+            Falls back to one pass if a slice boundary does not check out.
+
+    Returns:
+        Float32 samples in [-1, 1), as accepted by `model.transcribe`.
+    """
+    input_path = _validate_media_input(input_file)
+    if is_whisper_ready_wav(input_path):
+        logging.info(f"{input_path.name} is already 16 kHz mono PCM; reading it directly")
+        return WhisperWav(input_path).to_array()
+    _require_audio_stream(input_path)
+    if duration is None:
+        duration = _get_media_duration(input_path)
+
+    plan = _plan_decode_slices(input_path, decode_workers)
+    if plan is not None:
+        sink = _ArraySink(_slice_capacity(plan))
+        filled = _parallel_decode(
+            input_path, plan, sink, verbose, should_cancel, duration, on_progress
+        )
+        if filled is not None:
+            logging.info(f"✓ Decoded {filled / WHISPER_SAMPLE_RATE:.1f}s of audio")
+            return sink.audio[:filled]
+
+    cmd = _whisper_ffmpeg_command(str(input_path), ["-f", "s16le", "pipe:1"], verbose)
+    logging.info(f"Decoding {input_path.name} to in-memory Whisper audio...")
+    return _decode_pcm(cmd, duration, should_cancel=should_cancel, on_progress=on_progress)
+
+
+def decode_stream_to_whisper_array(
+    stream: IO[bytes],
+    upstream: Sequence[subprocess.Popen] = (),
+    verbose: bool = False,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> np.ndarray:
+    """
+    Decode media arriving on a pipe into 16 kHz mono float32 samples.
+
+    Args:
+        stream: Readable pipe carrying the media container (e.g. yt-dlp stdout).
+        upstream: Processes writing to the pipe; terminated on cancellation.
+        verbose: If True, show ffmpeg output.
+        should_cancel: Optional callable polled between reads.
+
+    Returns:
+        Float32 samples in [-1, 1).
+    """
+    cmd = _whisper_ffmpeg_command("pipe:0", ["-f", "s16le", "pipe:1"], verbose)
+    logging.info("Decoding streamed media to in-memory Whisper audio...")
+    return _decode_pcm(cmd, None, should_cancel=should_cancel, stdin=stream, upstream=upstream)
+
+
+def _decode_pcm(
+    cmd: list[str],
+    duration: Optional[float],
+    should_cancel: Optional[Callable[[], bool]] = None,
+    stdin: Optional[IO[bytes]] = None,
+    upstream: Sequence[subprocess.Popen] = (),
+    on_progress: Optional[ProgressHandler] = None,
+) -> np.ndarray:
+    """Run an ffmpeg command that writes s16le to stdout and collect the samples.
+
+    Progress is measured from the samples received, so no `-progress` output is needed.
+    """
+    process = subprocess.Popen(cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr_lines: list[bytes] = []
+    drain = _drain_stream(process.stderr, stderr_lines) if process.stderr is not None else None
+    reporter = _ProgressReporter(duration, on_progress)
+    try:
+        audio = _read_pcm_into_buffer(process, duration, should_cancel, upstream, reporter)
+        process.wait()
+    finally:
+        reporter.close()
+        if process.stdout is not None:
+            process.stdout.close()
+    if drain is not None:
+        drain.join(timeout=2)
+
+    if process.returncode != 0:
+        stderr = _decode_lines(stderr_lines)
+        logging.error(f"✗ Error decoding file: ffmpeg exited {process.returncode}: {stderr}")
+        raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+
+    logging.info(f"✓ Decoded {len(audio) / WHISPER_SAMPLE_RATE:.1f}s of audio")
+    return audio
+
+
+class _UnreliableSeek(Exception):
+    """A time slice did not decode to exactly the samples it was cut from."""
+
+
+def _samples_to_seconds(samples: int) -> str:
+    # 1/16000 s has seven decimal places, so this is exact.
+    return f"{samples / WHISPER_SAMPLE_RATE:.7f}"
+
+
+def _plan_decode_slices(
+    input_path: Path, workers: int
+) -> Optional[list[tuple[int, Optional[int]]]]:
+    """Split the media into (start, end) sample ranges, or return None to decode in one pass.
+
+    The last range is open-ended, so a probed duration that is slightly short loses nothing.
+    """
+    if workers < 2:
+        return None
+    info = probe_media(input_path)
+    if info is None or not info.duration or info.audio is None:
+        return None
+    if not set((info.format_name or "").split(",")) & SEEKABLE_FORMATS:
+        logging.info(
+            f"Seeking in {info.format_name} is not sample-accurate; decoding {input_path.name} "
+            "in one pass"
+        )
+        return None
+    slices = min(workers, int(info.duration // PARALLEL_DECODE_MIN_SLICE_SECONDS))
+    if slices < 2:
+        return None
+    total = round(info.duration * WHISPER_SAMPLE_RATE)
+    bounds = [total * i // slices for i in range(slices)]
+    return [*zip(bounds, bounds[1:]), (bounds[-1], None)]
+
+
+class _ArraySink:
+    """Preallocated float32 buffer that decoded slices are written into."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.audio = np.zeros(capacity, dtype=np.float32)
+
+    def write(self, offset: int, samples: np.ndarray) -> None:
+        end = offset + len(samples)
+        self.audio[offset:end] = samples
+        self.audio[offset:end] *= 1.0 / 32768.0
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        return self.audio[start:end]
+
+
+class _WavFileSink:
+    """WAV file whose data chunk is written in place, section by section.
+
+    Writes from the slice threads are serialized by a lock; each one is a
+    single ~1 MiB seek and write, so the decoders rarely wait on it.
+    """
+
+    def __init__(self, path: Path, capacity: int) -> None:
+        self.capacity = capacity
+        self._file = open(path, "w+b")
+        self._lock = threading.Lock()
+        self._file.write(_wav_header(0))
+
+    def write(self, offset: int, samples: np.ndarray) -> None:
+        data = samples.astype("<i2", copy=False).tobytes()
+        with self._lock:
+            self._file.seek(WAV_HEADER_BYTES + offset * 2)
+            self._file.write(data)
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        with self._lock:
+            self._file.seek(WAV_HEADER_BYTES + start * 2)
+            data = self._file.read((end - start) * 2)
+        return np.frombuffer(data, dtype="<i2")
+
+    def finish(self, samples: int) -> None:
+        with self._lock:
+            self._file.truncate(WAV_HEADER_BYTES + samples * 2)
+            self._file.seek(0)
+            self._file.write(_wav_header(samples))
+            self._file.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _wav_header(samples: int) -> bytes:
+    """Canonical 44-byte header of a 16 kHz mono 16-bit PCM WAV."""
+    data_bytes = samples * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        1,
+        WHISPER_SAMPLE_RATE,
+        WHISPER_SAMPLE_RATE * 2,
+        2,
+        16,
+        b"data",
+        data_bytes,
+    )
+
+
+def _boundary_lag(previous: np.ndarray, lead_in: np.ndarray, max_lag: int) -> Optional[int]:
+    """Offset, in samples, at which int16 `lead_in` best matches `previous`; None for silence.
+
+    Normalized cross-correlation, so `previous` may be on either sample scale.
+    """
+    reference = previous.astype(np.float64)
+    core = lead_in[max_lag : len(lead_in) - max_lag].astype(np.float64)
+    core_norm = float(np.linalg.norm(core))
+    # Below about -66 dBFS there is nothing to line up.
+    if core_norm < 16.0 * np.sqrt(len(core)):
+        return None
+    scores = []
+    for lag in range(-max_lag, max_lag + 1):
+        window = reference[max_lag + lag : max_lag + lag + len(core)]
+        norm = np.linalg.norm(window)
+        scores.append(float(np.dot(window, core) / (norm * core_norm)) if norm else -1.0)
+    return int(np.argmax(scores)) - max_lag
+
+
+def _decode_slice(
+    input_path: Path,
+    start: int,
+    end: Optional[int],
+    sink: Union[_ArraySink, _WavFileSink],
+    verbose: bool,
+    abort: threading.Event,
+    started: Callable[[subprocess.Popen], None],
+    on_samples: Callable[[int], None],
+) -> tuple[int, np.ndarray]:
+    """Decode samples [start, end) into `sink`; return (samples decoded, lead-in).
+
+    Slices after the first begin SLICE_OVERLAP_SAMPLES early. Those samples are
+    returned as the lead-in rather than written. The sample count excludes them.
+    """
+    lead = SLICE_OVERLAP_SAMPLES if start else 0
+    output_args = ["-f", "s16le", "pipe:1"]
+    if end is not None:
+        output_args = ["-t", _samples_to_seconds(end - start + lead), *output_args]
+    cmd = _whisper_ffmpeg_command(str(input_path), output_args, verbose)
+    at = cmd.index("-i")
+    # Input seeking; ffmpeg decodes from the preceding keyframe and discards up to `-ss`.
+    cmd[at:at] = ["-ss", _samples_to_seconds(start - lead)]
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    started(process)
+    stderr_lines: list[bytes] = []
+    drain = _drain_stream(process.stderr, stderr_lines) if process.stderr is not None else None
+    lead_in = np.zeros(lead, dtype=np.int16)
+    limit = (end if end is not None else sink.capacity) - start
+    received = 0
+    carry = b""
+    try:
+        if process.stdout is None:
+            raise ValueError("ffmpeg process was started without a stdout pipe")
+        while not abort.is_set():
+            chunk = process.stdout.read(PCM_READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if carry:
+                chunk, carry = carry + chunk, b""
+            if len(chunk) % 2:
+                chunk, carry = chunk[:-1], chunk[-1:]
+            samples = np.frombuffer(chunk, dtype="<i2")
+            if received < lead:
+                taken = samples[: lead - received]
+                lead_in[received : received + len(taken)] = taken
+            # Position of this chunk within [start, end), after the lead-in.
+            offset = max(0, received - lead)
+            body = samples[max(0, lead - received) :][: max(0, limit - offset)]
+            if len(body):
+                sink.write(start + offset, body)
+                on_samples(len(body))
+            received += len(samples)
+        process.wait()
+    finally:
+        if process.stdout is not None:
+            process.stdout.close()
+    if drain is not None:
+        drain.join(timeout=2)
+    if process.returncode != 0 and not abort.is_set():
+        stderr = _decode_lines(stderr_lines)
+        raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+    return max(0, received - lead), lead_in
+
+
+def _decode_slices_parallel(
+    input_path: Path,
+    plan: Sequence[tuple[int, Optional[int]]],
+    sink: Union[_ArraySink, _WavFileSink],
+    verbose: bool,
+    should_cancel: Optional[Callable[[], bool]],
+    reporter: _ProgressReporter,
+) -> int:
+    """Decode the slices of `plan` concurrently into `sink` and check their boundaries.
+
+    Every bounded slice must decode to exactly its length (or fall short by at
+    most SLICE_TOLERANCE_SAMPLES, which is zero-padded), and every lead-in must
+    line up with the end of the previous slice at lag 0. Otherwise
+    _UnreliableSeek is raised and the caller decodes in one pass.
+
+    Returns:
+        Total number of samples written.
+    """
+    abort = threading.Event()
+    lock = threading.Lock()
+    processes: list[subprocess.Popen] = []
+    decoded = 0
+    clock = time.monotonic()
+
+    def started(process: subprocess.Popen) -> None:
+        with lock:
+            processes.append(process)
+        # A slice that starts after cancellation must not outlive it.
+        if abort.is_set():
+            _terminate_process(process, None)
+
+    def on_samples(count: int) -> None:
+        nonlocal decoded
+        with lock:
+            decoded += count
+            elapsed = time.monotonic() - clock
+            seconds = decoded / WHISPER_SAMPLE_RATE
+            speed = seconds / elapsed if elapsed > 0 else None
+            reporter.update(FfmpegProgress(seconds, speed=speed, total_bytes=decoded * 2))
+
+    with ThreadPoolExecutor(max_workers=len(plan), thread_name_prefix="ffmpeg-slice") as pool:
+        futures = [
+            pool.submit(
+                _decode_slice, input_path, start, end, sink, verbose, abort, started, on_samples
+            )
+            for start, end in plan
+        ]
+        try:
+            pending = set(futures)
+            interval = CANCEL_CHECK_INTERVAL if should_cancel else None
+            while pending:
+                done, pending = wait(pending, timeout=interval, return_when=FIRST_EXCEPTION)
+                if should_cancel and should_cancel():
+                    raise TranscriptionCancelled()
+                for future in done:
+                    future.result()
+        except BaseException:
+            abort.set()
+            with lock:
+                running = list(processes)
+            for process in running:
+                _terminate_process(process, None)
+            raise
+        results = [future.result() for future in futures]
+
+    filled = 0
+    for (start, end), (count, lead_in) in zip(plan, results):
+        if end is None:
+            if start + count > sink.capacity:
+                raise _UnreliableSeek(f"the last slice ran past the probed duration ({count})")
+            filled = start + count
+        elif count > end - start or end - start - count > SLICE_TOLERANCE_SAMPLES:
+            raise _UnreliableSeek(
+                f"slice at {_samples_to_seconds(start)}s decoded {count} samples, "
+                f"expected {end - start}"
+            )
+        elif count < end - start:
+            sink.write(start + count, np.zeros(end - start - count, dtype=np.int16))
+        if start:
+            # Compare the second half of the lead-in, clear of any decoder pre-roll.
+            half = SLICE_OVERLAP_SAMPLES // 2
+            lag = _boundary_lag(
+                sink.read(start - half, start), lead_in[half:], SLICE_MAX_LAG_SAMPLES
+            )
+            if lag:
+                raise _UnreliableSeek(
+                    f"slice at {_samples_to_seconds(start)}s is misaligned by {lag} samples"
+                )
+    return filled
+
+
+def _parallel_decode(
+    input_path: Path,
+    plan: Sequence[tuple[int, Optional[int]]],
+    sink: Union[_ArraySink, _WavFileSink],
+    verbose: bool,
+    should_cancel: Optional[Callable[[], bool]],
+    duration: Optional[float],
+    on_progress: Optional[ProgressHandler],
+) -> Optional[int]:
+    """Run `_decode_slices_parallel`; return None when its boundaries could not be trusted."""
+    logging.info(f"Decoding {input_path.name} as {len(plan)} parallel time slices...")
+    reporter = _ProgressReporter(duration, on_progress)
+    try:
+        return _decode_slices_parallel(input_path, plan, sink, verbose, should_cancel, reporter)
+    except _UnreliableSeek as e:
+        logging.warning(f"Parallel decoding of {input_path.name} rejected ({e}); using one pass")
+        return None
+    finally:
+        reporter.close()
+
+
+def _slice_capacity(plan: Sequence[tuple[int, Optional[int]]]) -> int:
+    """Samples to allocate: the open-ended last slice as long as the others, plus a second."""
+    last_start = plan[-1][0]
+    return last_start + (last_start - plan[-2][0]) + WHISPER_SAMPLE_RATE
+
+
 def convert_media_to_whisper_audio(
     input_file: str,
     output_file: Optional[str] = None,
     verbose: bool = False,
     should_cancel: Optional[Callable[[], bool]] = None,
+    duration: Optional[float] = None,
+    on_progress: Optional[ProgressHandler] = None,
+    decode_workers: int = 1,
 ) -> Path:
     """
     Normalize supported media to 16 kHz mono PCM WAV for Whisper.
 
+    An input that is already such a WAV is not re-encoded: it is returned as
+    is when no output file is given, and hard-linked (or copied) otherwise.
+
     Args:
         input_file: Path to a supported media file.
         output_file: Path to the output WAV file (optional).
         verbose: If True, show ffmpeg output.
         should_cancel: Optional callable polled during ffmpeg; raises
             TranscriptionCancelled and removes the partial WAV when it returns True.
+        duration: Media duration from an earlier probe; probed here if omitted.
+        on_progress: Optional callable receiving FfmpegProgress updates.
+        decode_workers: Run up to this many ffmpeg processes on separate time
+            slices of long media in a container that seeks sample-accurately.
+            Falls back to one pass if a slice boundary does not check out.
 
     Returns:
         Path to the output WAV file.
     """
-    input_path = Path(input_file)
-
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file not found: {input_file}")
+    input_path = _validate_media_input(input_file)
 
-    if input_path.suffix.lower() not in SUPPORTED_MEDIA_EXTENSIONS:
-        raise ValueError(
-            "Unsupported media format "
-            f"'{input_path.suffix}'. Supported formats: {supported_media_extensions_display()}"
-        )
+    if is_whisper_ready_wav(input_path):
+        # Already what Whisper needs: use it in place, or link it where asked.
+        if output_file is None:
+            logging.info(f"✓ {input_path.name} is already 16 kHz mono PCM; no conversion needed")
+            return input_path
+        output_path = Path(output_file)
+        if output_path.resolve() != input_path.resolve():
+            _link_or_copy(input_path, output_path)
+        logging.info(f"✓ {input_path.name} is already 16 kHz mono PCM; linked to {output_path}")
+        return output_path
 
     if output_file is None:
         output_path = _default_whisper_audio_path(input_path)
     else:
         output_path = Path(output_file)
 
-    duration = _get_media_duration(input_path) if HAS_FFMPEG_PYTHON else None
+    _require_audio_stream(input_path)
+    if duration is None:
+        duration = _get_media_duration(input_path)
 
-    cmd = ["ffmpeg"]
-    if not verbose:
-        cmd.extend(["-loglevel", "error"])
-    cmd.extend(
-        [
-            "-i",
-            str(input_path),
-            "-vn",
-            "-ac",
-            "1",
-            "-ar",
-            "16000",
-            "-c:a",
-            "pcm_s16le",
-            "-y",
-            str(output_path),
-        ]
-    )
+    plan = _plan_decode_slices(input_path, decode_workers)
+    if plan is not None:
+        sink = _WavFileSink(output_path, _slice_capacity(plan))
+        try:
+            filled = _parallel_decode(
+                input_path, plan, sink, verbose, should_cancel, duration, on_progress
+            )
+        except BaseException:
+            sink.close()
+            output_path.unlink(missing_ok=True)
+            raise
+        if filled is not None:
+            sink.finish(filled)
+            logging.info(f"✓ Conversion complete: {output_path}")
+            return output_path
+        sink.close()
 
+    cmd = _whisper_ffmpeg_command(str(input_path), ["-y", str(output_path)], verbose)
     logging.info(f"Converting {input_path.name} to Whisper WAV...")
-    _run_ffmpeg(cmd, duration, should_cancel=should_cancel, output_path=output_path)
+    _run_ffmpeg(
+        cmd,
+        duration,
+        should_cancel=should_cancel,
+        output_path=output_path,
+        on_progress=on_progress,
+    )
+    logging.info(f"✓ Conversion complete: {output_path}")
+    return output_path
+
+
+def convert_stream_to_whisper_audio(
+    stream: IO[bytes],
+    output_file: str,
+    upstream: Sequence[subprocess.Popen] = (),
+    verbose: bool = False,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Path:
+    """
+    Normalize media arriving on a pipe to a 16 kHz mono PCM WAV for Whisper.
+
+    Args:
+        stream: Readable pipe carrying the media container (e.g. yt-dlp stdout).
+        output_file: Path to the output WAV file.
+        upstream: Processes writing to the pipe; terminated on cancellation.
+        verbose: If True, show ffmpeg output.
+        should_cancel: Optional callable polled during ffmpeg; removes the
+            partial WAV and raises TranscriptionCancelled when it returns True.
+
+    Returns:
+        Path to the output WAV file.
+    """
+    output_path = Path(output_file)
+    cmd = _whisper_ffmpeg_command("pipe:0", ["-y", str(output_path)], verbose)
+
+    logging.info("Converting streamed media to Whisper WAV...")
+    _run_ffmpeg(
+        cmd,
+        None,
+        should_cancel=should_cancel,
+        output_path=output_path,
+        stdin=stream,
+        upstream=upstream,
+    )
     logging.info(f"✓ Conversion complete: {output_path}")
     return output_path
 
@@ -271,7 +1114,7 @@ def convert_mp4_to_mp3(
         output_path = Path(output_file)
 
     # Get duration of input file (in seconds) for progress bar
-    duration = _get_media_duration(input_path) if HAS_FFMPEG_PYTHON else None
+    duration = _get_media_duration(input_path)
 
     cmd = [
         "ffmpeg",
@@ -1,10 +1,21 @@
 import logging
 import os
 import subprocess
+import tempfile
+from collections.abc import Callable
 from pathlib import Path
+from typing import IO, Optional, TypeVar
 
+import numpy as np
 from tqdm import tqdm
 
+from whisper_video_to_text.convert import (
+    SUPPORTED_MEDIA_EXTENSIONS,
+    _terminate_process,
+    convert_stream_to_whisper_audio,
+    decode_stream_to_whisper_array,
+)
+
 PROGRESSIVE_MP4_FORMAT = (
     "best[ext=mp4][vcodec!=none][acodec!=none]/" "best[vcodec!=none][acodec!=none]/best"
 )
@@ -13,20 +24,52 @@ FORMAT_ATTEMPTS = (
     ("progressive mp4", PROGRESSIVE_MP4_FORMAT),
     ("adaptive best", ADAPTIVE_FORMAT),
 )
+# Transcription only needs the audio track, so skip the video stream entirely and
+# fall back to the smallest file that still carries audio.
+AUDIO_ONLY_FORMAT = "bestaudio/bestaudio*"
+SMALLEST_WITH_AUDIO_FORMAT = "worst[acodec!=none]/best[acodec!=none]"
+AUDIO_FORMAT_ATTEMPTS = (
+    ("audio only", AUDIO_ONLY_FORMAT),
+    ("smallest with audio", SMALLEST_WITH_AUDIO_FORMAT),
+    ("progressive mp4", PROGRESSIVE_MP4_FORMAT),
+)
+# Streaming writes a single file to stdout, so merged formats are not an option.
+STREAM_FORMAT = f"{AUDIO_ONLY_FORMAT}/{SMALLEST_WITH_AUDIO_FORMAT}"
+
+T = TypeVar("T")
 
 
-def _build_yt_dlp_command(url: str, output_dir: str, format_selector: str) -> list[str]:
+def _build_yt_dlp_command(
+    url: str, output_dir: str, format_selector: str, merge_output_format: Optional[str] = "mp4"
+) -> list[str]:
+    cmd = ["yt-dlp", "-f", format_selector]
+    if merge_output_format:
+        cmd.extend(["--merge-output-format", merge_output_format])
+    cmd.extend(
+        [
+            "--remote-components",
+            "ejs:github",
+            "-o",
+            os.path.join(output_dir, "%(title)s.%(ext)s"),
+            "--no-playlist",
+            url,
+        ]
+    )
+    return cmd
+
+
+def _build_yt_dlp_stream_command(url: str, format_selector: str = STREAM_FORMAT) -> list[str]:
     return [
         "yt-dlp",
         "-f",
         format_selector,
-        "--merge-output-format",
-        "mp4",
         "--remote-components",
         "ejs:github",
-        "-o",
-        os.path.join(output_dir, "%(title)s.%(ext)s"),
+        "--quiet",
+        "--no-progress",
         "--no-playlist",
+        "-o",
+        "-",
         url,
     ]
 
@@ -56,30 +99,38 @@ def _filename_from_yt_dlp_output(stdout: str, output_dir: str) -> str:
             # file is mocked in tests or created after post-processing.
             return filename
 
-    # Fallback: look for the most recent .mp4 file
-    mp4_files = list(Path(output_dir).glob("*.mp4"))
-    if mp4_files:
-        return str(max(mp4_files, key=os.path.getctime))
+    # Fallback: look for the most recent media file
+    media_files = [
+        path
+        for path in Path(output_dir).iterdir()
+        if path.is_file() and path.suffix.lower() in SUPPORTED_MEDIA_EXTENSIONS
+    ]
+    if media_files:
+        return str(max(media_files, key=os.path.getctime))
 
     raise ValueError("Could not determine downloaded filename")
 
 
-def download_video(url: str, output_dir: str = ".") -> str:
+def download_video(url: str, output_dir: str = ".", audio_only: bool = False) -> str:
     """
     Download video from URL using yt-dlp, with a progress bar.
 
     Args:
         url: The video URL.
         output_dir: Directory to save the downloaded file.
+        audio_only: Download just the audio stream (in its native container,
+            e.g. .webm or .m4a) instead of video muxed to MP4.
 
     Returns:
-        The path to the downloaded MP4 file.
+        The path to the downloaded media file.
     """
-    logging.info(f"Downloading video from: {url}")
+    logging.info(f"Downloading {'audio' if audio_only else 'video'} from: {url}")
 
+    attempts = AUDIO_FORMAT_ATTEMPTS if audio_only else FORMAT_ATTEMPTS
+    merge_output_format = None if audio_only else "mp4"
     last_error = None
-    for attempt_name, format_selector in FORMAT_ATTEMPTS:
-        cmd = _build_yt_dlp_command(url, output_dir, format_selector)
+    for attempt_name, format_selector in attempts:
+        cmd = _build_yt_dlp_command(url, output_dir, format_selector, merge_output_format)
         try:
             # Use tqdm to show a spinner while downloading
             bar_format = "{l_bar}{bar} [time left: {remaining}]"
@@ -101,3 +152,110 @@ def download_video(url: str, output_dir: str = ".") -> str:
         raise last_error
 
     raise ValueError("No yt-dlp format attempts were configured")
+
+
+def _stream_from_yt_dlp(
+    url: str, decode: Callable[[IO[bytes], tuple[subprocess.Popen, ...]], T]
+) -> T:
+    """Pipe yt-dlp's stdout into `decode` (an ffmpeg stage) and check both exit codes."""
+    cmd = _build_yt_dlp_stream_command(url)
+    logging.info(f"Streaming audio from: {url}")
+    # stderr goes to a file rather than a pipe nobody reads, so yt-dlp can never
+    # block on a full stderr buffer while ffmpeg is consuming its stdout.
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        stdout = process.stdout
+        assert stdout is not None  # stdout=PIPE
+
+        def yt_dlp_error() -> Optional[subprocess.CalledProcessError]:
+            if process.poll() is None:
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    return None
+            if process.returncode == 0:
+                return None
+            stderr.seek(0)
+            message = stderr.read().decode("utf-8", errors="replace")
+            return subprocess.CalledProcessError(process.returncode, cmd, stderr=message)
+
+        try:
+            try:
+                output = decode(stdout, (process,))
+            finally:
+                # ffmpeg holds its own copy of the pipe. Dropping ours means an early
+                # ffmpeg exit shows up in yt-dlp as a broken pipe instead of a hang.
+                stdout.close()
+        except subprocess.CalledProcessError as ffmpeg_error:
+            error = yt_dlp_error()
+            # A download failure starves ffmpeg, so report it as the root cause;
+            # a broken pipe just means ffmpeg gave up first.
+            if error is not None and "Broken pipe" not in (error.stderr or ""):
+                logging.error(f"✗ Error streaming audio: {error.stderr}")
+                raise error from ffmpeg_error
+            raise
+        else:
+            # ffmpeg saw EOF, so yt-dlp is exiting; collect its status before cleanup.
+            error = yt_dlp_error()
+            if error is not None:
+                logging.error(f"✗ Error streaming audio: {error.stderr}")
+                raise error
+            return output
+        finally:
+            if process.poll() is None:
+                _terminate_process(process, None)
+
+
+def stream_url_to_whisper_audio(
+    url: str,
+    output_file: str,
+    verbose: bool = False,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> Path:
+    """
+    Download a URL's audio through a pipe straight into a 16 kHz mono WAV.
+
+    yt-dlp writes the media container to stdout and ffmpeg normalizes it as the
+    bytes arrive, so the downloaded container never touches disk.
+
+    Args:
+        url: The video URL.
+        output_file: Path to the output WAV file.
+        verbose: If True, show ffmpeg output.
+        should_cancel: Optional callable polled during decoding; stops both
+            yt-dlp and ffmpeg and raises TranscriptionCancelled when it returns True.
+
+    Returns:
+        Path to the output WAV file.
+    """
+    return _stream_from_yt_dlp(
+        url,
+        lambda stream, upstream: convert_stream_to_whisper_audio(
+            stream, output_file, upstream=upstream, verbose=verbose, should_cancel=should_cancel
+        ),
+    )
+
+
+def stream_url_to_whisper_array(
+    url: str,
+    verbose: bool = False,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> np.ndarray:
+    """
+    Download a URL's audio through a pipe straight into 16 kHz mono float32 samples.
+
+    Args:
+        url: The video URL.
+        verbose: If True, show ffmpeg output.
+        should_cancel: Optional callable polled during decoding; stops both
+            yt-dlp and ffmpeg and raises TranscriptionCancelled when it returns True.
+
+    Returns:
+        Float32 samples in [-1, 1).
+    """
+    return _stream_from_yt_dlp(
+        url,
+        lambda stream, upstream: decode_stream_to_whisper_array(
+            stream, upstream=upstream, verbose=verbose, should_cancel=should_cancel
+        ),
+    )
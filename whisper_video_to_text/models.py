@@ -0,0 +1,232 @@
+"""Process-wide cache of loaded Whisper models.
+
+Loading a Whisper model takes seconds and hundreds of MB, so the pipeline keeps
+models resident between jobs. Entries are keyed by (model name, device, dtype)
+and evicted least-recently-used first once the configured memory budget is
+exceeded.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import whisper
+
+DEFAULT_DTYPE = "float32"
+SUPPORTED_DTYPES = ("float32", "float16")
+
+# Budget for resident models, in MB. 0 disables the byte budget and keeps
+# `WVT_MODEL_CACHE_MAX_MODELS` as the only limit.
+MODEL_CACHE_MAX_MB_ENV = "WVT_MODEL_CACHE_MAX_MB"
+MODEL_CACHE_MAX_MODELS_ENV = "WVT_MODEL_CACHE_MAX_MODELS"
+DEFAULT_MAX_MB = 4096
+DEFAULT_MAX_MODELS = 2
+
+ModelKey = tuple[str, Optional[str], str]
+
+# Per-thread total of model load time, read by take_thread_load_seconds().
+_thread_loads = threading.local()
+
+# Whisper installs kv-cache hooks on the model for every decode, so a shared
+# model must not run two transcriptions at once. Locks are keyed by id(model).
+_model_locks: dict[int, threading.Lock] = {}
+_model_locks_lock = threading.Lock()
+
+
+@dataclass
+class ModelCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    loads: int = 0
+    load_seconds: float = 0.0
+    resident_models: int = 0
+    resident_bytes: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "loads": self.loads,
+            "load_seconds": round(self.load_seconds, 3),
+            "resident_models": self.resident_models,
+            "resident_bytes": self.resident_bytes,
+        }
+
+
+@dataclass
+class _CacheEntry:
+    model: Any
+    size_bytes: int
+
+
+def _estimate_model_bytes(model: Any) -> int:
+    """Return the parameter + buffer footprint of a torch module, or 0 if unknown."""
+    total = 0
+    try:
+        for tensor in (*model.parameters(), *model.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    except Exception:
+        logging.debug("Could not estimate model size", exc_info=True)
+        return 0
+    return total
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logging.warning(f"Ignoring invalid {name}={value!r}; using {default}")
+        return default
+
+
+class ModelCache:
+    """Thread-safe LRU registry of loaded Whisper models."""
+
+    def __init__(self, max_bytes: int = 0, max_models: int = 0) -> None:
+        self.max_bytes = max_bytes
+        self.max_models = max_models
+        self._entries: OrderedDict[ModelKey, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per key so concurrent jobs wait for a single load instead of
+        # each loading their own copy of the same model.
+        self._load_locks: dict[ModelKey, threading.Lock] = {}
+        self._stats = ModelCacheStats()
+
+    def get(self, model_name: str, device: str | None = None, dtype: str = DEFAULT_DTYPE) -> Any:
+        """Return a loaded model, loading and caching it on a miss."""
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported model dtype '{dtype}'. Supported: {SUPPORTED_DTYPES}")
+        key: ModelKey = (model_name, device, dtype)
+
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another thread may have finished loading while we waited.
+            with self._lock:
+                entry = self._lookup(key, count_miss=True)
+                if entry is not None:
+                    return entry.model
+
+            logging.info(f"Loading Whisper model '{model_name}'...")
+            started = time.perf_counter()
+            model = whisper.load_model(model_name, device=device)
+            if dtype == "float16":
+                model = model.half()
+            elapsed = time.perf_counter() - started
+            _thread_loads.seconds = getattr(_thread_loads, "seconds", 0.0) + elapsed
+            size_bytes = _estimate_model_bytes(model)
+            logging.info(f"✓ Loaded Whisper model '{model_name}' in {elapsed:.1f}s")
+
+            with self._lock:
+                self._stats.loads += 1
+                self._stats.load_seconds += elapsed
+                self._entries[key] = _CacheEntry(model=model, size_bytes=size_bytes)
+                self._evict_locked(keep=key)
+                self._load_locks.pop(key, None)
+            return model
+
+    def _lookup(self, key: ModelKey, count_miss: bool = False) -> _CacheEntry | None:
+        """Return the entry for key and mark it most recently used. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+        elif count_miss:
+            self._stats.misses += 1
+        return entry
+
+    def _evict_locked(self, keep: ModelKey) -> None:
+        """Drop least-recently-used entries until within budget, never evicting `keep`."""
+        while len(self._entries) > 1:
+            over_count = self.max_models > 0 and len(self._entries) > self.max_models
+            over_bytes = self.max_bytes > 0 and self._resident_bytes() > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            del self._entries[oldest]
+            self._stats.evictions += 1
+            logging.info(f"Evicted Whisper model '{oldest[0]}' from cache")
+
+    def _resident_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def contains(
+        self, model_name: str, device: str | None = None, dtype: str = DEFAULT_DTYPE
+    ) -> bool:
+        """Return True if the model is resident, without touching LRU order or stats."""
+        with self._lock:
+            return (model_name, device, dtype) in self._entries
+
+    def clear(self) -> None:
+        """Drop every cached model and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = ModelCacheStats()
+
+    def stats(self) -> ModelCacheStats:
+        """Return a snapshot of cache statistics."""
+        with self._lock:
+            return ModelCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                loads=self._stats.loads,
+                load_seconds=self._stats.load_seconds,
+                resident_models=len(self._entries),
+                resident_bytes=self._resident_bytes(),
+            )
+
+
+_default_cache: ModelCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_model_cache() -> ModelCache:
+    """Return the process-wide model cache, configured from the environment on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ModelCache(
+                max_bytes=_env_int(MODEL_CACHE_MAX_MB_ENV, DEFAULT_MAX_MB) * 1024 * 1024,
+                max_models=_env_int(MODEL_CACHE_MAX_MODELS_ENV, DEFAULT_MAX_MODELS),
+            )
+        return _default_cache
+
+
+def take_thread_load_seconds() -> float:
+    """Return and reset the time this thread has spent loading models.
+
+    Lets the pipeline report model loading separately from the transcription
+    that triggered it.
+    """
+    seconds = getattr(_thread_loads, "seconds", 0.0)
+    _thread_loads.seconds = 0.0
+    return seconds
+
+
+def load_model(model_name: str, device: str | None = None, dtype: str = DEFAULT_DTYPE) -> Any:
+    """Return a cached Whisper model, loading it on first use."""
+    return get_model_cache().get(model_name, device=device, dtype=dtype)
+
+
+def model_lock(model: Any) -> threading.Lock:
+    """Return the lock that serializes transcriptions on a loaded model."""
+    with _model_locks_lock:
+        return _model_locks.setdefault(id(model), threading.Lock())
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import logging
 import shutil
+import subprocess
 import tempfile
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from whisper_video_to_text.convert import convert_media_to_whisper_audio
-from whisper_video_to_text.download import download_video
+import numpy as np
+
+from whisper_video_to_text.audio import Samples, build_speech_timeline
+from whisper_video_to_text.cache import (
+    ResultCache,
+    cache_key,
+    get_result_cache,
+    hash_file,
+    hash_samples,
+)
+from whisper_video_to_text.chunking import DEFAULT_CHUNK_SECONDS, transcribe_chunked
+from whisper_video_to_text.convert import (
+    WHISPER_SAMPLE_RATE,
+    FfmpegProgress,
+    WhisperWav,
+    convert_media_to_whisper_audio,
+    decode_media_to_whisper_array,
+)
+from whisper_video_to_text.download import (
+    download_video,
+    stream_url_to_whisper_array,
+    stream_url_to_whisper_audio,
+)
 from whisper_video_to_text.errors import TranscriptionCancelled
+from whisper_video_to_text.models import take_thread_load_seconds
+from whisper_video_to_text.probe import MediaInfo, probe_media
+from whisper_video_to_text.spans import StageSpan, emit_span, measure
 from whisper_video_to_text.transcribe import (
     render_srt,
     render_txt,
@@ -18,7 +45,9 @@ from whisper_video_to_text.transcribe import (
 )
 
 __all__ = [
+    "STAGES",
     "TranscriptionCancelled",
+    "TranscriptionJob",
     "TranscriptionRequest",
     "TranscriptionResult",
     "run_transcription",
@@ -35,6 +64,21 @@ class TranscriptionRequest:
     include_timestamps: bool = False
     keep_audio: bool = False
     output_base: Path | None = None
+    # Decode straight into memory instead of writing an intermediate WAV.
+    # Ignored when keep_audio is set, since the WAV is then a requested output.
+    in_memory_audio: bool = False
+    # More than one worker splits long audio into chunks transcribed in parallel.
+    workers: int = 1
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS
+    # Concurrent ffmpeg processes decoding time slices of long, seekable media.
+    decode_workers: int = 1
+    # Skip silence with an energy VAD pre-pass; timestamps stay on the original timeline.
+    vad: bool = False
+    # Skip the result cache lookup and store (always re-run Whisper).
+    bypass_cache: bool = False
+    # Pipe the download straight into ffmpeg instead of saving the container first.
+    # Results are then cached by the decoded audio, since the source bytes are never kept.
+    stream_download: bool = False
 
 
 @dataclass
@@ -44,55 +88,303 @@ class TranscriptionResult:
     segments: list[dict[str, Any]]
     rendered: dict[str, str]
     output_files: dict[str, Path] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    # Timing and resource use of each step, in order (see spans.py).
+    spans: list[StageSpan] = field(default_factory=list)
 
 
 ProgressCallback = Callable[[int, str, str], None]
 CancelCheck = Callable[[], bool]
 
 
-def run_transcription(
+def _cache_options(request: TranscriptionRequest) -> dict[str, Any]:
+    """Request fields that change Whisper's output, and so belong in the cache key."""
+    return {
+        "model": request.model,
+        "language": request.language,
+        "vad": request.vad,
+        "chunk_seconds": request.chunk_seconds if request.workers > 1 else None,
+    }
+
+
+def _transcribe(
     request: TranscriptionRequest,
-    progress: ProgressCallback | None = None,
+    audio: str | np.ndarray,
+    metadata: dict[str, Any],
     should_cancel: CancelCheck | None = None,
-) -> TranscriptionResult:
-    """Orchestrate download → convert → transcribe → render for both CLI and web."""
+) -> dict[str, Any]:
+    """Run Whisper on normalized audio, applying the VAD and chunking options."""
+    if not request.vad and request.workers <= 1:
+        return transcribe_audio(audio, model_name=request.model, language=request.language)
 
-    def report(pct: int, status: str, msg: str) -> None:
-        if progress:
-            progress(pct, status, msg)
+    # A WAV on disk is memory-mapped; VAD and chunking read it in windows.
+    samples: Samples = audio if isinstance(audio, np.ndarray) else WhisperWav(audio)
+    timeline = None
+    if request.vad:
+        timeline = build_speech_timeline(samples)
+        metadata["vad"] = timeline.summary()
+        if not timeline.regions:
+            return {"text": "", "segments": [], "language": request.language}
+        samples = timeline.compact(samples)
+
+    if request.workers > 1:
+        result = transcribe_chunked(
+            samples,
+            model_name=request.model,
+            language=request.language,
+            workers=request.workers,
+            chunk_seconds=request.chunk_seconds,
+            should_cancel=should_cancel,
+        )
+    else:
+        result = transcribe_audio(samples[:], model_name=request.model, language=request.language)
+
+    if timeline is not None:
+        result = timeline.remap_result(result)
+    return result
+
+
+def _file_size(path: str | Path | None) -> int | None:
+    try:
+        return Path(path).stat().st_size if path else None
+    except OSError:
+        return None
 
-    def check_cancelled() -> None:
-        if should_cancel and should_cancel():
-            raise TranscriptionCancelled()
 
-    tempdir = tempfile.mkdtemp(prefix="wvttmp_")
+def _audio_seconds(audio: str | np.ndarray) -> float | None:
+    """Duration of normalized Whisper audio: samples in memory or a 16-bit mono WAV.
+
+    A WAV's length comes from its data chunk, as passed-through WAVs can carry
+    LIST or other chunks that a fixed header size would count as audio.
+    """
+    if isinstance(audio, np.ndarray):
+        return len(audio) / WHISPER_SAMPLE_RATE
     try:
-        # Acquire source media
-        media_path = request.source
-        if request.download:
-            check_cancelled()
-            report(10, "downloading", "Downloading video...")
-            media_path = download_video(request.source, output_dir=tempdir)
-
-        # Normalize to 16 kHz mono WAV
-        check_cancelled()
-        report(30, "converting", "Extracting audio...")
-        audio_out = Path(tempdir) / f"{Path(media_path).stem}-whisper.wav"
-        audio_path = convert_media_to_whisper_audio(
-            media_path, output_file=str(audio_out), should_cancel=should_cancel
+        return len(WhisperWav(audio)) / WHISPER_SAMPLE_RATE
+    except (OSError, ValueError):
+        return None
+
+
+def _audio_bytes(audio: str | np.ndarray) -> int | None:
+    return audio.nbytes if isinstance(audio, np.ndarray) else _file_size(audio)
+
+
+@dataclass(eq=False)
+class TranscriptionJob:
+    """State carried from one stage of a transcription to the next."""
+
+    request: TranscriptionRequest
+    progress: ProgressCallback | None = None
+    should_cancel: CancelCheck | None = None
+    tempdir: str = field(default_factory=lambda: tempfile.mkdtemp(prefix="wvttmp_"))
+    media_path: str = ""
+    media_duration: float | None = None
+    media_info: MediaInfo | None = None
+    audio: str | np.ndarray = ""
+    audio_path: Path | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    result: dict[str, Any] | None = None
+    cache: ResultCache | None = None
+    key: str | None = None
+    spans: list[StageSpan] = field(default_factory=list)
+    # Set when ffmpeg could not decode the piped stream; the file is downloaded instead.
+    stream_failed: bool = False
+
+    def __post_init__(self) -> None:
+        self.media_path = self.media_path or self.request.source
+        if not self.request.bypass_cache:
+            self.cache = get_result_cache()
+
+    @property
+    def streaming(self) -> bool:
+        return self.request.download and self.request.stream_download and not self.stream_failed
+
+    @property
+    def in_memory(self) -> bool:
+        return self.request.in_memory_audio and not self.request.keep_audio
+
+    @property
+    def audio_seconds(self) -> float | None:
+        """Length of the normalized audio, or the probed media duration before that."""
+        if isinstance(self.audio, np.ndarray) or self.audio:
+            seconds = _audio_seconds(self.audio)
+            if seconds is not None:
+                return seconds
+        return self.media_duration
+
+    def report(self, pct: int, status: str, msg: str) -> None:
+        if self.progress:
+            self.progress(pct, status, msg)
+
+    def conversion_progress(self, update: FfmpegProgress) -> None:
+        """Map ffmpeg progress onto the 30-59% "converting" band of the job."""
+        fraction = update.fraction
+        if fraction is None:
+            return
+        speed = f" at {update.speed:.0f}x" if update.speed else ""
+        self.report(
+            30 + int(fraction * 29), "converting", f"Extracting audio... {fraction:.0%}{speed}"
         )
 
-        # Transcribe (blocking; cancellation only takes effect after it returns)
-        check_cancelled()
-        report(60, "transcribing", "Transcribing audio...")
-        result = transcribe_audio(
-            str(audio_path), model_name=request.model, language=request.language
+    def check_cancelled(self) -> None:
+        if self.should_cancel and self.should_cancel():
+            raise TranscriptionCancelled()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[StageSpan]:
+        """Measure a step, then record it on the job and pass it to the span hooks."""
+        with measure(name) as span:
+            yield span
+        self.add_span(span)
+
+    def add_span(self, span: StageSpan) -> None:
+        self.spans.append(span)
+        emit_span(span, self.request)
+
+    def lookup(self, content_hash: str) -> None:
+        """Load a cached result for this content, recording the key for the later store."""
+        self.key = cache_key(content_hash, _cache_options(self.request))
+        cached = self.cache.get(self.key) if self.cache is not None else None
+        if cached is None:
+            return
+        self.metadata.update(cached.get("metadata", {}))
+        self.metadata["cache"] = "hit"
+        self.result = cached["result"]
+
+    def close(self) -> None:
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+
+def _download_stream(job: TranscriptionJob) -> None:
+    """Decode the yt-dlp stream straight to Whisper audio and look it up in the cache."""
+    job.check_cancelled()
+    job.report(10, "downloading", "Streaming audio...")
+    with job.span("download") as span:
+        if job.in_memory:
+            job.audio = stream_url_to_whisper_array(
+                job.request.source, should_cancel=job.should_cancel
+            )
+        else:
+            audio_out = Path(job.tempdir) / "stream-whisper.wav"
+            job.audio_path = stream_url_to_whisper_audio(
+                job.request.source, output_file=str(audio_out), should_cancel=job.should_cancel
+            )
+            job.audio = str(job.audio_path)
+        span.bytes_out = _audio_bytes(job.audio)
+        span.audio_seconds = _audio_seconds(job.audio)
+    if job.cache is not None:
+        audio = job.audio
+        digest = hash_samples(audio) if isinstance(audio, np.ndarray) else hash_file(audio)
+        job.lookup(digest)
+
+
+def download_stage(job: TranscriptionJob) -> None:
+    """Fetch remote media; a streamed download is decoded to Whisper audio here too."""
+    request = job.request
+    if job.streaming:
+        try:
+            _download_stream(job)
+            return
+        except subprocess.CalledProcessError as e:
+            if e.cmd[:1] == ["yt-dlp"]:
+                raise
+            # ffmpeg cannot demux some containers from a pipe (MP4/M4A with the
+            # moov atom at the end), so fall back to downloading the file.
+            logging.warning(f"Could not decode the streamed audio, downloading instead: {e}")
+            job.stream_failed = True
+    if request.download:
+        job.check_cancelled()
+        job.report(10, "downloading", "Downloading audio...")
+        with job.span("download") as span:
+            # Only the audio track is needed for a transcript.
+            job.media_path = download_video(request.source, output_dir=job.tempdir, audio_only=True)
+            span.bytes_out = _file_size(job.media_path)
+
+
+def convert_stage(job: TranscriptionJob) -> None:
+    """Look up a cached result, then normalize the media to 16 kHz mono if still needed."""
+    if job.streaming:
+        return
+
+    # Hash the whole source for the cache key; its own span, as it reads every byte.
+    if job.cache is not None and Path(job.media_path).is_file():
+        with job.span("hash") as span:
+            span.bytes_in = _file_size(job.media_path)
+            job.lookup(hash_file(job.media_path))
+
+    # Probe the duration (used for progress and the RTF)
+    with job.span("probe") as span:
+        span.bytes_in = _file_size(job.media_path)
+        if job.result is None or job.request.keep_audio:
+            # One ffprobe run, cached, shared with the converters below.
+            job.media_info = probe_media(job.media_path)
+        if job.media_info is not None:
+            job.media_duration = job.media_info.duration
+            job.metadata["media"] = job.media_info.as_dict()
+        span.audio_seconds = job.media_duration
+
+    # Normalize to 16 kHz mono, either in memory or as a WAV file.
+    # A cache hit only needs this when the WAV itself was requested.
+    if job.result is None or job.request.keep_audio:
+        job.check_cancelled()
+        job.report(30, "converting", "Extracting audio...")
+        with job.span("convert") as span:
+            span.bytes_in = _file_size(job.media_path)
+            if job.in_memory:
+                job.audio = decode_media_to_whisper_array(
+                    job.media_path,
+                    should_cancel=job.should_cancel,
+                    duration=job.media_duration,
+                    on_progress=job.conversion_progress,
+                    decode_workers=job.request.decode_workers,
+                )
+            else:
+                audio_out = Path(job.tempdir) / f"{Path(job.media_path).stem}-whisper.wav"
+                job.audio_path = convert_media_to_whisper_audio(
+                    job.media_path,
+                    output_file=str(audio_out),
+                    should_cancel=job.should_cancel,
+                    duration=job.media_duration,
+                    on_progress=job.conversion_progress,
+                    decode_workers=job.request.decode_workers,
+                )
+                job.audio = str(job.audio_path)
+            span.bytes_out = _audio_bytes(job.audio)
+            span.audio_seconds = _audio_seconds(job.audio)
+
+
+def transcribe_stage(job: TranscriptionJob) -> None:
+    """Run Whisper unless the cache already answered (blocking; cancel applies after it)."""
+    if job.result is not None:
+        return
+    job.check_cancelled()
+    job.report(60, "transcribing", "Transcribing audio...")
+    take_thread_load_seconds()
+    with measure("transcribe") as span:
+        job.result = _transcribe(
+            job.request, job.audio, job.metadata, should_cancel=job.should_cancel
         )
+    # A model loaded on first use is reported as its own span, not as transcription time.
+    load_seconds = take_thread_load_seconds()
+    if load_seconds > 0:
+        span.wall_seconds = max(0.0, span.wall_seconds - load_seconds)
+        job.add_span(StageSpan("model_load", wall_seconds=load_seconds))
+    span.bytes_in = _audio_bytes(job.audio)
+    span.audio_seconds = job.audio_seconds
+    job.add_span(span)
+    if job.cache is not None and job.key is not None:
+        job.cache.put(job.key, {"result": job.result, "metadata": job.metadata})
+        job.metadata["cache"] = "miss"
 
-        # Render requested formats
-        check_cancelled()
-        report(90, "saving", "Preparing output...")
-        rendered: dict[str, str] = {}
+
+def render_stage(job: TranscriptionJob) -> TranscriptionResult:
+    """Render the requested formats and write any output files."""
+    request = job.request
+    result = job.result or {}
+    job.check_cancelled()
+    job.report(90, "saving", "Preparing output...")
+    rendered: dict[str, str] = {}
+    with job.span("render") as span:
         for fmt in request.formats:
             if fmt == "txt":
                 rendered["txt"] = render_txt(result, include_timestamps=request.include_timestamps)
@@ -100,25 +392,55 @@ def run_transcription(
                 rendered["srt"] = render_srt(result)
             elif fmt == "vtt":
                 rendered["vtt"] = render_vtt(result)
+        span.bytes_out = sum(len(content.encode("utf-8")) for content in rendered.values())
 
-        # Write output files
-        output_files: dict[str, Path] = {}
-        if request.output_base:
+    # Write output files
+    output_files: dict[str, Path] = {}
+    if request.output_base:
+        with job.span("write") as span:
+            written = 0
             for fmt, content in rendered.items():
                 out = request.output_base.with_suffix(f".{fmt}")
-                out.write_text(content, encoding="utf-8")
+                written += out.write_text(content, encoding="utf-8")
                 output_files[fmt] = out
 
-            if request.keep_audio:
+            if request.keep_audio and job.audio_path is not None:
                 wav_dest = request.output_base.with_suffix(".wav")
-                shutil.copy2(str(audio_path), str(wav_dest))
-
-        return TranscriptionResult(
-            text=result.get("text", ""),
-            language=result.get("language"),
-            segments=result.get("segments", []),
-            rendered=rendered,
-            output_files=output_files,
-        )
+                shutil.copy2(str(job.audio_path), str(wav_dest))
+                written += _file_size(wav_dest) or 0
+            span.bytes_out = written
+
+    return TranscriptionResult(
+        text=result.get("text", ""),
+        language=result.get("language"),
+        segments=result.get("segments", []),
+        rendered=rendered,
+        output_files=output_files,
+        metadata=job.metadata,
+        spans=job.spans,
+    )
+
+
+# The stages in order; only the last one returns the TranscriptionResult.
+STAGES: tuple[tuple[str, Callable[[TranscriptionJob], Any]], ...] = (
+    ("download", download_stage),
+    ("convert", convert_stage),
+    ("transcribe", transcribe_stage),
+    ("render", render_stage),
+)
+
+
+def run_transcription(
+    request: TranscriptionRequest,
+    progress: ProgressCallback | None = None,
+    should_cancel: CancelCheck | None = None,
+) -> TranscriptionResult:
+    """Orchestrate download → convert → transcribe → render for both CLI and web."""
+    job = TranscriptionJob(request, progress=progress, should_cancel=should_cancel)
+    try:
+        download_stage(job)
+        convert_stage(job)
+        transcribe_stage(job)
+        return render_stage(job)
     finally:
-        shutil.rmtree(tempdir, ignore_errors=True)
+        job.close()
@@ -0,0 +1,184 @@
+"""Media probing with ffprobe, cached per file version.
+
+`probe_media` runs `ffprobe -print_format json -show_format -show_streams`
+once and returns a `MediaInfo` with the container, duration, bitrate and every
+stream's codec, sample rate and channel layout. Results are cached by
+(path, size, mtime), so the duration for progress bars, the conversion fast
+paths and the metadata shown in the web UI all come from a single ffprobe
+run per source. A file that is rewritten gets a new cache key.
+
+ffprobe is called directly, with no Python bindings. When ffprobe is missing
+or cannot read the file, `probe_media` returns None and callers carry on
+without the information.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Probed files remembered per process.
+PROBE_CACHE_SIZE = 256
+PROBE_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    index: int
+    codec_type: str
+    codec_name: str | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    sample_fmt: str | None = None
+    duration: float | None = None
+    bit_rate: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "codec_type": self.codec_type,
+            "codec_name": self.codec_name,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "sample_fmt": self.sample_fmt,
+            "duration": self.duration,
+            "bit_rate": self.bit_rate,
+        }
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    format_name: str | None = None
+    duration: float | None = None
+    bit_rate: int | None = None
+    size: int | None = None
+    streams: tuple[StreamInfo, ...] = field(default_factory=tuple)
+
+    @property
+    def audio_streams(self) -> list[StreamInfo]:
+        return [s for s in self.streams if s.codec_type == "audio"]
+
+    @property
+    def has_video(self) -> bool:
+        # Cover art in audio files is reported as a one-frame video stream.
+        return any(
+            s.codec_type == "video" and s.codec_name not in ("mjpeg", "png") for s in self.streams
+        )
+
+    @property
+    def audio(self) -> StreamInfo | None:
+        """The stream the conversion uses (`-map 0:a:0`)."""
+        streams = self.audio_streams
+        return streams[0] if streams else None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "format_name": self.format_name,
+            "duration": self.duration,
+            "bit_rate": self.bit_rate,
+            "size": self.size,
+            "streams": [s.as_dict() for s in self.streams],
+        }
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_ffprobe_json(data: dict[str, Any]) -> MediaInfo:
+    """Build a MediaInfo from `ffprobe -show_format -show_streams` JSON."""
+    fmt = data.get("format") or {}
+    streams = tuple(
+        StreamInfo(
+            index=_int(s.get("index")) or 0,
+            codec_type=s.get("codec_type") or "unknown",
+            codec_name=s.get("codec_name"),
+            sample_rate=_int(s.get("sample_rate")),
+            channels=_int(s.get("channels")),
+            sample_fmt=s.get("sample_fmt"),
+            duration=_float(s.get("duration")),
+            bit_rate=_int(s.get("bit_rate")),
+        )
+        for s in data.get("streams") or []
+    )
+    duration = _float(fmt.get("duration"))
+    if duration is None:
+        # Some containers (e.g. raw streams) only report per-stream durations.
+        durations = [s.duration for s in streams if s.duration is not None]
+        duration = max(durations) if durations else None
+    return MediaInfo(
+        format_name=fmt.get("format_name"),
+        duration=duration,
+        bit_rate=_int(fmt.get("bit_rate")),
+        size=_int(fmt.get("size")),
+        streams=streams,
+    )
+
+
+def _run_ffprobe(path: Path) -> MediaInfo | None:
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-print_format",
+        "json",
+        "-show_format",
+        "-show_streams",
+        str(path),
+    ]
+    try:
+        completed = subprocess.run(
+            cmd, capture_output=True, check=True, timeout=PROBE_TIMEOUT_SECONDS
+        )
+        return parse_ffprobe_json(json.loads(completed.stdout))
+    except Exception as e:
+        logging.debug(f"Could not probe {path}: {e}")
+        return None
+
+
+_cache: OrderedDict[tuple[str, int, int], MediaInfo | None] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def probe_media(input_file: str | os.PathLike[str]) -> MediaInfo | None:
+    """Return stream and format information for a local file, or None if it can't be probed."""
+    path = Path(input_file)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    # Probed outside the lock; two threads racing on the same file both run ffprobe once.
+    info = _run_ffprobe(path)
+    with _cache_lock:
+        _cache[key] = info
+        while len(_cache) > PROBE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return info
+
+
+def clear_probe_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,130 @@
+"""Per-stage timing and resource spans for run_transcription.
+
+Each step of a job (download, hash, probe, convert, model_load, transcribe,
+render and write) is measured as a `StageSpan`. A span records wall time, CPU time,
+the process's peak RSS, bytes in and out, and the audio duration it covered.
+The real-time factor is audio seconds per wall-clock second, so higher is
+faster. Spans are attached to `TranscriptionResult.spans` and passed to every
+hook registered with `add_span_hook`, e.g. to feed metrics or a log pipeline.
+
+CPU time is process-wide, plus finished child processes such as ffmpeg. With
+several jobs running in one process, their spans overlap and share it.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+@dataclass
+class StageSpan:
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float | None = None
+    peak_rss_bytes: int | None = None
+    bytes_in: int | None = None
+    bytes_out: int | None = None
+    audio_seconds: float | None = None
+
+    @property
+    def rtf(self) -> float | None:
+        """Audio seconds processed per wall-clock second."""
+        if not self.audio_seconds or self.wall_seconds <= 0:
+            return None
+        return self.audio_seconds / self.wall_seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        rtf = self.rtf
+        return {
+            "name": self.name,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4) if self.cpu_seconds is not None else None,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "audio_seconds": (
+                round(self.audio_seconds, 3) if self.audio_seconds is not None else None
+            ),
+            "rtf": round(rtf, 3) if rtf is not None else None,
+        }
+
+
+# Called as hook(span, request) after each span of every job.
+SpanHook = Callable[[StageSpan, Any], None]
+
+_hooks: list[SpanHook] = []
+_hooks_lock = threading.Lock()
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def emit_span(span: StageSpan, request: Any) -> None:
+    """Pass a finished span to every hook; a failing hook never fails the job."""
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(span, request)
+        except Exception:
+            logging.debug("Span hook failed", exc_info=True)
+
+
+def _cpu_seconds() -> float:
+    seconds = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        seconds += children.ru_utime + children.ru_stime
+    return seconds
+
+
+def _peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def measure(name: str) -> Iterator[StageSpan]:
+    """Time the enclosed block; the caller fills in bytes and audio seconds."""
+    span = StageSpan(name)
+    wall_start = time.perf_counter()
+    cpu_start = _cpu_seconds()
+    try:
+        yield span
+    finally:
+        span.wall_seconds = time.perf_counter() - wall_start
+        span.cpu_seconds = _cpu_seconds() - cpu_start
+        span.peak_rss_bytes = _peak_rss_bytes()
+
+
+def format_spans(spans: list[StageSpan]) -> str:
+    """One-line summary, e.g. `convert 1.20s (RTF 250.0x) · transcribe 30.10s (RTF 10.0x)`."""
+    parts = []
+    for span in spans:
+        rtf = span.rtf
+        suffix = f" (RTF {rtf:.1f}x)" if rtf is not None else ""
+        parts.append(f"{span.name} {span.wall_seconds:.2f}s{suffix}")
+    return " · ".join(parts)
@@ -0,0 +1,213 @@
+"""Overlapping the stages of several transcription jobs.
+
+`run_transcription` runs download → convert → transcribe → render one after
+the other, so the network and ffmpeg sit idle while Whisper holds the CPU, and
+the reverse. `StagedPipeline` gives each stage in `pipeline.STAGES` its own
+worker threads and a bounded input queue. Job N+1 can then download and
+convert while job N is transcribing. A full queue blocks the stage before it,
+so a slow Whisper pool limits how far ahead the download and convert stages
+run.
+
+`stats()` reports queue depth and utilization for each stage so the pools can
+be sized for the hardware.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+from whisper_video_to_text.pipeline import (
+    STAGES,
+    CancelCheck,
+    ProgressCallback,
+    TranscriptionJob,
+    TranscriptionRequest,
+    TranscriptionResult,
+)
+
+# Whisper saturates the CPU on its own; I/O-bound stages can overlap more.
+DEFAULT_STAGE_WORKERS = {"download": 2, "convert": 2, "transcribe": 1, "render": 1}
+# Jobs that may wait in front of each stage.
+DEFAULT_STAGE_QUEUE = 2
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    busy: int
+    queued: int
+    processed: int
+    failed: int
+    busy_seconds: float
+    # Share of the pool's worker time spent running jobs since startup.
+    utilization: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "busy": self.busy,
+            "queued": self.queued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "utilization": round(self.utilization, 4),
+        }
+
+
+@dataclass(eq=False)
+class _Item:
+    job: TranscriptionJob
+    future: Future[TranscriptionResult]
+
+
+class _Stage:
+    def __init__(
+        self, name: str, fn: Callable[[TranscriptionJob], Any], workers: int, queue_size: int
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.queue: queue.Queue[_Item | None] = queue.Queue(maxsize=max(1, queue_size))
+        self.threads: list[threading.Thread] = []
+        self.lock = threading.Lock()
+        self.busy = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+    def stats(self, uptime: float) -> StageStats:
+        with self.lock:
+            capacity = self.workers * uptime
+            return StageStats(
+                name=self.name,
+                workers=self.workers,
+                busy=self.busy,
+                queued=self.queue.qsize(),
+                processed=self.processed,
+                failed=self.failed,
+                busy_seconds=self.busy_seconds,
+                utilization=self.busy_seconds / capacity if capacity > 0 else 0.0,
+            )
+
+
+class StagedPipeline:
+    """Runs transcription jobs through per-stage worker pools connected by bounded queues."""
+
+    def __init__(
+        self,
+        workers: Mapping[str, int] | None = None,
+        queue_size: int = DEFAULT_STAGE_QUEUE,
+        stages: tuple[tuple[str, Callable[[TranscriptionJob], Any]], ...] = STAGES,
+    ) -> None:
+        counts = {**DEFAULT_STAGE_WORKERS, **(workers or {})}
+        self._stages = [_Stage(name, fn, counts.get(name, 1), queue_size) for name, fn in stages]
+        self._started = time.monotonic()
+        self._closed = False
+        for index, stage in enumerate(self._stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(index,), name=f"wvt-{stage.name}-{n}", daemon=True
+                )
+                thread.start()
+                stage.threads.append(thread)
+
+    def submit(
+        self,
+        request: TranscriptionRequest,
+        progress: ProgressCallback | None = None,
+        should_cancel: CancelCheck | None = None,
+    ) -> Future[TranscriptionResult]:
+        """Queue a job at the first stage, blocking while that stage's queue is full."""
+        if self._closed:
+            raise RuntimeError("Staged pipeline is shut down")
+        future: Future[TranscriptionResult] = Future()
+        future.set_running_or_notify_cancel()
+        item = _Item(
+            TranscriptionJob(request, progress=progress, should_cancel=should_cancel), future
+        )
+        self._stages[0].queue.put(item)
+        return future
+
+    def run(
+        self,
+        request: TranscriptionRequest,
+        progress: ProgressCallback | None = None,
+        should_cancel: CancelCheck | None = None,
+    ) -> TranscriptionResult:
+        """Submit a job and wait for its result (or exception)."""
+        return self.submit(request, progress=progress, should_cancel=should_cancel).result()
+
+    def stats(self) -> list[StageStats]:
+        uptime = time.monotonic() - self._started
+        return [stage.stats(uptime) for stage in self._stages]
+
+    def shutdown(self) -> None:
+        """Finish the jobs already submitted, then stop every worker thread."""
+        self._closed = True
+        # Stage by stage, so jobs still in flight are drained into later stages first.
+        for stage in self._stages:
+            for _ in stage.threads:
+                stage.queue.put(None)
+            for thread in stage.threads:
+                thread.join()
+
+    def _work(self, index: int) -> None:
+        stage = self._stages[index]
+        following = self._stages[index + 1] if index + 1 < len(self._stages) else None
+        while True:
+            item = stage.queue.get()
+            if item is None:
+                return
+            with stage.lock:
+                stage.busy += 1
+            started = time.monotonic()
+            failed = False
+            try:
+                output = stage.fn(item.job)
+            except BaseException as e:
+                # Like ThreadPoolExecutor: a KeyboardInterrupt or SystemExit from a
+                # stage is re-raised by the caller's result(), not lost with the thread.
+                failed = True
+                item.job.close()
+                item.future.set_exception(e)
+            finally:
+                with stage.lock:
+                    stage.busy -= 1
+                    stage.busy_seconds += time.monotonic() - started
+                    stage.processed += 1
+                    stage.failed += failed
+            if failed:
+                continue
+            if following is None:
+                item.job.close()
+                item.future.set_result(output)
+            else:
+                following.queue.put(item)
+
+
+def parse_stage_workers(value: str) -> dict[str, int]:
+    """Parse `download=2,convert=2,transcribe=1` into worker counts per stage."""
+    counts: dict[str, int] = {}
+    names = {name for name, _ in STAGES}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, _, count = part.partition("=")
+        name = name.strip()
+        if name not in names:
+            logging.warning(f"Ignoring unknown pipeline stage {name!r}")
+            continue
+        try:
+            counts[name] = max(1, int(count))
+        except ValueError:
+            logging.warning(f"Ignoring invalid worker count for stage {name!r}: {count!r}")
+    return counts
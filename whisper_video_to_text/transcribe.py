@@ -1,36 +1,65 @@
 import logging
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
-import whisper
+import numpy as np
+
+from whisper_video_to_text.convert import WhisperWav, is_whisper_ready_wav
+from whisper_video_to_text.models import DEFAULT_DTYPE, load_model, model_lock
 
 
 def transcribe_audio(
-    audio_file: str, model_name: str = "base", language: Optional[str] = None, verbose: bool = False
+    audio_file: Union[str, np.ndarray],
+    model_name: str = "base",
+    language: Optional[str] = None,
+    verbose: bool = False,
+    device: Optional[str] = None,
+    dtype: str = DEFAULT_DTYPE,
 ) -> dict[str, Any]:
     """
     Transcribe audio using OpenAI Whisper.
 
+    Models are served from the process-wide cache in `models.py`, so repeated
+    calls with the same model only pay the load cost once. Calls sharing a
+    model from several threads take turns on it.
+
     Args:
-        audio_file: Path to the audio file.
+        audio_file: Path to the audio file, or 16 kHz mono float32 samples
+            from `convert.decode_media_to_whisper_array`. A 16 kHz mono PCM
+            WAV (the converter's output) is read without ffmpeg.
         model_name: Whisper model to use.
         language: Language code (optional).
         verbose: If True, show detailed output.
+        device: Torch device for the model (optional; Whisper picks one by default).
+        dtype: Model weight precision, "float32" or "float16".
 
     Returns:
         Transcription result as a dictionary.
     """
-    audio_path = Path(audio_file)
-
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_file}")
+    audio: Union[str, np.ndarray]
+    if isinstance(audio_file, np.ndarray):
+        audio = audio_file
+        description = "in-memory audio"
+    else:
+        audio_path = Path(audio_file)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_file}")
+        description = audio_path.name
+        if is_whisper_ready_wav(audio_path):
+            # Whisper would run ffmpeg to decode it again; map it and convert in windows.
+            audio = WhisperWav(audio_path).to_array()
+        else:
+            audio = str(audio_path)
 
-    logging.info(f"Loading Whisper model '{model_name}'...")
-    model = whisper.load_model(model_name)
+    model = load_model(model_name, device=device, dtype=dtype)
 
-    logging.info(f"Transcribing {audio_path.name}...")
+    logging.info(f"Transcribing {description}...")
 
-    result = model.transcribe(str(audio_path), language=language, verbose=verbose, fp16=False)
+    # Concurrent jobs share the cached model; one decode at a time keeps their hooks apart.
+    with model_lock(model):
+        result = model.transcribe(
+            audio, language=language, verbose=verbose, fp16=dtype == "float16"
+        )
 
     logging.info("✓ Transcription complete")
     return result
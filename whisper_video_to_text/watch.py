@@ -0,0 +1,233 @@
+"""Watch-folder daemon: transcribe media files as they are dropped into a directory.
+
+`whisper_video_to_text watch DIR` stays running with the Whisper model loaded,
+so the delay between a file landing and its transcript is mostly Whisper
+itself. On Linux the directory is watched with inotify through ctypes (no extra
+dependency). Elsewhere, or when inotify is unavailable, it is scanned every
+`poll_interval` seconds.
+
+Copies over a network share arrive in pieces, so a file is only picked up once
+its size and mtime have not changed for `settle_seconds`. Finished files are
+recorded in the same manifest as `--batch`, so a restarted watcher skips work
+it has already done and picks up anything dropped while it was down.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+
+from whisper_video_to_text.batch import (
+    MANIFEST_NAME,
+    BatchManifest,
+    is_source_media,
+    local_pipeline,
+    output_base_for,
+)
+from whisper_video_to_text.pipeline import TranscriptionRequest, TranscriptionResult
+
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_POLL_SECONDS = 1.0
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+# The same filter as batch discovery.
+is_watchable = is_source_media
+
+
+def _scan(directory: Path) -> list[Path]:
+    try:
+        return sorted(p for p in directory.iterdir() if p.is_file() and is_watchable(p))
+    except FileNotFoundError:
+        return []
+
+
+class PollingWatcher:
+    """Reports files whose size or mtime changed since the previous scan."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._seen = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in _scan(self.directory):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def changes(self, timeout: float) -> list[Path]:
+        time.sleep(timeout)
+        current = self._snapshot()
+        changed = [p for p, key in current.items() if self._seen.get(p) != key]
+        self._seen = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify on a single directory, via libc and ctypes."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed: {os.strerror(errno)}")
+        self._fd = fd
+
+    def changes(self, timeout: float) -> list[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        changed: dict[Path, None] = {}
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; fall back to a full scan.
+                changed.update(dict.fromkeys(_scan(self.directory)))
+            elif name:
+                path = self.directory / os.fsdecode(name)
+                if is_watchable(path):
+                    changed[path] = None
+        return list(changed)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def open_watcher(directory: Path, use_inotify: bool = True) -> InotifyWatcher | PollingWatcher:
+    """inotify where available, otherwise polling."""
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            logging.warning(f"inotify unavailable ({e}); polling {directory} instead")
+    return PollingWatcher(directory)
+
+
+def _warm_model(model_name: str) -> None:
+    from whisper_video_to_text.models import load_model
+
+    started = time.monotonic()
+    try:
+        load_model(model_name)
+    except Exception as e:
+        logging.warning(f"Could not preload Whisper model '{model_name}': {e}")
+        return
+    logging.info(f"Model '{model_name}' ready in {time.monotonic() - started:.1f}s")
+
+
+def watch_directory(
+    directory: Path,
+    template: TranscriptionRequest,
+    output_dir: Path | None = None,
+    jobs: int = 2,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+    poll_interval: float = DEFAULT_POLL_SECONDS,
+    manifest_path: Path | None = None,
+    stop: threading.Event | None = None,
+    watcher: InotifyWatcher | PollingWatcher | None = None,
+    warm_model: bool = True,
+) -> None:
+    """Transcribe media dropped into `directory` until `stop` is set.
+
+    Jobs already submitted are finished before this returns.
+    """
+    directory = directory.resolve()
+    stop = stop or threading.Event()
+    manifest = BatchManifest(manifest_path or (output_dir or directory) / MANIFEST_NAME)
+    if watcher is None:
+        watcher = open_watcher(directory)
+    if warm_model:
+        threading.Thread(
+            target=_warm_model, args=(template.model,), name="wvt-warm-model", daemon=True
+        ).start()
+    pipeline = local_pipeline(jobs)
+    in_flight: set[Path] = set()
+    lock = threading.Lock()
+
+    def finished(source: Path, started: float, future: Future[TranscriptionResult]) -> None:
+        status = manifest.record_outcome(source, future, started)
+        with lock:
+            in_flight.discard(source)
+        logging.info(f"{status}: {source} ({time.monotonic() - started:.1f}s)")
+
+    # path -> ((size, mtime_ns) at last change, monotonic time of that change)
+    pending: dict[Path, tuple[tuple[int, int] | None, float]] = {
+        path: (None, 0.0) for path in _scan(directory)
+    }
+    logging.info(f"Watching {directory} ({type(watcher).__name__}, {len(pending)} existing)")
+    try:
+        while not stop.is_set():
+            for path in watcher.changes(timeout=min(poll_interval, settle_seconds)):
+                pending[path] = (None, 0.0)
+
+            now = time.monotonic()
+            for path, (key, since) in list(pending.items()):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    del pending[path]
+                    continue
+                current = (st.st_size, st.st_mtime_ns)
+                if current != key:
+                    pending[path] = (current, now)
+                    continue
+                if now - since < settle_seconds:
+                    continue
+                del pending[path]
+                with lock:
+                    if path in in_flight:
+                        # Rewritten while transcribing: look again once the job is done.
+                        pending[path] = (None, 0.0)
+                        continue
+                    if manifest.is_done(path):
+                        continue
+                    in_flight.add(path)
+                base = output_base_for(path, directory, output_dir)
+                base.parent.mkdir(parents=True, exist_ok=True)
+                request = replace(template, source=str(path), download=False, output_base=base)
+                logging.info(f"Queued {path}")
+                started = time.monotonic()
+                pipeline.submit(request).add_done_callback(partial(finished, path, started))
+    finally:
+        watcher.close()
+        pipeline.shutdown()
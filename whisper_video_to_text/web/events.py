@@ -0,0 +1,106 @@
+"""Per-job event log behind the SSE progress streams.
+
+Every update to a job is appended to a bounded log under a monotonically
+increasing ID. Any number of subscribers read the log independently, so two
+tabs can follow the same job, and an `EventSource` that reconnects with
+`Last-Event-ID` is sent only the events it missed. Updates are full state
+snapshots, so a subscriber that fell behind the oldest retained event loses
+nothing but intermediate progress; the final event is never dropped.
+
+Jobs are updated from worker threads as well as the event loop. Appends take
+a short `threading.Lock`, and each waiting subscriber is woken on the loop it
+subscribed from with `call_soon_threadsafe`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Collection
+from dataclasses import dataclass
+from typing import Any
+
+# Events kept per job for replay.
+EVENT_LOG_SIZE = 64
+# Idle streams get an SSE comment this often so proxies don't close them.
+HEARTBEAT_SECONDS = 15.0
+
+
+@dataclass
+class ProgressEvent:
+    """An update with its ID; `update` is None for a keep-alive."""
+
+    id: int | None
+    update: dict[str, Any] | None
+
+
+class JobEventLog:
+    def __init__(self, maxlen: int = EVENT_LOG_SIZE) -> None:
+        self._events: deque[tuple[int, dict[str, Any]]] = deque(maxlen=maxlen)
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def last_id(self) -> int:
+        with self._lock:
+            return self._last_id
+
+    def publish(self, update: dict[str, Any]) -> int:
+        """Append an update and wake every subscriber; safe from any thread."""
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            self._events.append((event_id, update))
+            waiters = list(self._waiters)
+        for loop, wake in waiters:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                # That subscriber's loop has closed.
+                pass
+        return event_id
+
+    def since(self, after: int) -> list[tuple[int, dict[str, Any]]]:
+        """Retained events with an ID greater than `after`, oldest first."""
+        with self._lock:
+            if after >= self._last_id:
+                return []
+            return [(event_id, update) for event_id, update in self._events if event_id > after]
+
+    def latest(self) -> list[tuple[int, dict[str, Any]]]:
+        with self._lock:
+            return [self._events[-1]] if self._events else []
+
+    async def subscribe(
+        self,
+        after: int = 0,
+        until: Collection[str] = (),
+        heartbeat: float | None = HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[ProgressEvent]:
+        """Yield events after `after`, then new ones as they arrive.
+
+        Stops after an event whose status is in `until`. With `heartbeat`, a
+        keep-alive `ProgressEvent(None, None)` is yielded after that many idle seconds.
+        """
+        wake = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), wake)
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            while True:
+                # Cleared before reading, so a publish after the read still wakes us.
+                wake.clear()
+                for event_id, update in self.since(after):
+                    after = event_id
+                    yield ProgressEvent(event_id, update)
+                    if update.get("status") in until:
+                        return
+                try:
+                    await asyncio.wait_for(wake.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ProgressEvent(None, None)
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
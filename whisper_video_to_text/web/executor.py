@@ -0,0 +1,391 @@
+"""Out-of-process execution of web transcription jobs.
+
+With `WVT_EXECUTOR=process`, every scheduler slot is backed by a persistent
+worker process that keeps its Whisper models resident between jobs. Job
+requests go to a worker over a pipe, and progress comes back the same way to
+`web/progress.py`. Whisper inference then never holds the server's GIL.
+Cancellation first asks the worker to stop cooperatively, which stops ffmpeg
+and yt-dlp cleanly. If the worker is stuck inside a Whisper decode, its whole
+process group is killed after a grace period and a fresh worker is started.
+
+With `WVT_EXECUTOR=staged`, jobs stay in the server process but run through a
+`StagedPipeline`: each stage has its own thread pool, so one job can download
+and convert while another is transcribing.
+
+The default `thread` executor runs jobs in-process on the scheduler's threads.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Union
+
+from whisper_video_to_text.errors import TranscriptionCancelled
+from whisper_video_to_text.pipeline import (
+    STAGES,
+    TranscriptionRequest,
+    TranscriptionResult,
+    run_transcription,
+)
+from whisper_video_to_text.staged import (
+    DEFAULT_STAGE_QUEUE,
+    DEFAULT_STAGE_WORKERS,
+    StagedPipeline,
+    StageStats,
+    parse_stage_workers,
+)
+from whisper_video_to_text.web import preload
+
+# "thread" (default) runs jobs in the server process; "process" uses workers;
+# "staged" overlaps the stages of concurrent jobs.
+EXECUTOR_ENV = "WVT_EXECUTOR"
+EXECUTOR_MODES = ("thread", "process", "staged")
+CANCEL_GRACE_ENV = "WVT_CANCEL_GRACE_SECONDS"
+# e.g. "download=2,convert=2,transcribe=1,render=1"
+STAGE_WORKERS_ENV = "WVT_STAGE_WORKERS"
+STAGE_QUEUE_ENV = "WVT_STAGE_QUEUE"
+DEFAULT_CANCEL_GRACE_SECONDS = 2.0
+# How often a waiting job checks for cancellation and worker death.
+POLL_SECONDS = 0.2
+
+ProgressCallback = Callable[[int, str, str], None]
+CancelCheck = Callable[[], bool]
+# Signature of run_transcription; must be a picklable top-level function.
+JobRunner = Callable[..., TranscriptionResult]
+
+
+class WorkerError(RuntimeError):
+    """A job failed inside a worker process, or the worker died."""
+
+
+def _worker_main(
+    conn: Connection,
+    cancel_event: Any,
+    models: tuple[str, ...],
+    runner: JobRunner = run_transcription,
+) -> None:
+    """Worker process loop: preload models, then run jobs sent over `conn`."""
+    # Lead a new process group so a hard kill also takes ffmpeg/yt-dlp children.
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+    from whisper_video_to_text.models import load_model
+
+    failed: dict[str, str] = {}
+    for model_name in models:
+        try:
+            load_model(model_name)
+        except Exception as e:
+            failed[model_name] = str(e)
+    conn.send(("ready", [m for m in models if m not in failed], failed))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            # The server went away.
+            return
+        if message[0] == "stop":
+            return
+        _, request = message
+        try:
+            result = runner(
+                request,
+                progress=lambda pct, status, msg: conn.send(("progress", pct, status, msg)),
+                should_cancel=cancel_event.is_set,
+            )
+        except TranscriptionCancelled:
+            conn.send(("cancelled",))
+        except Exception as e:
+            conn.send(("error", str(e) or type(e).__name__))
+        else:
+            conn.send(("result", result))
+
+
+@dataclass(eq=False)
+class _Worker:
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+    cancel_event: Any
+
+
+class ProcessJobExecutor:
+    """Pool of persistent worker processes that run one transcription job at a time each."""
+
+    def __init__(
+        self,
+        workers: int = 1,
+        models: tuple[str, ...] = (),
+        cancel_grace: float = DEFAULT_CANCEL_GRACE_SECONDS,
+        runner: JobRunner = run_transcription,
+        mp_context: Any = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.models = models
+        self.cancel_grace = cancel_grace
+        self.runner = runner
+        # spawn by default: forking a server that already runs threads (and
+        # possibly torch) is not safe.
+        self._context = mp_context or multiprocessing.get_context("spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._all: set[_Worker] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.respawns = 0
+
+    def start(self) -> None:
+        """Spawn the workers; each becomes available once its models are loaded."""
+        for _ in range(self.workers):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        cancel_event = self._context.Event()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, cancel_event, self.models, self.runner),
+            name="wvt-job-worker",
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn, cancel_event)
+        with self._lock:
+            self._all.add(worker)
+        threading.Thread(
+            target=self._await_ready, args=(worker,), name="wvt-worker-start", daemon=True
+        ).start()
+
+    def _await_ready(self, worker: _Worker) -> None:
+        try:
+            _, loaded, failed = worker.conn.recv()
+        except (EOFError, OSError):
+            # Not respawned: a worker that cannot start will not start next time either.
+            logging.error(f"Worker process {worker.process.pid} exited during startup")
+            self._discard(worker)
+            return
+        preload.record_loaded(loaded, failed, worker=worker.process.pid)
+        logging.info(f"Worker process {worker.process.pid} ready")
+        self._idle.put(worker)
+
+    def _discard(self, worker: _Worker) -> None:
+        with self._lock:
+            self._all.discard(worker)
+        _kill_worker(worker)
+
+    def _acquire(self, should_cancel: CancelCheck | None) -> _Worker:
+        while True:
+            if should_cancel and should_cancel():
+                raise TranscriptionCancelled()
+            if self._closed:
+                raise WorkerError("Job executor is shut down")
+            with self._lock:
+                if not self._all:
+                    raise WorkerError("No transcription worker processes are running")
+            try:
+                worker = self._idle.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if worker.process.is_alive():
+                return worker
+            self._replace(worker)
+
+    def _replace(self, worker: _Worker) -> None:
+        self._discard(worker)
+        if not self._closed:
+            self.respawns += 1
+            self._spawn()
+
+    def run(
+        self,
+        job_id: str,
+        request: TranscriptionRequest,
+        progress: ProgressCallback | None = None,
+        should_cancel: CancelCheck | None = None,
+    ) -> TranscriptionResult:
+        """Run a job on the next free worker, blocking until it finishes.
+
+        Raises TranscriptionCancelled when should_cancel() turns true, killing the
+        worker if it does not stop within the grace period.
+        """
+        worker = self._acquire(should_cancel)
+        healthy = False
+        try:
+            worker.cancel_event.clear()
+            worker.conn.send(("run", request))
+            cancel_deadline: float | None = None
+            while True:
+                if cancel_deadline is None and should_cancel and should_cancel():
+                    worker.cancel_event.set()
+                    cancel_deadline = time.monotonic() + self.cancel_grace
+                if cancel_deadline is not None and time.monotonic() >= cancel_deadline:
+                    logging.info(f"Killing worker {worker.process.pid} to cancel job {job_id}")
+                    raise TranscriptionCancelled()
+                if not worker.conn.poll(POLL_SECONDS):
+                    if not worker.process.is_alive():
+                        raise WorkerError(
+                            f"Worker process exited with code {worker.process.exitcode}"
+                        )
+                    continue
+                try:
+                    message = worker.conn.recv()
+                except (EOFError, OSError) as e:
+                    raise WorkerError("Worker process exited unexpectedly") from e
+
+                kind = message[0]
+                if kind == "progress":
+                    if progress:
+                        progress(*message[1:])
+                    continue
+                healthy = True
+                if kind == "result":
+                    return message[1]
+                if kind == "cancelled":
+                    raise TranscriptionCancelled()
+                raise WorkerError(message[1])
+        finally:
+            if healthy:
+                self._idle.put(worker)
+            else:
+                self._replace(worker)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop every worker, killing any that do not exit in time."""
+        self._closed = True
+        with self._lock:
+            workers = list(self._all)
+            self._all.clear()
+        for worker in workers:
+            try:
+                worker.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            _kill_worker(worker)
+
+
+def _kill_worker(worker: _Worker) -> None:
+    """Hard-kill a worker and its process group (ffmpeg, yt-dlp) and reap it."""
+    process = worker.process
+    if process.is_alive() and process.pid is not None:
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            process.kill()
+        process.join(timeout=5)
+    try:
+        worker.conn.close()
+    except OSError:
+        pass
+
+
+class StagedJobExecutor:
+    """Runs web jobs through a StagedPipeline on the server's own threads."""
+
+    def __init__(self, pipeline: StagedPipeline) -> None:
+        self.pipeline = pipeline
+
+    def run(
+        self,
+        job_id: str,
+        request: TranscriptionRequest,
+        progress: ProgressCallback | None = None,
+        should_cancel: CancelCheck | None = None,
+    ) -> TranscriptionResult:
+        return self.pipeline.run(request, progress=progress, should_cancel=should_cancel)
+
+    def stage_stats(self) -> list[StageStats]:
+        return self.pipeline.stats()
+
+    def shutdown(self) -> None:
+        self.pipeline.shutdown()
+
+
+JobExecutor = Union[ProcessJobExecutor, StagedJobExecutor]
+
+_executor: JobExecutor | None = None
+
+
+def executor_mode() -> str:
+    mode = os.getenv(EXECUTOR_ENV, "thread").strip().lower()
+    if mode not in EXECUTOR_MODES:
+        logging.warning(f"Unknown {EXECUTOR_ENV}={mode!r}; running jobs in threads")
+        return "thread"
+    return mode
+
+
+def staged_job_slots() -> int:
+    """Jobs the staged pipeline can work on at once: one per stage worker.
+
+    Each scheduler slot blocks in `StagedPipeline.run` for its job's whole run,
+    so with fewer slots than stage workers the stages would never overlap.
+    """
+    counts = {**DEFAULT_STAGE_WORKERS, **parse_stage_workers(os.getenv(STAGE_WORKERS_ENV, ""))}
+    return sum(max(1, counts.get(name, 1)) for name, _ in STAGES)
+
+
+def _start_staged_executor() -> StagedJobExecutor:
+    try:
+        queue_size = int(os.getenv(STAGE_QUEUE_ENV, DEFAULT_STAGE_QUEUE))
+    except ValueError:
+        queue_size = DEFAULT_STAGE_QUEUE
+    workers = parse_stage_workers(os.getenv(STAGE_WORKERS_ENV, ""))
+    pipeline = StagedPipeline(workers=workers, queue_size=queue_size)
+    described = ", ".join(f"{s.name}={s.workers}" for s in pipeline.stats())
+    logging.info(f"Started staged pipeline ({described})")
+    return StagedJobExecutor(pipeline)
+
+
+def start_job_executor(workers: int) -> JobExecutor | None:
+    """Start the executor selected by WVT_EXECUTOR; return None in thread mode."""
+    global _executor
+    mode = executor_mode()
+    if mode == "staged":
+        _executor = _start_staged_executor()
+        return _executor
+    if mode != "process":
+        return None
+    try:
+        grace = float(os.getenv(CANCEL_GRACE_ENV, DEFAULT_CANCEL_GRACE_SECONDS))
+    except ValueError:
+        grace = DEFAULT_CANCEL_GRACE_SECONDS
+    models = preload.configured_models()
+    preload.state = preload.PreloadState(models, workers=workers)
+    preload.state.started_at = time.time()
+    process_executor = ProcessJobExecutor(workers=workers, models=models, cancel_grace=grace)
+    process_executor.start()
+    _executor = process_executor
+    logging.info(f"Started {workers} transcription worker process(es)")
+    return _executor
+
+
+def get_job_executor() -> JobExecutor | None:
+    """Return the running executor, or None when jobs run on the scheduler's threads."""
+    return _executor
+
+
+def stage_stats() -> list[StageStats] | None:
+    """Per-stage pool statistics when the staged executor is running."""
+    if isinstance(_executor, StagedJobExecutor):
+        return _executor.stage_stats()
+    return None
+
+
+def shutdown_job_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,359 @@
+"""Indexed transcript history for the web UI.
+
+Finished web jobs are recorded in a small SQLite database next to their
+transcripts (`transcripts/.history.sqlite3`, or `WVT_HISTORY_DB`), together
+with their language, model and original file name. `/api/history` pages
+through it newest first with an opaque cursor, so a request reads at most one
+page of rows however many transcripts have piled up.
+
+Files that reach `transcripts/` some other way (copied in, restored from a
+backup, deleted by hand) are picked up by a rescan. A new index is built
+before its first page is served. After that the rescan runs on a background
+thread, on first use in a process and whenever the directory's mtime differs
+from the one last seen by the index, and requests read the index as it is
+meanwhile. A request therefore costs one `stat`, whatever the history size.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+HISTORY_DB_ENV = "WVT_HISTORY_DB"
+TRANSCRIPTS_DIR = Path("transcripts")
+# Dot-prefixed, so the rescan (which skips hidden files) never lists it.
+HISTORY_DB_NAME = ".history.sqlite3"
+TRANSCRIPT_FORMATS = ("txt", "srt", "vtt")
+DEFAULT_HISTORY_LIMIT = 50
+MAX_HISTORY_LIMIT = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    job_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    formats TEXT NOT NULL,
+    language TEXT,
+    model TEXT,
+    source_name TEXT
+);
+CREATE INDEX IF NOT EXISTS history_created ON history (created_at, job_id);
+CREATE INDEX IF NOT EXISTS history_language ON history (language, created_at);
+CREATE INDEX IF NOT EXISTS history_model ON history (model, created_at);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_COLUMNS = "job_id, created_at, formats, language, model, source_name"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class HistoryEntry:
+    job_id: str
+    created_at: float
+    formats: list[str] = field(default_factory=list)
+    language: str | None = None
+    model: str | None = None
+    source_name: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "date": datetime.fromtimestamp(self.created_at).isoformat(),
+            "formats": self.formats,
+            "language": self.language,
+            "model": self.model,
+            "source_name": self.source_name,
+        }
+
+
+def encode_cursor(entry: HistoryEntry) -> str:
+    return f"{entry.created_at!r}:{entry.job_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    created, sep, job_id = cursor.partition(":")
+    try:
+        if not sep:
+            raise ValueError(cursor)
+        return float(created), job_id
+    except ValueError:
+        raise InvalidCursor(f"Invalid history cursor: {cursor!r}") from None
+
+
+def _scan_transcripts(directory: Path) -> dict[str, tuple[float, list[str]]]:
+    """Group transcript files by job id: {job_id: (earliest mtime, formats)}."""
+    found: dict[str, tuple[float, list[str]]] = {}
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return found
+    for entry in entries:
+        job_id, _, extension = entry.name.rpartition(".")
+        if entry.name.startswith(".") or not job_id or extension not in TRANSCRIPT_FORMATS:
+            continue
+        try:
+            if not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        created, formats = found.get(job_id, (mtime, []))
+        formats.append(extension)
+        found[job_id] = (min(created, mtime), formats)
+    return found
+
+
+class HistoryIndex:
+    """SQLite index of finished transcripts, shared by every worker on the host."""
+
+    def __init__(self, path: str | Path, transcripts_dir: Path = TRANSCRIPTS_DIR) -> None:
+        self.path = Path(path)
+        self.transcripts_dir = transcripts_dir
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread, as in SqliteJobStore.
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._synced = False
+        self._rescan: threading.Thread | None = None
+        self._rescan_lock = threading.Lock()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _entry(row: tuple) -> HistoryEntry:
+        job_id, created_at, formats, language, model, source_name = row
+        return HistoryEntry(
+            job_id=job_id,
+            created_at=created_at,
+            formats=formats.split(",") if formats else [],
+            language=language,
+            model=model,
+            source_name=source_name,
+        )
+
+    def _dir_mtime(self) -> str:
+        try:
+            return str(self.transcripts_dir.stat().st_mtime_ns)
+        except FileNotFoundError:
+            return ""
+
+    def _set_seen_mtime(self, conn: sqlite3.Connection, mtime: str) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('dir_mtime', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (mtime,),
+        )
+
+    def record(self, entry: HistoryEntry) -> None:
+        """Add or replace a finished job; called right after its outputs are written."""
+        conn = self._connect()
+        conn.execute(
+            f"INSERT OR REPLACE INTO history ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                entry.job_id,
+                entry.created_at,
+                ",".join(entry.formats),
+                entry.language,
+                entry.model,
+                entry.source_name,
+            ),
+        )
+        # Our own write changed the directory; don't treat that as a reason to rescan.
+        self._set_seen_mtime(conn, self._dir_mtime())
+
+    def sync(self, force: bool = False) -> bool:
+        """Reconcile with the transcripts directory if it changed behind the index.
+
+        Returns True when a rescan ran.
+        """
+        conn = self._connect()
+        mtime = self._dir_mtime()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dir_mtime'").fetchone()
+        if self._synced and not force and row is not None and row[0] == mtime:
+            return False
+
+        found = _scan_transcripts(self.transcripts_dir)
+        known = {
+            job_id: formats
+            for job_id, formats in conn.execute("SELECT job_id, formats FROM history")
+        }
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for job_id in known.keys() - found.keys():
+                conn.execute("DELETE FROM history WHERE job_id = ?", (job_id,))
+            for job_id, (created_at, formats) in found.items():
+                joined = ",".join(sorted(formats))
+                if job_id not in known:
+                    conn.execute(
+                        "INSERT INTO history (job_id, created_at, formats) VALUES (?, ?, ?)",
+                        (job_id, created_at, joined),
+                    )
+                elif known[job_id] != joined:
+                    conn.execute(
+                        "UPDATE history SET formats = ? WHERE job_id = ?", (joined, job_id)
+                    )
+            self._set_seen_mtime(conn, mtime)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._synced = True
+        logging.info(f"History index rescanned {len(found)} transcript(s)")
+        return True
+
+    def refresh(self) -> None:
+        """Bring the index up to date for a request without scanning on the request path.
+
+        An index that has never been synced is built inline, as it has nothing
+        to serve yet. Otherwise a changed directory starts a background rescan.
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dir_mtime'").fetchone()
+        if row is None:
+            self.sync()
+        elif not self._synced or row[0] != self._dir_mtime():
+            self._start_rescan()
+
+    def _start_rescan(self) -> None:
+        with self._rescan_lock:
+            if self._rescan is not None and self._rescan.is_alive():
+                return
+            self._rescan = threading.Thread(
+                target=self._background_sync, name="wvt-history-rescan", daemon=True
+            )
+            self._rescan.start()
+
+    def _background_sync(self) -> None:
+        try:
+            self.sync()
+        except Exception:
+            logging.exception("History index rescan failed")
+
+    def wait_for_rescan(self, timeout: float | None = None) -> None:
+        """Wait for a background rescan to finish, if one is running."""
+        with self._rescan_lock:
+            rescan = self._rescan
+        if rescan is not None:
+            rescan.join(timeout)
+
+    def page(
+        self,
+        limit: int = DEFAULT_HISTORY_LIMIT,
+        before: str | None = None,
+        language: str | None = None,
+        model: str | None = None,
+        source: str | None = None,
+    ) -> tuple[list[HistoryEntry], str | None]:
+        """Return up to `limit` entries older than the `before` cursor, newest first.
+
+        The second value is the cursor for the next page, or None on the last page.
+        `source` matches a substring of the original file name, case-insensitively.
+        """
+        limit = max(1, min(limit, MAX_HISTORY_LIMIT))
+        clauses: list[str] = []
+        params: list[Any] = []
+        if before:
+            created_at, job_id = decode_cursor(before)
+            clauses.append("(created_at, job_id) < (?, ?)")
+            params += [created_at, job_id]
+        if language:
+            clauses.append("language = ?")
+            params.append(language)
+        if model:
+            clauses.append("model = ?")
+            params.append(model)
+        if source:
+            escaped = source.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("source_name LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = (
+            self._connect()
+            .execute(
+                f"SELECT {_COLUMNS} FROM history {where}"
+                "ORDER BY created_at DESC, job_id DESC LIMIT ?",
+                (*params, limit + 1),
+            )
+            .fetchall()
+        )
+        entries = [self._entry(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(entries[-1]) if len(rows) > limit else None
+        return entries, next_cursor
+
+    def close(self) -> None:
+        self.wait_for_rescan()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+_default_index: HistoryIndex | None = None
+_default_index_lock = threading.Lock()
+
+
+def get_history_index() -> HistoryIndex:
+    """Return the process-wide history index, opened on first use."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            path = os.getenv(HISTORY_DB_ENV) or TRANSCRIPTS_DIR / HISTORY_DB_NAME
+            _default_index = HistoryIndex(path)
+        return _default_index
+
+
+def reset_history_index() -> None:
+    """Close the process-wide index; the next use reopens it (used by tests)."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is not None:
+            _default_index.close()
+            _default_index = None
+
+
+def record_history(
+    job_id: str,
+    output_files: dict[str, Path],
+    language: str | None,
+    model: str | None,
+    source_name: str | None,
+) -> None:
+    """Index a finished job; a failure is logged and never fails the job."""
+    if not output_files:
+        return
+    entry = HistoryEntry(
+        job_id=job_id,
+        created_at=time.time(),
+        formats=sorted(output_files),
+        language=language,
+        model=model,
+        source_name=source_name,
+    )
+    try:
+        get_history_index().record(entry)
+    except Exception:
+        logging.exception(f"Failed to index transcript history for job {job_id}")
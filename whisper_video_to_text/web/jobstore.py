@@ -0,0 +1,347 @@
+"""Persistence for web job state.
+
+`progress.py` keeps live jobs (and their SSE queues) in memory; a job store is
+the durable copy behind it. The default `MemoryJobStore` only views that dict,
+which is enough for a single worker. `SqliteJobStore` writes every update to a
+WAL-mode SQLite database so several uvicorn workers on one host share job state
+and jobs survive a restart: ones interrupted mid-run are marked as errors
+instead of staying "pending" forever.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from whisper_video_to_text.web.progress import JobState
+
+# "memory" (default) or "sqlite".
+JOB_STORE_ENV = "WVT_JOB_STORE"
+JOB_DB_ENV = "WVT_JOB_DB"
+DEFAULT_JOB_DB = Path("transcripts") / "jobs.sqlite3"
+
+TERMINAL_STATUSES = frozenset({"complete", "error", "cancelled"})
+ORPHANED_MESSAGE = "Interrupted: the server stopped before this job finished"
+
+# Identifies the process that last wrote a job, so a restart can tell its own
+# dead jobs from ones another live worker is still running. The per-start token
+# tells a restarted process from its predecessor when both have the same PID, as
+# uvicorn running as PID 1 in a restarted container does.
+BOOT_ID = uuid.uuid4().hex
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{BOOT_ID}"
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    job_id: str
+    status: str
+    progress: int
+    message: str
+    result: dict | None
+    cancel_requested: bool
+    owner: str | None
+    created_at: float
+    updated_at: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_orphan(owner: str | None) -> bool:
+    """True if owner was a process on this host that no longer exists."""
+    if not owner:
+        return True
+    # "host:pid:boot_id"; rows written before the boot ID was added lack it.
+    host, _, rest = owner.partition(":")
+    pid, _, boot_id = rest.partition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        # Our PID, but only ours if this very process wrote it.
+        return boot_id != BOOT_ID
+    return not _pid_alive(int(pid))
+
+
+class JobStore(ABC):
+    """Interface for job persistence; see MemoryJobStore and SqliteJobStore."""
+
+    # True when other processes can see jobs through this store.
+    shared = False
+
+    @abstractmethod
+    def save(self, job_id: str, job: JobState) -> None: ...
+
+    @abstractmethod
+    def load(self, job_id: str) -> JobRecord | None: ...
+
+    @abstractmethod
+    def request_cancel(self, job_id: str) -> bool:
+        """Flag a non-terminal job for cancellation. Returns False if unknown or terminal."""
+
+    @abstractmethod
+    def cancel_requested(self, job_id: str) -> bool: ...
+
+    @abstractmethod
+    def list_jobs(self, status: str | None = None, limit: int = 100) -> list[JobRecord]:
+        """Return jobs newest first, optionally only those with `status`."""
+
+    @abstractmethod
+    def delete_finished_before(self, cutoff: float) -> int:
+        """Delete terminal jobs last updated before cutoff; return how many were removed."""
+
+    @abstractmethod
+    def recover_orphans(self) -> int:
+        """Mark unfinished jobs whose owning process is gone as errors; return the count."""
+
+    def close(self) -> None:  # noqa: B027 - optional; only stores holding resources override it
+        pass
+
+
+def _record_from_state(job_id: str, job: JobState) -> JobRecord:
+    return JobRecord(
+        job_id=job_id,
+        status=job.status,
+        progress=job.progress,
+        message=job.message,
+        result=job.result,
+        cancel_requested=job.cancel_requested,
+        owner=OWNER,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+class MemoryJobStore(JobStore):
+    """Job store over progress.py's in-process dict; nothing outlives the process."""
+
+    def __init__(self, jobs: dict[str, JobState]) -> None:
+        self.jobs = jobs
+
+    def save(self, job_id: str, job: JobState) -> None:
+        # The dict already holds the live object.
+        pass
+
+    def load(self, job_id: str) -> JobRecord | None:
+        job = self.jobs.get(job_id)
+        return _record_from_state(job_id, job) if job else None
+
+    def request_cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if not job or job.status in TERMINAL_STATUSES:
+            return False
+        job.cancel_requested = True
+        return True
+
+    def cancel_requested(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        return bool(job and job.cancel_requested)
+
+    def list_jobs(self, status: str | None = None, limit: int = 100) -> list[JobRecord]:
+        records = [
+            _record_from_state(job_id, job)
+            for job_id, job in list(self.jobs.items())
+            if status is None or job.status == status
+        ]
+        # Newest insertion first, so jobs created in the same clock tick keep their order.
+        records.reverse()
+        records.sort(key=lambda record: record.created_at, reverse=True)
+        return records[:limit]
+
+    def delete_finished_before(self, cutoff: float) -> int:
+        expired = [
+            job_id
+            for job_id, job in list(self.jobs.items())
+            if job.status in TERMINAL_STATUSES and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            self.jobs.pop(job_id, None)
+        return len(expired)
+
+    def recover_orphans(self) -> int:
+        return 0
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at);
+"""
+
+_COLUMNS = "id, status, progress, message, result, cancel_requested, owner, created_at, updated_at"
+_TERMINAL_SQL = ", ".join(f"'{status}'" for status in sorted(TERMINAL_STATUSES))
+
+
+class SqliteJobStore(JobStore):
+    """Job store in a WAL-mode SQLite database shared by every worker on the host."""
+
+    shared = True
+
+    def __init__(self, path: str | Path = DEFAULT_JOB_DB) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # sqlite3 connections are not shareable across threads; jobs are updated
+        # from the threadpool and read from the event loop.
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _record(row: tuple) -> JobRecord:
+        job_id, status, progress, message, result, cancel, owner, created, updated = row
+        return JobRecord(
+            job_id=job_id,
+            status=status,
+            progress=progress,
+            message=message,
+            result=json.loads(result) if result else None,
+            cancel_requested=bool(cancel),
+            owner=owner,
+            created_at=created,
+            updated_at=updated,
+        )
+
+    def save(self, job_id: str, job: JobState) -> None:
+        result = json.dumps(job.result) if job.result is not None else None
+        # cancel_requested is left alone on update: another worker may have set it.
+        self._connect().execute(
+            f"INSERT INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET status = excluded.status, "
+            "progress = excluded.progress, message = excluded.message, "
+            "result = excluded.result, owner = excluded.owner, "
+            "updated_at = excluded.updated_at, "
+            "cancel_requested = MAX(jobs.cancel_requested, excluded.cancel_requested)",
+            (
+                job_id,
+                job.status,
+                job.progress,
+                job.message,
+                result,
+                int(job.cancel_requested),
+                OWNER,
+                job.created_at,
+                job.updated_at,
+            ),
+        )
+
+    def load(self, job_id: str) -> JobRecord | None:
+        row = (
+            self._connect()
+            .execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return self._record(row) if row else None
+
+    def request_cancel(self, job_id: str) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE jobs SET cancel_requested = 1 "
+            f"WHERE id = ? AND status NOT IN ({_TERMINAL_SQL})",
+            (job_id,),
+        )
+        return cursor.rowcount > 0
+
+    def cancel_requested(self, job_id: str) -> bool:
+        row = (
+            self._connect()
+            .execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return bool(row and row[0])
+
+    def list_jobs(self, status: str | None = None, limit: int = 100) -> list[JobRecord]:
+        if status is None:
+            rows = self._connect().execute(
+                f"SELECT {_COLUMNS} FROM jobs ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                (limit,),
+            )
+        else:
+            rows = self._connect().execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE status = ? "
+                "ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                (status, limit),
+            )
+        return [self._record(row) for row in rows.fetchall()]
+
+    def delete_finished_before(self, cutoff: float) -> int:
+        cursor = self._connect().execute(
+            f"DELETE FROM jobs WHERE status IN ({_TERMINAL_SQL}) AND updated_at < ?",
+            (cutoff,),
+        )
+        return cursor.rowcount
+
+    def recover_orphans(self) -> int:
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT id, owner FROM jobs WHERE status NOT IN ({_TERMINAL_SQL})"
+        ).fetchall()
+        orphans = [job_id for job_id, owner in rows if _is_orphan(owner)]
+        now = time.time()
+        for job_id in orphans:
+            conn.execute(
+                "UPDATE jobs SET status = 'error', message = ?, updated_at = ? WHERE id = ?",
+                (ORPHANED_MESSAGE, now, job_id),
+            )
+        if orphans:
+            logging.warning(f"Marked {len(orphans)} interrupted job(s) as failed")
+        return len(orphans)
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def store_from_env(jobs: dict[str, JobState]) -> JobStore:
+    """Build the job store selected by WVT_JOB_STORE (memory or sqlite)."""
+    kind = os.getenv(JOB_STORE_ENV, "memory").strip().lower()
+    if kind == "sqlite":
+        return SqliteJobStore(os.getenv(JOB_DB_ENV) or DEFAULT_JOB_DB)
+    if kind not in ("", "memory"):
+        logging.warning(f"Unknown {JOB_STORE_ENV}={kind!r}; using the in-memory job store")
+    return MemoryJobStore(jobs)
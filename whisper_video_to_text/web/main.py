@@ -1,9 +1,13 @@
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
 import uvicorn
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
@@ -11,13 +15,31 @@ from whisper_video_to_text.convert import (
     supported_media_accept_attribute,
     supported_media_extensions_display,
 )
+from whisper_video_to_text.models import get_model_cache
+from whisper_video_to_text.web import executor, metrics, preload, progress
+from whisper_video_to_text.web.scheduler import get_scheduler
 from whisper_video_to_text.web.views import router as web_router
 
 # Get the directory where this file is located
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
 
-app = FastAPI(title="Whisper Video to Text Web")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the job store and start warming Whisper models without blocking startup."""
+    progress.configure_store()
+    # Worker processes load the preload models themselves; otherwise load them here.
+    if executor.executor_mode() != "process":
+        preload.start_preload()
+    executor.start_job_executor(workers=get_scheduler().slots)
+    try:
+        yield
+    finally:
+        executor.shutdown_job_executor()
+
+
+app = FastAPI(title="Whisper Video to Text Web", lifespan=lifespan)
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
@@ -46,6 +68,79 @@ async def index(request: Request) -> HTMLResponse:
     )
 
 
+@app.get("/healthz")
+async def healthz() -> JSONResponse:
+    """Liveness probe: the server process is up and serving requests."""
+    return JSONResponse({"status": "ok"})
+
+
+@app.get("/healthz/ready")
+async def healthz_ready() -> JSONResponse:
+    """Readiness probe: 200 once every WVT_PRELOAD_MODELS entry is resident, else 503."""
+    snapshot = preload.state.snapshot()
+    status_code = 200 if snapshot["status"] == "ready" else 503
+    return JSONResponse(snapshot, status_code=status_code)
+
+
+def _scheduler_samples(field: str) -> dict[tuple[str, ...], float]:
+    return {(): getattr(get_scheduler().stats(), field)}
+
+
+def _model_cache_samples(field: str) -> dict[tuple[str, ...], float]:
+    return {(): getattr(get_model_cache().stats(), field)}
+
+
+def _stage_samples(field: str) -> Optional[dict[tuple[str, ...], float]]:
+    stats = executor.stage_stats()
+    if stats is None:
+        return None
+    return {(stage.name,): getattr(stage, field) for stage in stats}
+
+
+metrics.add_collector(
+    "wvt_queue_depth", "Jobs waiting for a scheduler slot.", partial(_scheduler_samples, "queued")
+)
+metrics.add_collector(
+    "wvt_jobs_running", "Jobs holding a scheduler slot.", partial(_scheduler_samples, "running")
+)
+metrics.add_collector(
+    "wvt_jobs_rejected_total",
+    "Submissions refused because the queue was full.",
+    partial(_scheduler_samples, "rejected"),
+    type_name="counter",
+)
+metrics.add_collector(
+    "wvt_model_cache_hits_total",
+    "Whisper model cache hits.",
+    partial(_model_cache_samples, "hits"),
+    type_name="counter",
+)
+metrics.add_collector(
+    "wvt_model_cache_misses_total",
+    "Whisper model cache misses (model loads).",
+    partial(_model_cache_samples, "misses"),
+    type_name="counter",
+)
+metrics.add_collector(
+    "wvt_stage_queue_depth",
+    "Jobs waiting for each staged-pipeline stage.",
+    partial(_stage_samples, "queued"),
+    labels=("stage",),
+)
+metrics.add_collector(
+    "wvt_stage_busy_workers",
+    "Busy workers of each staged-pipeline stage.",
+    partial(_stage_samples, "busy"),
+    labels=("stage",),
+)
+
+
+@app.get("/metrics")
+async def metrics_endpoint() -> Response:
+    """Prometheus text exposition of job, queue, stage, cache, upload and SSE metrics."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 app.include_router(web_router)
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+"""Prometheus text-format metrics for the web service, without extra dependencies.
+
+Counters, gauges and histograms live in process memory and are updated from
+the job lifecycle in `web/progress.py`, the upload handlers and the SSE
+stream. Each metric has its own lock, held only while a value is changed or
+copied, so a scrape never waits on a request and never touches the disk.
+Values that other components already track (scheduler queue, model cache,
+stage pools) are read through callbacks at scrape time.
+
+Metrics are per process: with several uvicorn workers, scrape each one or
+aggregate by instance. With `WVT_EXECUTOR=process`, model cache counters live
+in the worker processes and are not reported here.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Job and stage durations range from sub-second cache hits to hour-long files.
+DURATION_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value; the name should end in `_total`."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self._header()
+        if not self.labels and not values:
+            values = [((), 0.0)]
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with `_bucket`, `_sum` and `_count` series."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self._series: dict[LabelValues, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), None)
+        with self._lock:
+            counts, total = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[len(self.buckets) if index is None else index] += 1
+            self._series[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted(
+                (key, (list(counts), total)) for key, (counts, total) in self._series.items()
+            )
+        lines = self._header()
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels((*self.labels, "le"), (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Counter or gauge whose samples are read from `collect()` at scrape time.
+
+    `collect` returns {label values: value}, or None when there is nothing to report.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        collect: Callable[[], dict[LabelValues, float] | None],
+        labels: Sequence[str] = (),
+        type_name: str = "gauge",
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.collect = collect
+        self.type_name = type_name
+
+    def render(self) -> list[str]:
+        values = self.collect()
+        if values is None:
+            return []
+        lines = self._header()
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> Any:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+jobs_created: Counter = registry.register(
+    Counter("wvt_jobs_created_total", "Jobs created by this process.")
+)
+jobs_by_status: Gauge = registry.register(
+    Gauge("wvt_jobs", "Jobs held by this process, by current status.", labels=("status",))
+)
+jobs_finished: Counter = registry.register(
+    Counter("wvt_jobs_finished_total", "Jobs that reached a final status.", labels=("status",))
+)
+job_duration: Histogram = registry.register(
+    Histogram(
+        "wvt_job_duration_seconds",
+        "Time from job creation to its final status.",
+        labels=("status",),
+    )
+)
+stage_duration: Histogram = registry.register(
+    Histogram(
+        "wvt_stage_duration_seconds",
+        "Wall time of each pipeline step of completed jobs.",
+        labels=("stage",),
+    )
+)
+audio_seconds: Counter = registry.register(
+    Counter("wvt_audio_seconds_total", "Seconds of audio transcribed by Whisper.")
+)
+upload_bytes: Counter = registry.register(
+    Counter("wvt_upload_bytes_total", "Upload bytes received.", labels=("kind",))
+)
+sse_connections: Gauge = registry.register(
+    Gauge("wvt_sse_connections", "Open progress event streams.")
+)
+
+
+def record_job_status(old: str | None, new: str, age_seconds: float, terminal: bool) -> None:
+    """Move a job between status gauges; a final status also counts it as finished."""
+    if old is None:
+        jobs_created.inc()
+    else:
+        jobs_by_status.dec(status=old)
+    jobs_by_status.inc(status=new)
+    if terminal:
+        jobs_finished.inc(status=new)
+        job_duration.observe(age_seconds, status=new)
+
+
+def record_job_forgotten(status: str | None) -> None:
+    if status is not None:
+        jobs_by_status.dec(status=status)
+
+
+def record_result(result: dict[str, Any]) -> None:
+    """Observe the step timings carried in a job result (see `pipeline.render_stage`)."""
+    for span in result.get("spans") or ():
+        stage_duration.observe(span["wall_seconds"], stage=span["name"])
+        if span["name"] == "transcribe" and span.get("audio_seconds"):
+            audio_seconds.inc(span["audio_seconds"])
+
+
+def add_collector(
+    name: str,
+    help_text: str,
+    collect: Callable[[], dict[LabelValues, float] | None],
+    labels: Iterable[str] = (),
+    type_name: str = "gauge",
+) -> None:
+    """Report a value owned by another component, read when /metrics is scraped."""
+    registry.register(CallbackMetric(name, help_text, collect, tuple(labels), type_name))
+
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+from whisper_video_to_text.models import load_model
+
+# Comma-separated Whisper models to load at startup, e.g. "base,small".
+PRELOAD_MODELS_ENV = "WVT_PRELOAD_MODELS"
+
+
+class PreloadState:
+    def __init__(self, models: tuple[str, ...] = (), workers: int = 1) -> None:
+        self.models: tuple[str, ...] = models
+        # Worker processes that must each report a model before it counts as loaded.
+        self.workers = max(1, workers)
+        self.loaded: list[str] = []
+        self.reported: dict[str, set[Any]] = {}
+        self.failed: dict[str, str] = {}
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """True once every configured model is resident."""
+        with self.lock:
+            return len(self.loaded) == len(self.models)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self.lock:
+            pending = [m for m in self.models if m not in self.loaded and m not in self.failed]
+            if len(self.loaded) == len(self.models):
+                status = "ready"
+            elif self.failed and not pending:
+                status = "failed"
+            else:
+                status = "loading"
+            return {
+                "status": status,
+                "models": list(self.models),
+                "loaded": list(self.loaded),
+                "pending": pending,
+                "failed": dict(self.failed),
+            }
+
+
+state = PreloadState()
+
+
+def configured_models() -> tuple[str, ...]:
+    """Return the de-duplicated model list from WVT_PRELOAD_MODELS, in order."""
+    raw = os.getenv(PRELOAD_MODELS_ENV, "")
+    models: list[str] = []
+    for name in raw.split(","):
+        name = name.strip()
+        if name and name not in models:
+            models.append(name)
+    return tuple(models)
+
+
+def _preload(target: PreloadState) -> None:
+    for model_name in target.models:
+        try:
+            load_model(model_name)
+        except Exception as e:
+            logging.exception(f"Failed to preload Whisper model '{model_name}'")
+            with target.lock:
+                target.failed[model_name] = str(e)
+            continue
+        with target.lock:
+            target.loaded.append(model_name)
+    with target.lock:
+        target.finished_at = time.time()
+    logging.info(f"Model preload finished: {target.snapshot()['status']}")
+
+
+def record_loaded(loaded: list[str], failed: dict[str, str], worker: Any = None) -> None:
+    """Record models loaded elsewhere (e.g. by a worker process) in the shared state.
+
+    A model counts as loaded once `state.workers` different workers have
+    reported it, so readiness waits for the whole pool.
+    """
+    with state.lock:
+        for model_name in loaded:
+            if model_name not in state.models or model_name in state.loaded:
+                continue
+            reporters = state.reported.setdefault(model_name, set())
+            reporters.add(worker)
+            if len(reporters) >= state.workers:
+                state.loaded.append(model_name)
+        for model_name, error in failed.items():
+            if model_name not in state.loaded:
+                state.failed[model_name] = error
+        if len(state.loaded) + len(state.failed) >= len(state.models):
+            state.finished_at = time.time()
+
+
+def start_preload(models: tuple[str, ...] | None = None) -> threading.Thread | None:
+    """Reset preload state and load models on a daemon thread.
+
+    Returns the thread, or None when there is nothing to preload.
+    """
+    global state
+    state = PreloadState(configured_models() if models is None else models)
+    state.started_at = time.time()
+    if not state.models:
+        state.finished_at = state.started_at
+        return None
+
+    logging.info(f"Preloading Whisper models: {', '.join(state.models)}")
+    thread = threading.Thread(target=_preload, args=(state,), name="wvt-model-preload", daemon=True)
+    thread.start()
+    return thread
@@ -1,16 +1,37 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
+import time
 import uuid
 from collections.abc import AsyncIterator
 from typing import Optional
 
-# In-memory job state. NOTE: Only works with single-worker deployment.
-# For multi-worker, migrate to Redis or database-backed storage.
+from whisper_video_to_text.web import metrics
+from whisper_video_to_text.web.events import HEARTBEAT_SECONDS, JobEventLog, ProgressEvent
+from whisper_video_to_text.web.jobstore import (
+    TERMINAL_STATUSES,
+    JobRecord,
+    JobStore,
+    MemoryJobStore,
+    store_from_env,
+)
+
+# Live jobs started by this process, with their SSE event logs. Every change is
+# written through to `store`; with the SQLite store, jobs started by other
+# workers are read from there.
 jobs: dict[str, JobState] = {}
+store: JobStore = MemoryJobStore(jobs)
 
+# Finished jobs are forgotten after this many hours.
+JOB_RETENTION_HOURS_ENV = "WVT_JOB_RETENTION_HOURS"
+DEFAULT_RETENTION_HOURS = 24.0
+PRUNE_INTERVAL_SECONDS = 60.0
+# How often an SSE stream for another worker's job re-reads the store.
+REMOTE_POLL_SECONDS = 0.5
 
-TERMINAL_STATUSES = frozenset({"complete", "error", "cancelled"})
+_last_prune = 0.0
 
 
 class JobState:
@@ -19,35 +40,137 @@ class JobState:
         self.status: str = "pending"
         self.message: str = ""
         self.result: Optional[dict] = None  # noqa: UP045
-        self.queue: asyncio.Queue = asyncio.Queue()
+        self.events: JobEventLog = JobEventLog()
         self.cancel_requested: bool = False
+        self.created_at: float = time.time()
+        self.updated_at: float = self.created_at
+        # False for snapshots of jobs running in another worker process.
+        self.local: bool = True
+        # Status this job is counted under in the metrics, None until first saved.
+        self.metrics_status: Optional[str] = None  # noqa: UP045
+
+    @classmethod
+    def from_record(cls, record: JobRecord) -> JobState:
+        job = cls()
+        job.progress = record.progress
+        job.status = record.status
+        job.message = record.message
+        job.result = record.result
+        job.cancel_requested = record.cancel_requested
+        job.created_at = record.created_at
+        job.updated_at = record.updated_at
+        job.local = False
+        return job
+
+
+def configure_store(new_store: Optional[JobStore] = None) -> JobStore:  # noqa: UP045
+    """Install the job store (from WVT_JOB_STORE by default) and recover orphaned jobs."""
+    global store
+    store.close()
+    store = new_store if new_store is not None else store_from_env(jobs)
+    store.recover_orphans()
+    return store
+
+
+def _persist(job_id: str, job: JobState) -> None:
+    job.updated_at = time.time()
+    if job.local and job.status != job.metrics_status:
+        metrics.record_job_status(
+            job.metrics_status,
+            job.status,
+            job.updated_at - job.created_at,
+            terminal=job.status in TERMINAL_STATUSES,
+        )
+        job.metrics_status = job.status
+    try:
+        store.save(job_id, job)
+    except Exception:
+        # The live job keeps running; only its durable copy is stale.
+        logging.exception(f"Failed to persist state for job {job_id}")
+
+
+def _retention_seconds() -> float:
+    try:
+        hours = float(os.getenv(JOB_RETENTION_HOURS_ENV, DEFAULT_RETENTION_HOURS))
+    except ValueError:
+        hours = DEFAULT_RETENTION_HOURS
+    return hours * 3600
+
+
+def prune_jobs(now: Optional[float] = None) -> int:  # noqa: UP045
+    """Forget finished jobs older than the retention window; return how many were dropped."""
+    cutoff = (now or time.time()) - _retention_seconds()
+    expired = [
+        job_id
+        for job_id, job in list(jobs.items())
+        if job.status in TERMINAL_STATUSES and job.updated_at < cutoff
+    ]
+    for job_id in expired:
+        job = jobs.pop(job_id, None)
+        if job is not None:
+            metrics.record_job_forgotten(job.metrics_status)
+    try:
+        return max(len(expired), store.delete_finished_before(cutoff))
+    except Exception:
+        logging.exception("Failed to prune finished jobs")
+        return len(expired)
 
 
 def create_job() -> str:
     """Create a new job and return its ID."""
+    global _last_prune
+    now = time.time()
+    if now - _last_prune > PRUNE_INTERVAL_SECONDS:
+        _last_prune = now
+        prune_jobs(now)
     job_id = str(uuid.uuid4())
-    jobs[job_id] = JobState()
+    job = JobState()
+    jobs[job_id] = job
+    _persist(job_id, job)
     return job_id
 
 
 def get_job(job_id: str) -> Optional[JobState]:  # noqa: UP045
-    """Get a job by ID, or None if not found."""
-    return jobs.get(job_id)
+    """Get a job by ID, or None if not found.
+
+    Jobs owned by another worker come back as read-only snapshots from the store.
+    """
+    job = jobs.get(job_id)
+    if job is not None or not store.shared:
+        return job
+    record = store.load(job_id)
+    return JobState.from_record(record) if record else None
+
+
+def list_jobs(status: Optional[str] = None, limit: int = 100) -> list[JobRecord]:  # noqa: UP045
+    """Return recent jobs from the store, newest first."""
+    return store.list_jobs(status=status, limit=limit)
 
 
 def request_cancel_sync(job_id: str) -> bool:
     """Mark a job as cancel-requested. Returns False if job is unknown or terminal."""
-    job = get_job(job_id)
-    if not job or job.status in TERMINAL_STATUSES:
+    job = jobs.get(job_id)
+    if job is None:
+        return store.shared and store.request_cancel(job_id)
+    if job.status in TERMINAL_STATUSES:
         return False
     job.cancel_requested = True
+    _persist(job_id, job)
     return True
 
 
 def is_cancel_requested(job_id: str) -> bool:
     """Return True if cancellation has been requested for this job."""
-    job = get_job(job_id)
-    return bool(job and job.cancel_requested)
+    job = jobs.get(job_id)
+    if job is not None and job.cancel_requested:
+        return True
+    if not store.shared:
+        return False
+    # The cancel request may have been handled by a different worker.
+    requested = store.cancel_requested(job_id)
+    if requested and job is not None:
+        job.cancel_requested = True
+    return requested
 
 
 def set_cancelled_sync(job_id: str, message: str = "Cancelled by user") -> None:
@@ -57,54 +180,40 @@ def set_cancelled_sync(job_id: str, message: str = "Cancelled by user") -> None:
         return
     job.status = "cancelled"
     job.message = message
-    update = {"progress": job.progress, "status": "cancelled", "message": message}
-    try:
-        loop = asyncio.get_running_loop()
-        loop.call_soon_threadsafe(job.queue.put_nowait, update)
-    except RuntimeError:
-        job.queue.put_nowait(update)
+    _persist(job_id, job)
+    job.events.publish({"progress": job.progress, "status": "cancelled", "message": message})
 
 
 async def update_progress(job_id: str, progress: int, status: str, message: str = "") -> None:
     """Update job progress (async version for use from async context)."""
-    job = get_job(job_id)
-    if job:
-        job.progress = progress
-        job.status = status
-        job.message = message
-        await job.queue.put({"progress": progress, "status": status, "message": message})
+    update_progress_sync(job_id, progress, status, message)
 
 
 def update_progress_sync(job_id: str, progress: int, status: str, message: str = "") -> None:
-    """Update job progress (sync version for use from background threads).
-
-    This creates a new event loop to safely put updates on the async queue
-    from a synchronous thread context.
-    """
+    """Update job progress; safe to call from background threads."""
     job = get_job(job_id)
     if job:
         job.progress = progress
         job.status = status
         job.message = message
-        # Use call_soon_threadsafe or create a loop for thread-safe queue access
-        try:
-            loop = asyncio.get_running_loop()
-            loop.call_soon_threadsafe(
-                job.queue.put_nowait,
-                {"progress": progress, "status": status, "message": message},
-            )
-        except RuntimeError:
-            # No running loop - use put_nowait directly (safe if queue is empty)
-            job.queue.put_nowait({"progress": progress, "status": status, "message": message})
+        _persist(job_id, job)
+        job.events.publish({"progress": progress, "status": status, "message": message})
 
 
 async def set_result(job_id: str, result: dict) -> None:
     """Set the final result for a job (async version)."""
+    set_result_sync(job_id, result)
+
+
+def set_result_sync(job_id: str, result: dict) -> None:
+    """Set the final result for a job; safe to call from background threads."""
     job = get_job(job_id)
     if job:
         job.result = result
         job.status = "complete"
-        await job.queue.put(
+        _persist(job_id, job)
+        metrics.record_result(result)
+        job.events.publish(
             {
                 "progress": 100,
                 "status": "complete",
@@ -114,32 +223,65 @@ async def set_result(job_id: str, result: dict) -> None:
         )
 
 
-def set_result_sync(job_id: str, result: dict) -> None:
-    """Set the final result for a job (sync version for background threads)."""
-    job = get_job(job_id)
-    if job:
-        job.result = result
-        job.status = "complete"
-        update = {
-            "progress": 100,
-            "status": "complete",
-            "message": "Transcription complete",
-            "result": result,
-        }
-        try:
-            loop = asyncio.get_running_loop()
-            loop.call_soon_threadsafe(job.queue.put_nowait, update)
-        except RuntimeError:
-            job.queue.put_nowait(update)
-
+async def progress_events(
+    job_id: str,
+    last_event_id: Optional[int] = None,  # noqa: UP045
+    heartbeat: Optional[float] = HEARTBEAT_SECONDS,  # noqa: UP045
+) -> AsyncIterator[ProgressEvent]:
+    """Stream a job's progress events, resuming after `last_event_id` when given.
 
-async def progress_stream(job_id: str) -> AsyncIterator[dict]:
-    """Stream progress updates for a job."""
+    A new subscriber to a job that has already finished gets its final state
+    straight away; a reconnecting one gets the events it missed first.
+    """
     job = get_job(job_id)
     if not job:
         return
+    metrics.sse_connections.inc()
+    try:
+        if not job.local:
+            # Another worker owns the job's event log; follow its state instead.
+            async for update in _remote_progress_stream(job_id, job):
+                yield ProgressEvent(None, update)
+            return
+        if job.status in TERMINAL_STATUSES:
+            missed = job.events.since(last_event_id) if last_event_id is not None else []
+            for event_id, update in missed or job.events.latest():
+                yield ProgressEvent(event_id, update)
+            return
+        async for event in job.events.subscribe(
+            after=last_event_id or 0, until=TERMINAL_STATUSES, heartbeat=heartbeat
+        ):
+            yield event
+    finally:
+        metrics.sse_connections.dec()
+
+
+async def progress_stream(job_id: str) -> AsyncIterator[dict]:
+    """Stream progress updates for a job, without event IDs or keep-alives."""
+    async for event in progress_events(job_id, heartbeat=None):
+        if event.update is not None:
+            yield event.update
+
+
+def _update_from_state(job: JobState) -> dict:
+    update = {"progress": job.progress, "status": job.status, "message": job.message}
+    if job.status == "complete" and job.result is not None:
+        update["result"] = job.result
+    return update
+
+
+async def _remote_progress_stream(job_id: str, job: JobState) -> AsyncIterator[dict]:
+    """Follow a job running in another worker by polling the shared store."""
+    last: Optional[dict] = None  # noqa: UP045
     while True:
-        update = await job.queue.get()
-        yield update
-        if update.get("status") in TERMINAL_STATUSES:
+        update = _update_from_state(job)
+        if update != last:
+            yield update
+            last = update
+        if job.status in TERMINAL_STATUSES:
+            break
+        await asyncio.sleep(REMOTE_POLL_SECONDS)
+        record = store.load(job_id)
+        if record is None:
             break
+        job = JobState.from_record(record)
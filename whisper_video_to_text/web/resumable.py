@@ -0,0 +1,272 @@
+"""Resumable chunked uploads.
+
+A single multipart POST to /api/transcribe restarts from zero when the
+connection drops. This protocol splits an upload into byte ranges instead:
+
+1. `POST /api/uploads` with `{filename, size}` creates a session. The target
+   file `uploads/{upload_id}{suffix}.part` is preallocated to its full size.
+2. `PUT /api/uploads/{upload_id}` with `Content-Range: bytes start-end/size`
+   writes one chunk at its offset. Chunks may arrive in any order and in
+   parallel.
+3. `GET /api/uploads/{upload_id}` reports which ranges have arrived, so a
+   client can resume by sending only the missing ones.
+4. `POST /api/uploads/{upload_id}/finalize` moves the completed file to
+   `uploads/{job_id}{suffix}` and queues the transcription job.
+
+Each stored chunk is recorded as an empty marker file named `{start}-{end}` in
+the session directory. Markers are created only after their bytes are
+written, so the received ranges stay correct across workers and restarts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+from whisper_video_to_text.convert import SUPPORTED_MEDIA_EXTENSIONS
+from whisper_video_to_text.web import metrics
+from whisper_video_to_text.web.uploads import (
+    UPLOAD_DIR,
+    UploadError,
+    unsupported_extension_message,
+)
+
+SESSION_HOURS_ENV = "WVT_UPLOAD_SESSION_HOURS"
+DEFAULT_SESSION_HOURS = 24.0
+# Largest file a session may reserve, in MB; 0 disables the limit.
+MAX_UPLOAD_MB_ENV = "WVT_MAX_UPLOAD_MB"
+DEFAULT_MAX_UPLOAD_MB = 8192
+# Chunk size suggested to clients; large enough to amortize request overhead,
+# small enough that a retry wastes little.
+CHUNK_SIZE = 8 * 1024 * 1024
+# Largest single PUT the server accepts.
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+SESSIONS_DIRNAME = ".sessions"
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+_MARKER_RE = re.compile(r"^(\d+)-(\d+)$")
+
+
+class UploadNotFound(UploadError):
+    """The upload session does not exist or has expired."""
+
+
+class UploadTooLarge(UploadError):
+    """The announced size is over the configured limit or the free disk space."""
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    filename: str
+    suffix: str
+    size: int
+    created_at: float
+
+    def session_dir(self, upload_dir: Path = UPLOAD_DIR) -> Path:
+        return upload_dir / SESSIONS_DIRNAME / self.upload_id
+
+    def data_path(self, upload_dir: Path = UPLOAD_DIR) -> Path:
+        return upload_dir / f"{self.upload_id}{self.suffix}.part"
+
+
+def session_ttl_seconds() -> float:
+    try:
+        return float(os.getenv(SESSION_HOURS_ENV, DEFAULT_SESSION_HOURS)) * 3600
+    except ValueError:
+        return DEFAULT_SESSION_HOURS * 3600
+
+
+def max_upload_bytes() -> int:
+    try:
+        return int(float(os.getenv(MAX_UPLOAD_MB_ENV, DEFAULT_MAX_UPLOAD_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_UPLOAD_MB * 1024 * 1024
+
+
+def parse_content_range(header: str | None) -> tuple[int, int, int]:
+    """Parse `bytes start-end/size` into (start, end_exclusive, size)."""
+    match = _CONTENT_RANGE_RE.match((header or "").strip())
+    if not match:
+        raise UploadError("Content-Range must look like 'bytes start-end/size'")
+    start, last, size = (int(g) for g in match.groups())
+    if last < start:
+        raise UploadError("Content-Range end is before its start")
+    return start, last + 1, size
+
+
+def create_session(filename: str, size: int, upload_dir: Path = UPLOAD_DIR) -> UploadSession:
+    """Validate the file, preallocate its storage and record a new session."""
+    name = Path(filename or "").name
+    suffix = Path(name).suffix.lower()
+    if suffix not in SUPPORTED_MEDIA_EXTENSIONS:
+        raise UploadError(unsupported_extension_message(suffix))
+    if size < 0:
+        raise UploadError("Upload size must not be negative")
+    # The whole file is preallocated up front, so check the size before reserving it.
+    limit = max_upload_bytes()
+    if limit > 0 and size > limit:
+        raise UploadTooLarge(f"Upload is larger than the {limit // (1024 * 1024)} MB limit")
+
+    prune_sessions(upload_dir=upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    if size > shutil.disk_usage(upload_dir).free:
+        raise UploadTooLarge("Not enough free disk space for this upload")
+    session = UploadSession(uuid.uuid4().hex, name, suffix, size, time.time())
+    session_dir = session.session_dir(upload_dir)
+    session_dir.mkdir(parents=True)
+    with open(session.data_path(upload_dir), "wb") as f:
+        if size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError:
+                # Not supported on every filesystem; fall back to a sparse file.
+                f.truncate(size)
+        else:
+            f.truncate(size)
+    (session_dir / "session.json").write_text(json.dumps(asdict(session)), encoding="utf-8")
+    return session
+
+
+def load_session(upload_id: str, upload_dir: Path = UPLOAD_DIR) -> UploadSession:
+    """Return an existing session, raising UploadNotFound for unknown or expired IDs."""
+    if not _UPLOAD_ID_RE.match(upload_id):
+        raise UploadNotFound(f"Upload {upload_id} not found")
+    meta = upload_dir / SESSIONS_DIRNAME / upload_id / "session.json"
+    try:
+        session = UploadSession(**json.loads(meta.read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError) as e:
+        raise UploadNotFound(f"Upload {upload_id} not found") from e
+    if time.time() - session.created_at > session_ttl_seconds():
+        abort_session(session, upload_dir)
+        raise UploadNotFound(f"Upload {upload_id} has expired")
+    return session
+
+
+def received_ranges(session: UploadSession, upload_dir: Path = UPLOAD_DIR) -> list[list[int]]:
+    """Return the merged [start, end) byte ranges stored so far."""
+    spans: list[tuple[int, int]] = []
+    try:
+        names = os.listdir(session.session_dir(upload_dir))
+    except FileNotFoundError:
+        return []
+    for name in names:
+        match = _MARKER_RE.match(name)
+        if match:
+            spans.append((int(match.group(1)), int(match.group(2))))
+    merged: list[list[int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def received_bytes(ranges: list[list[int]]) -> int:
+    return sum(end - start for start, end in ranges)
+
+
+def contiguous_offset(ranges: list[list[int]]) -> int:
+    """Length of the prefix that has fully arrived."""
+    return ranges[0][1] if ranges and ranges[0][0] == 0 else 0
+
+
+def is_complete(session: UploadSession, upload_dir: Path = UPLOAD_DIR) -> bool:
+    return (
+        session.size == 0 or contiguous_offset(received_ranges(session, upload_dir)) >= session.size
+    )
+
+
+async def write_chunk(
+    request: Request, session: UploadSession, upload_dir: Path = UPLOAD_DIR
+) -> tuple[int, int]:
+    """Stream a PUT body into the session's file at the offset given by Content-Range.
+
+    Returns the stored [start, end) range. Raises UploadError when the range
+    does not fit the upload or the body length does not match it.
+    """
+    start, end, size = parse_content_range(request.headers.get("content-range"))
+    if size != session.size or end > session.size:
+        raise UploadError(f"Content-Range does not fit an upload of {session.size} bytes")
+    if end - start > MAX_CHUNK_SIZE:
+        raise UploadError(f"Chunks must not exceed {MAX_CHUNK_SIZE} bytes")
+
+    try:
+        fd = os.open(session.data_path(upload_dir), os.O_WRONLY)
+    except FileNotFoundError as e:
+        raise UploadNotFound(f"Upload {session.upload_id} not found") from e
+    try:
+        offset = start
+        async for data in request.stream():
+            if not data:
+                continue
+            if offset + len(data) > end:
+                raise UploadError("Request body is longer than its Content-Range")
+            await run_in_threadpool(_pwrite_all, fd, data, offset)
+            metrics.upload_bytes.inc(len(data), kind="chunked")
+            offset += len(data)
+    finally:
+        os.close(fd)
+    if offset != end:
+        raise UploadError(f"Received {offset - start} of {end - start} bytes for this range")
+    (session.session_dir(upload_dir) / f"{start}-{end}").touch()
+    return start, end
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def finalize_session(session: UploadSession, job_id: str, upload_dir: Path = UPLOAD_DIR) -> Path:
+    """Move a completed upload to uploads/{job_id}{suffix}.
+
+    The session directory is left in place until `abort_session` so a job that
+    cannot be queued can move the file back and be finalized again.
+    """
+    ranges = received_ranges(session, upload_dir)
+    if session.size and contiguous_offset(ranges) < session.size:
+        missing = session.size - received_bytes(ranges)
+        raise UploadError(f"Upload is incomplete; {missing} bytes are missing")
+    dest = upload_dir / f"{job_id}{session.suffix}"
+    os.replace(session.data_path(upload_dir), dest)
+    return dest
+
+
+def abort_session(session: UploadSession, upload_dir: Path = UPLOAD_DIR) -> None:
+    session.data_path(upload_dir).unlink(missing_ok=True)
+    shutil.rmtree(session.session_dir(upload_dir), ignore_errors=True)
+
+
+def prune_sessions(now: float | None = None, upload_dir: Path = UPLOAD_DIR) -> int:
+    """Delete sessions older than WVT_UPLOAD_SESSION_HOURS. Returns how many were removed."""
+    root = upload_dir / SESSIONS_DIRNAME
+    if not root.is_dir():
+        return 0
+    cutoff = (now if now is not None else time.time()) - session_ttl_seconds()
+    removed = 0
+    for meta in root.glob("*/session.json"):
+        try:
+            session = UploadSession(**json.loads(meta.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            logging.debug(f"Skipping unreadable upload session {meta.parent.name}")
+            continue
+        if session.created_at < cutoff:
+            abort_session(session, upload_dir)
+            removed += 1
+    return removed
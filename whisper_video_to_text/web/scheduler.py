@@ -0,0 +1,277 @@
+"""Admission control for transcription jobs.
+
+Each job loads a Whisper model and keeps several cores busy, so running every
+request at once makes all of them slow. The scheduler runs at most `slots` jobs
+concurrently. Later jobs wait in a bounded FIFO queue, and their queue position
+is reported through the SSE progress stream. When the queue is full, new
+requests are refused so the caller can retry later.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from whisper_video_to_text.web.progress import update_progress_sync
+
+MAX_CONCURRENT_JOBS_ENV = "WVT_MAX_CONCURRENT_JOBS"
+MAX_QUEUED_JOBS_ENV = "WVT_MAX_QUEUED_JOBS"
+DEFAULT_MAX_CONCURRENT_JOBS = 1
+DEFAULT_MAX_QUEUED_JOBS = 16
+# Starting estimate of job length for Retry-After, before any job has finished.
+DEFAULT_JOB_SECONDS = 60.0
+# Weight of the latest job duration in the running average.
+DURATION_SMOOTHING = 0.3
+
+
+class QueueFull(Exception):
+    """Raised when every slot is busy and the wait queue is at capacity."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Transcription queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class _QueuedJob:
+    job_id: str
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class SchedulerStats:
+    slots: int
+    max_queue: int
+    running: int
+    queued: int
+    submitted: int
+    rejected: int
+    completed: int
+    cancelled_while_queued: int
+    avg_job_seconds: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "slots": self.slots,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": self.queued,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "cancelled_while_queued": self.cancelled_while_queued,
+            "avg_job_seconds": round(self.avg_job_seconds, 3),
+        }
+
+
+class JobScheduler:
+    """Runs jobs on a fixed number of worker threads behind a bounded FIFO queue."""
+
+    def __init__(
+        self,
+        slots: int = DEFAULT_MAX_CONCURRENT_JOBS,
+        max_queue: int = DEFAULT_MAX_QUEUED_JOBS,
+        on_queued: Callable[[str, int, int], None] | None = None,
+    ) -> None:
+        self.slots = max(1, slots)
+        self.max_queue = max(0, max_queue)
+        # Called as on_queued(job_id, position, queue_length) whenever a waiting
+        # job's position changes; positions start at 1.
+        self.on_queued = on_queued
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._queue: deque[_QueuedJob] = deque()
+        self._running: set[str] = set()
+        self._executor: ThreadPoolExecutor | None = None
+        self._avg_job_seconds = DEFAULT_JOB_SECONDS
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._cancelled_while_queued = 0
+
+    def _retry_after_locked(self) -> int:
+        # Time until the queue drains enough for one more job to be admitted.
+        waves = (len(self._queue) + 1) / self.slots
+        return max(1, math.ceil(self._avg_job_seconds * waves))
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying."""
+        with self._lock:
+            return self._retry_after_locked()
+
+    def is_full(self) -> bool:
+        """True if a job submitted now would be rejected."""
+        with self._lock:
+            return len(self._running) >= self.slots and len(self._queue) >= self.max_queue
+
+    def submit(self, job_id: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> int:
+        """Run fn(job_id, *args, **kwargs) when a slot frees up.
+
+        Returns the job's queue position, or 0 if it started immediately.
+        Raises QueueFull when the wait queue is at capacity.
+        """
+        job = _QueuedJob(job_id, fn, args, kwargs)
+        with self._lock:
+            if len(self._running) < self.slots:
+                self._submitted += 1
+                self._start_locked(job)
+                return 0
+            if len(self._queue) >= self.max_queue:
+                self._rejected += 1
+                raise QueueFull(self._retry_after_locked())
+            self._submitted += 1
+            self._queue.append(job)
+            position = len(self._queue)
+            total = len(self._queue)
+        self._notify(job_id, position, total)
+        return position
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a job that is still waiting. Returns False if it is running or unknown."""
+        with self._lock:
+            for job in self._queue:
+                if job.job_id == job_id:
+                    self._queue.remove(job)
+                    self._cancelled_while_queued += 1
+                    waiting = self._waiting_locked()
+                    break
+            else:
+                return False
+        self._notify_all(waiting)
+        return True
+
+    def position(self, job_id: str) -> int | None:
+        """Return a waiting job's 1-based queue position, 0 if running, else None."""
+        with self._lock:
+            if job_id in self._running:
+                return 0
+            for index, job in enumerate(self._queue, start=1):
+                if job.job_id == job_id:
+                    return index
+        return None
+
+    def stats(self) -> SchedulerStats:
+        with self._lock:
+            return SchedulerStats(
+                slots=self.slots,
+                max_queue=self.max_queue,
+                running=len(self._running),
+                queued=len(self._queue),
+                submitted=self._submitted,
+                rejected=self._rejected,
+                completed=self._completed,
+                cancelled_while_queued=self._cancelled_while_queued,
+                avg_job_seconds=self._avg_job_seconds,
+            )
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until no job is running or queued. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._running and not self._queue, timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Drop queued jobs and stop the worker threads."""
+        with self._lock:
+            self._queue.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _start_locked(self, job: _QueuedJob) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.slots, thread_name_prefix="wvt-job"
+            )
+        self._running.add(job.job_id)
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: _QueuedJob) -> None:
+        started = time.monotonic()
+        try:
+            job.fn(job.job_id, *job.args, **job.kwargs)
+        except Exception:
+            # Jobs report their own failures; this only guards the slot.
+            logging.exception(f"Unhandled error in scheduled job {job.job_id}")
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._running.discard(job.job_id)
+                self._completed += 1
+                self._avg_job_seconds += DURATION_SMOOTHING * (elapsed - self._avg_job_seconds)
+                if self._queue and self._executor is not None:
+                    self._start_locked(self._queue.popleft())
+                waiting = self._waiting_locked()
+                self._idle.notify_all()
+            self._notify_all(waiting)
+
+    def _waiting_locked(self) -> list[str]:
+        return [job.job_id for job in self._queue]
+
+    def _notify_all(self, waiting: list[str]) -> None:
+        for position, job_id in enumerate(waiting, start=1):
+            self._notify(job_id, position, len(waiting))
+
+    def _notify(self, job_id: str, position: int, total: int) -> None:
+        if self.on_queued is None:
+            return
+        try:
+            self.on_queued(job_id, position, total)
+        except Exception:
+            logging.debug("Queue position callback failed", exc_info=True)
+
+
+def report_queue_position(job_id: str, position: int, total: int) -> None:
+    """Publish a waiting job's queue position on its SSE progress stream."""
+    update_progress_sync(job_id, 0, "queued", f"Waiting for a free slot ({position} of {total})")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logging.warning(f"Ignoring invalid {name}={value!r}; using {default}")
+        return default
+
+
+_default_scheduler: JobScheduler | None = None
+_default_scheduler_lock = threading.Lock()
+
+
+def _default_slots() -> int:
+    # The staged executor needs a slot per stage worker for jobs to overlap.
+    from whisper_video_to_text.web.executor import executor_mode, staged_job_slots
+
+    if executor_mode() == "staged":
+        return staged_job_slots()
+    return DEFAULT_MAX_CONCURRENT_JOBS
+
+
+def get_scheduler() -> JobScheduler:
+    """Return the process-wide scheduler, configured from the environment on first use.
+
+    `WVT_MAX_CONCURRENT_JOBS` defaults to 1, or with `WVT_EXECUTOR=staged` to
+    the total number of stage workers.
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = JobScheduler(
+                slots=_env_int(MAX_CONCURRENT_JOBS_ENV, _default_slots()),
+                max_queue=_env_int(MAX_QUEUED_JOBS_ENV, DEFAULT_MAX_QUEUED_JOBS),
+                on_queued=report_queue_position,
+            )
+        return _default_scheduler
@@ -87,11 +87,33 @@ function stopTimer() {
 
 const queue = [];
 let queueActive = null;
+// "12:34 · aac 48 kHz · 2 ch" from the ffprobe summary in a result's metadata.
+function describeMedia(media) {
+  if (!media) return '';
+  const parts = [];
+  if (media.duration != null) {
+    const s = Math.round(media.duration);
+    parts.push(`${Math.floor(s / 60)}:${String(s % 60).padStart(2, '0')}`);
+  }
+  const audio = (media.streams || []).find(stream => stream.codec_type === 'audio');
+  if (audio) {
+    if (audio.codec_name) parts.push(audio.codec_name);
+    if (audio.sample_rate) parts.push(`${audio.sample_rate / 1000} kHz`);
+    if (audio.channels) parts.push(`${audio.channels} ch`);
+  }
+  return parts.join(' · ');
+}
+
 const TERMINAL_ITEM_STATUSES = new Set(['complete', 'error', 'cancelled']);
 const ACTIVE_ITEM_STATUSES = new Set([
-  'starting', 'uploading', 'downloading', 'converting', 'transcribing', 'saving',
+  'starting', 'queued', 'uploading', 'downloading', 'converting', 'transcribing', 'saving',
 ]);
 
+async function responseError(res) {
+  const body = await res.json().catch(() => null);
+  return (body && body.error) || `Request failed: ${res.status}`;
+}
+
 function formatBytes(bytes) {
   if (!Number.isFinite(bytes)) return '';
   if (bytes < 1024) return `${bytes} B`;
@@ -115,6 +137,7 @@ function enqueueFiles(files) {
       formats: null,
       sourceName: null,
       error: null,
+      uploaded: null,
     });
     added += 1;
   }
@@ -208,6 +231,10 @@ function renderQueueRow(item) {
   const meta = document.createElement('div');
   meta.className = 'meta';
   const parts = [formatBytes(item.file.size)];
+  if (item.status === 'uploading' && item.uploaded != null && item.file.size > 0) {
+    parts.push(`${Math.floor((item.uploaded / item.file.size) * 100)}% uploaded`);
+  }
+  if (item.media) parts.push(item.media);
   meta.textContent = parts.filter(Boolean).join(' · ');
   const statusBadge = document.createElement('span');
   statusBadge.className = 'queue-item__status';
@@ -283,12 +310,25 @@ async function processNext() {
   next.status = 'starting';
   renderQueue();
 
-  const data = collectFormSettings();
-  data.set('file', next.file);
-
   try {
-    const res = await fetch('/api/transcribe', { method: 'POST', body: data });
-    if (!res.ok) throw new Error(`Request failed: ${res.status}`);
+    next.status = 'uploading';
+    renderQueue();
+    const { uploadId, resumeKey } = await uploadResumable(next);
+    const res = await fetch(`/api/uploads/${uploadId}/finalize`, {
+      method: 'POST',
+      body: collectFormSettings(),
+    });
+    if (res.status === 429) {
+      // Server queue is full: put the file back and retry when it suggests.
+      const retryAfter = Number(res.headers.get('Retry-After')) || 10;
+      next.status = 'waiting';
+      queueActive = null;
+      renderQueue();
+      setTimeout(processNext, retryAfter * 1000);
+      return;
+    }
+    if (!res.ok) throw new Error(await responseError(res));
+    localStorage.removeItem(resumeKey);
     const { job_id: jobId } = await res.json();
     next.jobId = jobId;
     showActiveJobUI(next);
@@ -302,6 +342,89 @@ async function processNext() {
   }
 }
 
+// ---------------------------------------------------------------------------
+// Resumable uploads: parallel Content-Range PUTs into a server-side session
+// ---------------------------------------------------------------------------
+
+const UPLOAD_CONCURRENCY = 4;
+const UPLOAD_RETRIES = 5;
+
+function resumeKeyFor(file) {
+  return `wvt-upload:${file.name}:${file.size}:${file.lastModified}`;
+}
+
+function missingChunks(size, chunkSize, ranges) {
+  const chunks = [];
+  for (let start = 0; start < size; start += chunkSize) {
+    const end = Math.min(start + chunkSize, size);
+    const covered = ranges.some(([from, to]) => from <= start && to >= end);
+    if (!covered) chunks.push([start, end]);
+  }
+  return chunks;
+}
+
+async function putChunk(uploadId, file, start, end) {
+  for (let attempt = 0; ; attempt += 1) {
+    let res = null;
+    try {
+      res = await fetch(`/api/uploads/${uploadId}`, {
+        method: 'PUT',
+        headers: { 'Content-Range': `bytes ${start}-${end - 1}/${file.size}` },
+        body: file.slice(start, end),
+      });
+    } catch (err) {
+      // Network failure: retry below.
+    }
+    if (res && res.ok) return;
+    if (res && res.status >= 400 && res.status < 500 && res.status !== 408 && res.status !== 429) {
+      throw new Error(await responseError(res));
+    }
+    if (attempt + 1 >= UPLOAD_RETRIES) throw new Error('Upload failed after several retries');
+    await new Promise(resolve => setTimeout(resolve, 500 * 2 ** attempt));
+  }
+}
+
+async function uploadResumable(item) {
+  const file = item.file;
+  const resumeKey = resumeKeyFor(file);
+  let session = null;
+
+  const savedId = localStorage.getItem(resumeKey);
+  if (savedId) {
+    const res = await fetch(`/api/uploads/${savedId}`).catch(() => null);
+    if (res && res.ok) session = await res.json();
+    else localStorage.removeItem(resumeKey);
+  }
+  if (!session) {
+    const res = await fetch('/api/uploads', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ filename: file.name, size: file.size }),
+    });
+    if (!res.ok) throw new Error(await responseError(res));
+    session = await res.json();
+    localStorage.setItem(resumeKey, session.upload_id);
+  }
+
+  const pending = missingChunks(file.size, session.chunk_size, session.ranges);
+  item.uploaded = session.received;
+  renderQueue();
+  const worker = async () => {
+    while (pending.length > 0) {
+      const [start, end] = pending.shift();
+      await putChunk(session.upload_id, file, start, end);
+      item.uploaded += end - start;
+      renderQueue();
+    }
+  };
+  const workers = [];
+  for (let i = 0; i < Math.min(UPLOAD_CONCURRENCY, pending.length); i += 1) {
+    workers.push(worker());
+  }
+  await Promise.all(workers);
+  return { uploadId: session.upload_id, resumeKey };
+}
+
 function showActiveJobUI(item) {
   const statusContainer = document.getElementById('status-container');
   const status = document.getElementById('status');
@@ -513,7 +636,11 @@ async function startJob(e) {
 
   try {
     const res = await fetch('/api/transcribe', { method: 'POST', body: data });
-    if (!res.ok) throw new Error(`Request failed: ${res.status}`);
+    if (res.status === 429) {
+      const retryAfter = res.headers.get('Retry-After');
+      throw new Error(`server is busy, try again in ${retryAfter || 'a few'} seconds`);
+    }
+    if (!res.ok) throw new Error(await responseError(res));
     const { job_id: jobId } = await res.json();
 
     btn.textContent = 'PROCESSING...';
@@ -535,6 +662,8 @@ async function startJob(e) {
   }
 }
 
+const MAX_SSE_RECONNECTS = 10;
+
 function listen(jobId, queueItem = null) {
   const events = new EventSource(`/events/${jobId}`);
   const status = document.getElementById('status');
@@ -602,6 +731,7 @@ function listen(jobId, queueItem = null) {
           if (data.result) {
             if (data.result.formats) queueItem.formats = data.result.formats;
             if (data.result.source_name) queueItem.sourceName = data.result.source_name;
+            if (data.result.metadata) queueItem.media = describeMedia(data.result.metadata.media);
           }
         } else if (isError) {
           queueItem.status = 'error';
@@ -630,7 +760,17 @@ function listen(jobId, queueItem = null) {
     }
   };
 
+  // A dropped stream reconnects on its own and resumes from Last-Event-ID, so
+  // only give up once the browser stops retrying or the job is gone.
+  let reconnects = 0;
+  events.onopen = () => {
+    reconnects = 0;
+  };
   events.onerror = () => {
+    if (events.readyState === EventSource.CONNECTING && ++reconnects <= MAX_SSE_RECONNECTS) {
+      message.textContent = 'Connection lost, reconnecting...';
+      return;
+    }
     if (queueItem && !TERMINAL_ITEM_STATUSES.has(queueItem.status)) {
       queueItem.status = 'error';
       queueItem.error = 'Connection lost';
@@ -639,6 +779,8 @@ function listen(jobId, queueItem = null) {
   };
 }
 
+const HISTORY_PAGE_SIZE = 50;
+
 async function toggleHistory() {
   const modal = document.getElementById('history-modal');
   const list = document.getElementById('history-list');
@@ -650,30 +792,51 @@ async function toggleHistory() {
     loading.className = 'meta';
     loading.textContent = 'Loading...';
     list.appendChild(loading);
+    await loadHistoryPage(list, null, loading);
+  } else {
+    modal.hidden = true;
+  }
+}
 
-    try {
-      const res = await fetch('/api/history');
-      const history = await res.json();
-      list.replaceChildren();
-
-      if (history.length === 0) {
-        const empty = document.createElement('div');
-        empty.className = 'meta';
-        empty.textContent = 'No transcripts found.';
-        list.appendChild(empty);
-        return;
-      }
+// Appends one page of history; `placeholder` (loading text or the previous
+// "load more" button) is replaced by the page and, if more remain, a new button.
+async function loadHistoryPage(list, before, placeholder) {
+  const params = new URLSearchParams({ limit: String(HISTORY_PAGE_SIZE) });
+  if (before) params.set('before', before);
 
-      history.forEach(item => list.appendChild(buildHistoryItem(item)));
-    } catch (err) {
-      list.replaceChildren();
-      const errEl = document.createElement('div');
-      errEl.className = 'meta error-text';
-      errEl.textContent = `Error loading history: ${err.message}`;
-      list.appendChild(errEl);
+  try {
+    const res = await fetch(`/api/history?${params}`);
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const history = await res.json();
+    const nextCursor = res.headers.get('X-Next-Cursor');
+    placeholder.remove();
+
+    if (history.length === 0 && !before) {
+      const empty = document.createElement('div');
+      empty.className = 'meta';
+      empty.textContent = 'No transcripts found.';
+      list.appendChild(empty);
+      return;
     }
-  } else {
-    modal.hidden = true;
+
+    history.forEach(item => list.appendChild(buildHistoryItem(item)));
+    if (nextCursor) {
+      const more = document.createElement('button');
+      more.type = 'button';
+      more.className = 'btn btn-compact';
+      more.textContent = 'LOAD MORE';
+      more.addEventListener('click', () => {
+        more.disabled = true;
+        loadHistoryPage(list, nextCursor, more);
+      });
+      list.appendChild(more);
+    }
+  } catch (err) {
+    placeholder.remove();
+    const errEl = document.createElement('div');
+    errEl.className = 'meta error-text';
+    errEl.textContent = `Error loading history: ${err.message}`;
+    list.appendChild(errEl);
   }
 }
 
@@ -687,7 +850,7 @@ function buildHistoryItem(item) {
   const info = document.createElement('div');
   const id = document.createElement('div');
   id.className = 'history-item__id';
-  id.textContent = `Job ID: ${item.job_id}`;
+  id.textContent = item.source_name || `Job ID: ${item.job_id}`;
   const date = document.createElement('div');
   date.className = 'meta';
   date.textContent = new Date(item.date).toLocaleString();
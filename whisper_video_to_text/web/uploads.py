@@ -0,0 +1,207 @@
+"""Streaming multipart parsing for /api/transcribe.
+
+`request.form()` spools the whole upload into a temporary file before the
+endpoint sees it, and the file was then copied again into `uploads/`. This
+parser feeds the request body to python-multipart chunk by chunk and writes
+the media part straight to `uploads/{job_id}{suffix}`. The extension is checked
+as soon as the part's headers arrive, so an unsupported upload is refused
+before its body is read.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import (  # type: ignore[no-redef]
+        MultipartParser,
+        parse_options_header,
+    )
+
+from whisper_video_to_text.convert import (
+    SUPPORTED_MEDIA_EXTENSIONS,
+    supported_media_extensions_display,
+)
+from whisper_video_to_text.web import metrics
+
+UPLOAD_DIR = Path("uploads")
+# Plain form fields (model, language, ...) are tiny; anything larger is abuse.
+MAX_FIELD_BYTES = 64 * 1024
+MAX_FIELDS = 100
+
+
+class UploadError(Exception):
+    """The multipart body is malformed or carries an unsupported file."""
+
+
+@dataclass
+class StreamedForm:
+    """Text fields and the single media file saved from a streamed upload."""
+
+    fields: dict[str, list[str]] = field(default_factory=dict)
+    upload_path: Path | None = None
+    filename: str | None = None
+    size: int = 0
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        values = self.fields.get(name)
+        return values[0] if values else default
+
+    def getlist(self, name: str) -> list[str]:
+        return list(self.fields.get(name, []))
+
+
+def unsupported_extension_message(suffix: str) -> str:
+    return f"Unsupported file type '{suffix}'. Supported: {supported_media_extensions_display()}"
+
+
+class _UploadSink:
+    """python-multipart callbacks; file bytes are queued and written off the event loop."""
+
+    def __init__(self, job_id: str, upload_dir: Path) -> None:
+        self.job_id = job_id
+        self.upload_dir = upload_dir
+        self.form = StreamedForm()
+        self.pending: list[bytes] = []
+        self.file: IO[bytes] | None = None
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._field_name: str | None = None
+        self._field_data = bytearray()
+        self._in_file = False
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._field_name = None
+        self._field_data = bytearray()
+        self._in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise UploadError('Multipart part is missing Content-Disposition "name"')
+        self._field_name = options[b"name"].decode("utf-8", errors="replace")
+        if b"filename" not in options:
+            if sum(len(v) for v in self.form.fields.values()) >= MAX_FIELDS:
+                raise UploadError("Too many form fields")
+            return
+
+        if self.form.upload_path is not None:
+            raise UploadError("Only one file can be uploaded per job")
+        filename = Path(options[b"filename"].decode("utf-8", errors="replace")).name
+        suffix = Path(filename).suffix.lower()
+        if suffix not in SUPPORTED_MEDIA_EXTENSIONS:
+            raise UploadError(unsupported_extension_message(suffix))
+        self.form.filename = filename or None
+        self.form.upload_path = self.upload_dir / f"{self.job_id}{suffix}"
+        self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if self._in_file:
+            self.pending.append(chunk)
+            self.form.size += len(chunk)
+            return
+        if len(self._field_data) + len(chunk) > MAX_FIELD_BYTES:
+            raise UploadError(f"Form field '{self._field_name}' is too large")
+        self._field_data.extend(chunk)
+
+    def on_part_end(self) -> None:
+        if not self._in_file and self._field_name is not None:
+            value = self._field_data.decode("utf-8", errors="replace")
+            self.form.fields.setdefault(self._field_name, []).append(value)
+
+    def flush(self) -> None:
+        """Write queued file bytes (runs in a worker thread)."""
+        if not self.pending:
+            return
+        if self.file is None:
+            assert self.form.upload_path is not None
+            self.upload_dir.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.form.upload_path, "wb")
+        chunks, self.pending = self.pending, []
+        self.file.writelines(chunks)
+
+    def finish(self) -> None:
+        """Flush the remaining bytes and close the upload (creating it if it was empty)."""
+        self.flush()
+        if self.form.upload_path is not None and self.file is None:
+            self.form.upload_path.touch()
+        self.close()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def discard(self) -> None:
+        self.close()
+        if self.form.upload_path is not None:
+            try:
+                os.unlink(self.form.upload_path)
+            except FileNotFoundError:
+                pass
+
+
+async def stream_multipart_upload(
+    request: Request, job_id: str, upload_dir: Path = UPLOAD_DIR
+) -> StreamedForm:
+    """Parse a multipart/form-data body, streaming its file part to uploads/{job_id}{suffix}.
+
+    Raises UploadError for malformed bodies and unsupported file types; any
+    partially written upload is removed.
+    """
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadError("Missing multipart boundary")
+
+    sink = _UploadSink(job_id, upload_dir)
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": sink.on_part_begin,
+            "on_part_data": sink.on_part_data,
+            "on_part_end": sink.on_part_end,
+            "on_header_field": sink.on_header_field,
+            "on_header_value": sink.on_header_value,
+            "on_header_end": sink.on_header_end,
+            "on_headers_finished": sink.on_headers_finished,
+        },
+    )
+    try:
+        async for chunk in request.stream():
+            metrics.upload_bytes.inc(len(chunk), kind="multipart")
+            parser.write(chunk)
+            if sink.pending:
+                await run_in_threadpool(sink.flush)
+        parser.finalize()
+        await run_in_threadpool(sink.finish)
+    except BaseException as e:
+        # Covers client disconnects and task cancellation as well as bad bodies.
+        sink.discard()
+        if isinstance(e, Exception) and not isinstance(e, UploadError):
+            raise UploadError(f"Upload failed: {e}") from e
+        raise
+    return sink.form
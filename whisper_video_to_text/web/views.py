@@ -5,30 +5,63 @@ import logging
 import os
 import shutil
 from collections.abc import AsyncGenerator
-from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from starlette.datastructures import UploadFile
 
 from whisper_video_to_text.convert import (
     SUPPORTED_MEDIA_EXTENSIONS,
-    supported_media_extensions_display,
 )
 from whisper_video_to_text.errors import TranscriptionCancelled
-from whisper_video_to_text.pipeline import TranscriptionRequest, run_transcription
+from whisper_video_to_text.pipeline import (
+    TranscriptionRequest,
+    TranscriptionResult,
+    run_transcription,
+)
+from whisper_video_to_text.web.executor import get_job_executor, stage_stats
+from whisper_video_to_text.web.history import (
+    DEFAULT_HISTORY_LIMIT,
+    InvalidCursor,
+    get_history_index,
+    record_history,
+)
 from whisper_video_to_text.web.progress import (
     create_job,
     get_job,
     is_cancel_requested,
-    progress_stream,
+    list_jobs,
+    progress_events,
     request_cancel_sync,
     set_cancelled_sync,
     set_result_sync,
     update_progress_sync,
 )
+from whisper_video_to_text.web.resumable import (
+    CHUNK_SIZE,
+    UploadNotFound,
+    UploadSession,
+    UploadTooLarge,
+    abort_session,
+    contiguous_offset,
+    create_session,
+    finalize_session,
+    is_complete,
+    load_session,
+    received_bytes,
+    received_ranges,
+    write_chunk,
+)
+from whisper_video_to_text.web.scheduler import QueueFull, get_scheduler
+from whisper_video_to_text.web.uploads import (
+    StreamedForm,
+    UploadError,
+    stream_multipart_upload,
+    unsupported_extension_message,
+)
 
 # Ensure uploads directory exists at module initialization
 os.makedirs("uploads", exist_ok=True)
@@ -36,19 +69,40 @@ os.makedirs("transcripts", exist_ok=True)
 
 router = APIRouter()
 
+# How long an EventSource waits before reconnecting after the stream drops.
+SSE_RETRY_MS = 2000
+
 
 @router.get("/events/{job_id}")
-async def events(job_id: str) -> StreamingResponse:
-    """Stream SSE progress events for a job."""
+async def events(job_id: str, request: Request) -> StreamingResponse:
+    """Stream SSE progress events for a job.
+
+    Each event carries an `id:`, so a reconnecting EventSource sends
+    Last-Event-ID and receives only what it missed.
+    """
     job = get_job(job_id)
     if not job:
         return JSONResponse({"error": "Job not found"}, status_code=404)  # type: ignore[return-value]
+    try:
+        last_event_id: int | None = int(request.headers["last-event-id"])
+    except (KeyError, ValueError):
+        last_event_id = None
 
     async def event_generator() -> AsyncGenerator[str, None]:
-        async for update in progress_stream(job_id):
-            yield f"data: {json.dumps(update)}\n\n"
-
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        async for event in progress_events(job_id, last_event_id):
+            if event.update is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id = f"id: {event.id}\n" if event.id is not None else ""
+            yield f"{event_id}data: {json.dumps(event.update)}\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        # Stop nginx and similar proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/download/{job_id}/{extension}")
@@ -77,48 +131,74 @@ async def cancel_job(job_id: str) -> JSONResponse:
         return JSONResponse({"job_id": job_id, "status": job.status})
 
     request_cancel_sync(job_id)
+    # A job still waiting for a slot can be cancelled right away.
+    if get_scheduler().cancel(job_id):
+        set_cancelled_sync(job_id)
+        return JSONResponse({"job_id": job_id, "status": "cancelled"})
     return JSONResponse({"job_id": job_id, "status": "cancel_requested"})
 
 
-@router.get("/api/history")
-async def get_history() -> list[dict[str, Any]]:
-    """List all available transcripts."""
-    transcripts_dir = Path("transcripts")
-    if not transcripts_dir.exists():
-        return []
-
-    # Group files by job_id
-    jobs: dict[str, dict[str, Any]] = {}
-
-    for file_path in transcripts_dir.iterdir():
-        if file_path.is_file() and not file_path.name.startswith("."):
-            # Expecting filename format: {job_id}.{extension}
-            parts = file_path.name.split(".")
-            if len(parts) < 2:
-                continue
+@router.get("/api/jobs")
+async def get_jobs(status: Optional[str] = None, limit: int = 50) -> list[dict[str, Any]]:
+    """List recent jobs, newest first, optionally filtered by status."""
+    limit = max(1, min(limit, 500))
+    records = await run_in_threadpool(list_jobs, status, limit)
+    return [
+        {key: value for key, value in record.as_dict().items() if key != "result"}
+        for record in records
+    ]
 
-            extension = parts[-1]
-            job_id = ".".join(parts[:-1])
 
-            if extension not in ["txt", "srt", "vtt"]:
-                continue
+@router.get("/api/stats")
+async def get_stats() -> dict[str, Any]:
+    """Scheduler load and, with WVT_EXECUTOR=staged, per-stage queue depth and utilization."""
+    stages = stage_stats()
+    return {
+        "scheduler": get_scheduler().stats().as_dict(),
+        "stages": [stage.as_dict() for stage in stages] if stages is not None else None,
+    }
+
+
+@router.get("/api/history")
+async def get_history(
+    response: Response,
+    limit: int = DEFAULT_HISTORY_LIMIT,
+    before: Optional[str] = None,
+    language: Optional[str] = None,
+    model: Optional[str] = None,
+    source: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """List transcripts newest first, one page at a time.
+
+    The cursor for the next page is returned in the X-Next-Cursor header; pass
+    it back as `before`. The header is absent on the last page.
+    """
+    index = get_history_index()
+    try:
+        await run_in_threadpool(index.refresh)
+        entries, next_cursor = await run_in_threadpool(
+            index.page, limit, before, language, model, source
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [entry.as_dict() for entry in entries]
+
 
-            if job_id not in jobs:
-                # Use modification time of the first file found for this job
-                mtime = file_path.stat().st_mtime
-                jobs[job_id] = {
-                    "job_id": job_id,
-                    "date": datetime.fromtimestamp(mtime).isoformat(),
-                    "formats": [],
-                }
+def _execute(job_id: str, request: TranscriptionRequest) -> TranscriptionResult:
+    """Run the pipeline in a worker process when one is configured, else in this thread."""
 
-            jobs[job_id]["formats"].append(extension)
+    def progress(pct: int, status: str, msg: str) -> None:
+        update_progress_sync(job_id, pct, status, msg)
 
-    # Convert to list and sort by date descending
-    history = list(jobs.values())
-    history.sort(key=lambda x: x["date"], reverse=True)
+    def should_cancel() -> bool:
+        return is_cancel_requested(job_id)
 
-    return history
+    executor = get_job_executor()
+    if executor is None:
+        return run_transcription(request, progress=progress, should_cancel=should_cancel)
+    return executor.run(job_id, request, progress=progress, should_cancel=should_cancel)
 
 
 def run_transcription_task(
@@ -129,10 +209,13 @@ def run_transcription_task(
     language: str | None = None,
     formats: list[str] | None = None,
     timestamps: bool = False,
+    bypass_cache: bool = False,
+    upload_path: str | None = None,
+    source_name: str | None = None,
 ) -> None:
     """Run transcription task synchronously in a background thread.
 
-    This function is called by FastAPI's BackgroundTasks in a thread pool.
+    This function runs on one of the job scheduler's worker threads.
     It uses synchronous progress updates to communicate with the async SSE stream.
 
     Args:
@@ -143,26 +226,26 @@ def run_transcription_task(
         language: Language code for transcription
         formats: List of output formats (txt, srt, vtt)
         timestamps: Whether to include timestamps in txt output
+        bypass_cache: Re-run Whisper even if a cached result exists
+        upload_path: Upload already saved to uploads/ by the streaming parser
+        source_name: Original filename of that upload
     """
     if formats is None:
         formats = ["txt"]
 
-    source_name: str | None = None
-
     try:
         # Resolve source: save upload to disk, or pass URL directly to pipeline
         if url:
             source = url
             download = True
             update_progress_sync(job_id, 5, "starting", "Starting download...")
+        elif upload_path:
+            source = upload_path
+            download = False
         elif file:
             suffix = Path(file.filename or "").suffix.lower()
             if suffix not in SUPPORTED_MEDIA_EXTENSIONS:
-                msg = (
-                    f"Unsupported file type '{suffix}'. "
-                    f"Supported: {supported_media_extensions_display()}"
-                )
-                update_progress_sync(job_id, 100, "error", msg)
+                update_progress_sync(job_id, 100, "error", unsupported_extension_message(suffix))
                 return
             update_progress_sync(job_id, 5, "uploading", "Saving uploaded file...")
             dest = os.path.join("uploads", f"{job_id}{suffix}")
@@ -183,18 +266,18 @@ def run_transcription_task(
             formats=tuple(formats),
             include_timestamps=timestamps,
             output_base=Path("transcripts") / job_id,
+            in_memory_audio=True,
+            bypass_cache=bypass_cache,
+            stream_download=True,
         )
-        result = run_transcription(
-            request,
-            progress=lambda pct, status, msg: update_progress_sync(job_id, pct, status, msg),
-            should_cancel=lambda: is_cancel_requested(job_id),
-        )
+        result = _execute(job_id, request)
 
         # Whisper is blocking; cancellation requested during it surfaces here.
         if is_cancel_requested(job_id):
             set_cancelled_sync(job_id)
             return
 
+        record_history(job_id, result.output_files, result.language, request.model, source_name)
         set_result_sync(
             job_id,
             {
@@ -202,6 +285,8 @@ def run_transcription_task(
                 "language": result.language,
                 "formats": result.rendered,
                 "source_name": source_name,
+                "metadata": result.metadata,
+                "spans": [span.as_dict() for span in result.spans],
             },
         )
 
@@ -212,37 +297,173 @@ def run_transcription_task(
         update_progress_sync(job_id, 100, "error", f"Error: {e}")
 
 
+def _queue_full_response(retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        {"error": "Server is busy; too many transcriptions are queued", "retry_after": retry_after},
+        status_code=429,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def _job_options(form: StreamedForm | Any) -> dict[str, Any]:
+    """Transcription settings shared by /api/transcribe and upload finalization."""
+    _model = form.get("model", "base")
+    _language = form.get("language")
+    return {
+        "model": _model if isinstance(_model, str) else "base",
+        "language": _language if isinstance(_language, str) and _language else None,
+        "formats": [f for f in form.getlist("formats") if isinstance(f, str)] or ["txt"],
+        "timestamps": str(form.get("timestamps", "false")).lower() == "true",
+        "bypass_cache": str(form.get("no_cache", "false")).lower() == "true",
+    }
+
+
 @router.post("/api/transcribe")
-async def transcribe_api(
-    background_tasks: BackgroundTasks,
-    request: Request,
-) -> JSONResponse:
-    """Start a transcription job and return the job ID."""
+async def transcribe_api(request: Request) -> JSONResponse:
+    """Queue a transcription job and return the job ID, or 429 when the queue is full."""
+    scheduler = get_scheduler()
+    # Refuse before reading a potentially large upload.
+    if scheduler.is_full():
+        return _queue_full_response(scheduler.retry_after())
+
     # Create a new job
     job_id = create_job()
 
-    # Get form data from request
-    form = await request.form()
-    _file = form.get("file")
-    file: UploadFile | None = _file if isinstance(_file, UploadFile) else None
+    # Multipart bodies are streamed straight into uploads/{job_id}{suffix}.
+    form: StreamedForm | Any
+    upload_path: str | None = None
+    source_name: str | None = None
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        try:
+            form = await stream_multipart_upload(request, job_id)
+        except UploadError as e:
+            update_progress_sync(job_id, 100, "error", str(e))
+            return JSONResponse({"error": str(e), "job_id": job_id}, status_code=400)
+        if form.upload_path is not None:
+            upload_path = str(form.upload_path)
+            source_name = form.filename
+    else:
+        form = await request.form()
+
     _url = form.get("url")
-    url: str | None = _url if isinstance(_url, str) else None
-    _model = form.get("model", "base")
-    model: str = _model if isinstance(_model, str) else "base"
-    _language = form.get("language")
-    language: str | None = _language if isinstance(_language, str) and _language else None
-    formats: list[str] = [f for f in form.getlist("formats") if isinstance(f, str)] or ["txt"]
-    timestamps = str(form.get("timestamps", "false")).lower() == "true"
-
-    # Start background task with user input
-    background_tasks.add_task(
-        run_transcription_task,
-        job_id,
-        file=file,
-        url=url,
-        model=model,
-        language=language,
-        formats=formats,
-        timestamps=timestamps,
-    )
+    url: str | None = _url if isinstance(_url, str) and _url else None
+
+    try:
+        scheduler.submit(
+            job_id,
+            run_transcription_task,
+            upload_path=upload_path,
+            source_name=source_name,
+            url=url,
+            **_job_options(form),
+        )
+    except QueueFull as e:
+        update_progress_sync(job_id, 100, "error", "Server is busy; please retry")
+        if upload_path:
+            Path(upload_path).unlink(missing_ok=True)
+        return _queue_full_response(e.retry_after)
+    return JSONResponse({"job_id": job_id})
+
+
+def _upload_status(session: UploadSession) -> dict[str, Any]:
+    ranges = received_ranges(session)
+    return {
+        "upload_id": session.upload_id,
+        "filename": session.filename,
+        "size": session.size,
+        "chunk_size": CHUNK_SIZE,
+        "received": received_bytes(ranges),
+        "offset": contiguous_offset(ranges),
+        "ranges": ranges,
+    }
+
+
+def _session_or_404(upload_id: str) -> UploadSession:
+    try:
+        return load_session(upload_id)
+    except UploadNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@router.post("/api/uploads")
+async def create_upload(request: Request) -> JSONResponse:
+    """Start a resumable upload from JSON `{filename, size}`."""
+    try:
+        body = await request.json()
+        filename = str(body["filename"])
+        size = int(body["size"])
+    except (ValueError, KeyError, TypeError):
+        return JSONResponse({"error": "Expected JSON with filename and size"}, status_code=400)
+    try:
+        session = await run_in_threadpool(create_session, filename, size)
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except UploadError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse(_upload_status(session), status_code=201)
+
+
+@router.get("/api/uploads/{upload_id}")
+async def get_upload(upload_id: str) -> JSONResponse:
+    """Report the byte ranges received so far, for resuming."""
+    session = _session_or_404(upload_id)
+    return JSONResponse(await run_in_threadpool(_upload_status, session))
+
+
+@router.put("/api/uploads/{upload_id}")
+async def put_upload_chunk(upload_id: str, request: Request) -> JSONResponse:
+    """Store one `Content-Range` chunk of a resumable upload."""
+    session = _session_or_404(upload_id)
+    try:
+        start, end = await write_chunk(request, session)
+    except UploadNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except UploadError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    status = await run_in_threadpool(_upload_status, session)
+    status["stored"] = [start, end]
+    return JSONResponse(status)
+
+
+@router.delete("/api/uploads/{upload_id}")
+async def delete_upload(upload_id: str) -> JSONResponse:
+    session = _session_or_404(upload_id)
+    await run_in_threadpool(abort_session, session)
+    return JSONResponse({"upload_id": upload_id, "status": "aborted"})
+
+
+@router.post("/api/uploads/{upload_id}/finalize")
+async def finalize_upload(upload_id: str, request: Request) -> JSONResponse:
+    """Turn a completed upload into a transcription job; settings come as form fields."""
+    session = _session_or_404(upload_id)
+    scheduler = get_scheduler()
+    # The session is kept on 429 so the client can finalize again later.
+    if scheduler.is_full():
+        return _queue_full_response(scheduler.retry_after())
+    if not await run_in_threadpool(is_complete, session):
+        return JSONResponse(
+            {"error": "Upload is incomplete", **_upload_status(session)}, status_code=409
+        )
+
+    form = await request.form()
+    job_id = create_job()
+    try:
+        upload_path = await run_in_threadpool(finalize_session, session, job_id)
+    except (UploadError, OSError) as e:
+        update_progress_sync(job_id, 100, "error", str(e))
+        return JSONResponse({"error": str(e), "job_id": job_id}, status_code=409)
+
+    try:
+        scheduler.submit(
+            job_id,
+            run_transcription_task,
+            upload_path=str(upload_path),
+            source_name=session.filename or None,
+            **_job_options(form),
+        )
+    except QueueFull as e:
+        update_progress_sync(job_id, 100, "error", "Server is busy; please retry")
+        os.replace(upload_path, session.data_path())
+        return _queue_full_response(e.retry_after)
+    await run_in_threadpool(abort_session, session)
     return JSONResponse({"job_id": job_id})